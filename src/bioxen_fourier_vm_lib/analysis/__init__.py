@@ -0,0 +1,14 @@
+"""
+BioXen Analysis Lenses - Frequency domain analysis of hypervisor telemetry
+
+This module implements the analysis lenses used to study periodicity in
+biological VM metrics. Requires numpy.
+"""
+
+from .fourier import FourierLens, FrequencyGrid, PeriodogramResult, lomb_scargle
+from .streaming import StreamingLombScargle, SpectralMonitor
+from .wavelet import WaveletLens, Scalogram, DWTResult, cwt, dwt, idwt
+
+__all__ = ['FourierLens', 'FrequencyGrid', 'PeriodogramResult', 'lomb_scargle',
+           'StreamingLombScargle', 'SpectralMonitor',
+           'WaveletLens', 'Scalogram', 'DWTResult', 'cwt', 'dwt', 'idwt']
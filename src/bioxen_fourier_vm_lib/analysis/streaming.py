@@ -0,0 +1,169 @@
+"""
+BioXen Streaming Fourier Lens - Incremental Lomb-Scargle for live monitoring
+
+Instead of recomputing a full periodogram whenever the PerformanceProfiler
+collects a sample, ``StreamingLombScargle`` keeps running trigonometric sums
+for a fixed set of frequencies. Each new sample costs O(F), and the dominant
+period can be read out at any time in O(F). An optional sliding window keeps
+only the most recent samples by subtracting their contribution on expiry.
+"""
+
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+
+from .fourier import _power_from_sums
+
+
+class StreamingLombScargle:
+    """Floating-mean Lomb-Scargle periodogram maintained sample by sample"""
+
+    # Rows of the running-sum matrix
+    _COS, _SIN, _COS2, _SIN2, _Y_COS, _Y_SIN = range(6)
+
+    def __init__(self, frequencies, window: Optional[int] = None,
+                 resync_interval: Optional[int] = None):
+        """
+        Initialize the streaming estimator.
+
+        Args:
+            frequencies: Frequencies to track (Hz)
+            window: Keep only the most recent ``window`` samples (None = all)
+            resync_interval: With a window, rebuild the sums from the retained
+                samples every this many updates to cancel round-off drift
+                (defaults to the window size)
+        """
+        self.frequencies = np.asarray(frequencies, dtype=np.float64)
+        self.window = window
+        self.resync_interval = resync_interval or window
+        self._omega = 2 * np.pi * self.frequencies
+        self._samples: Optional[deque] = deque() if window else None
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all accumulated samples"""
+        self._t0: Optional[float] = None
+        self._count = 0
+        self._sum_y = 0.0
+        self._sum_yy = 0.0
+        self._sums = np.zeros((6, self.frequencies.size))
+        self._updates_since_resync = 0
+        if self._samples is not None:
+            self._samples.clear()
+
+    @property
+    def sample_count(self) -> int:
+        """Number of samples currently contributing to the periodogram"""
+        return self._count
+
+    def update(self, t: float, y: float) -> None:
+        """Add one sample in O(F)"""
+        if self._t0 is None:
+            self._t0 = t  # Reference time keeps phases well conditioned
+
+        self._accumulate(t, y, 1.0)
+
+        if self._samples is not None:
+            self._samples.append((t, y))
+            if len(self._samples) > self.window:
+                old_t, old_y = self._samples.popleft()
+                self._accumulate(old_t, old_y, -1.0)
+
+            self._updates_since_resync += 1
+            if self._updates_since_resync >= self.resync_interval:
+                self._resync()
+
+    def _accumulate(self, t: float, y: float, sign: float) -> None:
+        """Add (sign=+1) or remove (sign=-1) one sample's contribution"""
+        phase = self._omega * (t - self._t0)
+        c = np.cos(phase)
+        s = np.sin(phase)
+        sums = self._sums
+        sums[self._COS] += sign * c
+        sums[self._SIN] += sign * s
+        # Double-angle identities avoid a second pair of trig evaluations
+        sums[self._COS2] += sign * (c * c - s * s)
+        sums[self._SIN2] += sign * (2 * s * c)
+        sums[self._Y_COS] += (sign * y) * c
+        sums[self._Y_SIN] += (sign * y) * s
+        self._count += int(sign)
+        self._sum_y += sign * y
+        self._sum_yy += sign * y * y
+
+    def _resync(self) -> None:
+        """Rebuild the running sums exactly from the retained samples"""
+        samples = list(self._samples)
+        self._count = 0
+        self._sum_y = 0.0
+        self._sum_yy = 0.0
+        self._sums[:] = 0.0
+        self._t0 = samples[0][0]
+        for t, y in samples:
+            self._accumulate(t, y, 1.0)
+        self._updates_since_resync = 0
+
+    def power(self) -> np.ndarray:
+        """Standard-normalized power (0-1) at each tracked frequency in O(F)"""
+        n = self._count
+        if n < 3:
+            return np.zeros_like(self.frequencies)
+
+        mean = self._sum_y / n
+        yy = self._sum_yy / n - mean * mean
+        if yy <= 1e-12 * max(1.0, self._sum_yy / n):
+            return np.zeros_like(self.frequencies)  # Constant series
+
+        sums = self._sums / n
+        C, S = sums[self._COS], sums[self._SIN]
+        Ch = sums[self._Y_COS] - mean * C
+        Sh = sums[self._Y_SIN] - mean * S
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            power = _power_from_sums(Sh, Ch, sums[self._SIN2], sums[self._COS2], S, C) / yy
+        return np.nan_to_num(power, nan=0.0, posinf=0.0, neginf=0.0)
+
+    def dominant_frequency(self) -> Optional[float]:
+        """Tracked frequency with the highest power, or None without data"""
+        power = self.power()
+        if not power.any():
+            return None
+        return float(self.frequencies[np.argmax(power)])
+
+    def dominant_period(self) -> Optional[float]:
+        """Period (seconds) of the strongest tracked frequency"""
+        frequency = self.dominant_frequency()
+        return 1.0 / frequency if frequency else None
+
+
+class SpectralMonitor:
+    """Bank of streaming periodograms keyed by metric name"""
+
+    def __init__(self, frequencies, window: Optional[int] = None):
+        self.frequencies = np.asarray(frequencies, dtype=np.float64)
+        self.window = window
+        self.estimators: Dict[str, StreamingLombScargle] = {}
+
+    @classmethod
+    def for_periods(cls, min_period: float, max_period: float, n_frequencies: int = 256,
+                    window: Optional[int] = None) -> 'SpectralMonitor':
+        """Create a monitor tracking frequencies between two periods (seconds)"""
+        frequencies = np.linspace(1.0 / max_period, 1.0 / min_period, n_frequencies)
+        return cls(frequencies, window=window)
+
+    def update(self, metric: str, t: float, y: float) -> None:
+        """Feed one sample of a metric"""
+        estimator = self.estimators.get(metric)
+        if estimator is None:
+            estimator = StreamingLombScargle(self.frequencies, window=self.window)
+            self.estimators[metric] = estimator
+        estimator.update(t, y)
+
+    def remove(self, metric: str) -> None:
+        """Stop tracking a metric"""
+        self.estimators.pop(metric, None)
+
+    def dominant_periods(self) -> Dict[str, Optional[float]]:
+        """Current dominant period (seconds) for every tracked metric"""
+        return {metric: estimator.dominant_period()
+                for metric, estimator in list(self.estimators.items())}
@@ -10,6 +10,7 @@ from .biological_vm import BiologicalVM, BasicBiologicalVM, XCPngBiologicalVM
 from .factory import create_bio_vm, create_biological_vm, get_supported_biological_types, get_supported_vm_types, validate_biological_type, validate_vm_type
 from .resource_manager import BioResourceManager
 from .config_manager import ConfigManager
+from .async_api import AsyncBioXenHypervisor, AsyncBiologicalVM, OperationLimiter, create_async_bio_vm
 
 # Public API exports (mirrors pylua exports)
 __all__ = [
@@ -28,7 +29,13 @@ __all__ = [
     
     # Management classes
     'BioResourceManager',
-    'ConfigManager'
+    'ConfigManager',
+    
+    # Asyncio front-end
+    'AsyncBioXenHypervisor',
+    'AsyncBiologicalVM',
+    'OperationLimiter',
+    'create_async_bio_vm'
 ]
 
 # Convenience functions (mirrors pylua convenience patterns)
@@ -0,0 +1,259 @@
+"""
+Asyncio front-end for the BioXen hypervisor and BiologicalVM API
+
+Lets one event loop orchestrate thousands of VMs (and remote backends)
+without a thread per VM:
+
+- ``OperationLimiter`` bounds in-flight operations with a semaphore sized by
+  ``ProductionConfig.max_concurrent_operations`` and applies
+  ``ProductionConfig.api_timeout_seconds`` to every operation (queueing time
+  included). Timeouts raise ``BioXenException`` (HYPERVISOR_OVERLOAD).
+  A timeout cannot interrupt synchronous code: an executor job that has
+  not started yet is skipped, but one already running finishes and its
+  changes stand.
+- ``AsyncBioXenHypervisor`` exposes awaitable hypervisor lifecycle calls.
+  In-process hypervisor calls are short and run inline on the loop.
+- ``AsyncBiologicalVM`` wraps a ``BiologicalVM``. Process execution and
+  metrics for non-basic (remote) VM types run in the loop's executor so a
+  slow backend never blocks the loop.
+
+Share one limiter between many async VMs to enforce a global limit.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .biological_vm import BiologicalVM
+from .enhanced_error_handling import BioXenErrorCode, BioXenException, ProductionLogger
+from .factory import create_bio_vm
+from .production_config import ProductionConfig, get_config
+from ..hypervisor.core import BioXenHypervisor, ResourceAllocation
+
+
+def _unless_cancelled(cancelled: threading.Event, func: Callable, *args, **kwargs) -> Any:
+    # A job that timed out while queued in the executor must not run late
+    if cancelled.is_set():
+        return None
+    return func(*args, **kwargs)
+
+
+class OperationLimiter:
+    """Concurrency limit and timeout shared by async BioXen operations"""
+
+    def __init__(self, max_concurrent: int = 10, timeout: Optional[float] = 30.0):
+        if max_concurrent <= 0:
+            raise ValueError("max_concurrent must be positive")
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        # Created in run(): before Python 3.10 a semaphore binds to the loop
+        # current at construction, which may not be the loop that awaits it
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.timed_out = 0
+        self.logger = ProductionLogger("async_operations")
+
+    @classmethod
+    def from_config(cls, config: Optional[ProductionConfig] = None) -> 'OperationLimiter':
+        """Create a limiter from the production configuration"""
+        config = config or get_config()
+        return cls(config.max_concurrent_operations, config.api_timeout_seconds)
+
+    async def run(self, operation: str, func: Callable, *args, blocking: bool = False,
+                  vm_id: str = "unknown", timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run ``func`` under the concurrency limit and timeout.
+
+        A timeout does not cancel work already running in the executor: the
+        caller gets the error, but ``func`` runs to completion and keeps its
+        side effects. Blocking jobs still queued when the timeout fires are
+        skipped.
+
+        Args:
+            operation: Operation name used in logs and errors
+            func: Synchronous callable to invoke
+            blocking: Run in the loop's default executor instead of inline
+            vm_id: VM the operation acts on (for logging)
+            timeout: Override the limiter timeout (seconds, None = no limit)
+
+        Raises:
+            BioXenException: If the operation does not finish within the timeout
+        """
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+        start_time = time.time()
+        cancelled = threading.Event()
+        try:
+            return await asyncio.wait_for(
+                self._run_limited(func, args, kwargs, blocking, cancelled), timeout
+            )
+        except asyncio.TimeoutError:
+            cancelled.set()
+            self.timed_out += 1
+            duration = time.time() - start_time
+            error = BioXenException(
+                BioXenErrorCode.HYPERVISOR_OVERLOAD,
+                f"{operation} timed out after {timeout}s",
+                {"operation": operation, "vm_id": vm_id, "timeout": timeout}
+            )
+            self.logger.log_vm_operation(operation, vm_id, False,
+                                         details=error.details, duration=duration)
+            raise error from None
+
+    async def _run_limited(self, func: Callable, args: tuple, kwargs: dict, blocking: bool,
+                           cancelled: threading.Event) -> Any:
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                if blocking:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(
+                        None, functools.partial(_unless_cancelled, cancelled, func, *args, **kwargs)
+                    )
+                # Inline call: yield once so queued operations interleave fairly
+                await asyncio.sleep(0)
+                return func(*args, **kwargs)
+            finally:
+                self.in_flight -= 1
+                self.completed += 1
+
+
+class AsyncBioXenHypervisor:
+    """Awaitable wrapper around a BioXenHypervisor"""
+
+    def __init__(self, hypervisor: Optional[BioXenHypervisor] = None,
+                 config: Optional[ProductionConfig] = None,
+                 limiter: Optional[OperationLimiter] = None):
+        """
+        Initialize the async hypervisor.
+
+        Args:
+            hypervisor: Hypervisor to drive (defaults to one sized by the config)
+            config: Production configuration (defaults to the global config)
+            limiter: Shared limiter (defaults to one built from the config)
+        """
+        if hypervisor is None or limiter is None:
+            config = config or get_config()
+        self.hypervisor = hypervisor or BioXenHypervisor(max_vms=config.max_vms)
+        self.limiter = limiter or OperationLimiter.from_config(config)
+
+    async def _call(self, operation: str, *args, vm_id: str = "unknown", **kwargs) -> Any:
+        return await self.limiter.run(operation, getattr(self.hypervisor, operation), *args,
+                                      vm_id=vm_id, **kwargs)
+
+    async def create_vm(self, vm_id: str, genome_template: str = "syn3a_minimal",
+                        resource_allocation: Optional[ResourceAllocation] = None) -> bool:
+        return await self._call("create_vm", vm_id, genome_template, resource_allocation,
+                                vm_id=vm_id)
+
+    async def start_vm(self, vm_id: str) -> bool:
+        return await self._call("start_vm", vm_id, vm_id=vm_id)
+
+    async def pause_vm(self, vm_id: str) -> bool:
+        return await self._call("pause_vm", vm_id, vm_id=vm_id)
+
+    async def resume_vm(self, vm_id: str) -> bool:
+        return await self._call("resume_vm", vm_id, vm_id=vm_id)
+
+    async def destroy_vm(self, vm_id: str) -> bool:
+        return await self._call("destroy_vm", vm_id, vm_id=vm_id)
+
+    async def get_vm_status(self, vm_id: str) -> Optional[Dict[str, Any]]:
+        return await self._call("get_vm_status", vm_id, vm_id=vm_id)
+
+    async def list_vms(self) -> List[Dict[str, Any]]:
+        return await self._call("list_vms")
+
+    async def get_system_resources(self) -> Dict[str, Any]:
+        return await self._call("get_system_resources")
+
+    async def allocate_vm_resources(self, vm_id: str, resources: Dict[str, Any]) -> bool:
+        return await self._call("allocate_vm_resources", vm_id, resources, vm_id=vm_id)
+
+    async def execute_process(self, vm_id: str, process_code: str) -> Dict[str, Any]:
+        return await self._call("execute_process", vm_id, process_code, vm_id=vm_id)
+
+    async def run_scheduler(self) -> None:
+        await self._call("run_scheduler")
+
+    async def _many(self, operation: str, vm_ids: Iterable[str]) -> Dict[str, Any]:
+        vm_ids = list(vm_ids)
+        method = getattr(self, operation)
+        results = await asyncio.gather(*(method(vm_id) for vm_id in vm_ids), return_exceptions=True)
+        return dict(zip(vm_ids, results))
+
+    async def start_vms(self, vm_ids: Iterable[str]) -> Dict[str, Any]:
+        """Start many VMs concurrently (result or exception per VM)"""
+        return await self._many("start_vm", vm_ids)
+
+    async def destroy_vms(self, vm_ids: Iterable[str]) -> Dict[str, Any]:
+        """Destroy many VMs concurrently (result or exception per VM)"""
+        return await self._many("destroy_vm", vm_ids)
+
+
+class AsyncBiologicalVM:
+    """Awaitable wrapper around a BiologicalVM"""
+
+    def __init__(self, vm: BiologicalVM, config: Optional[ProductionConfig] = None,
+                 limiter: Optional[OperationLimiter] = None):
+        self.vm = vm
+        self.vm_id = vm.vm_id
+        self.limiter = limiter or OperationLimiter.from_config(config)
+        # Remote backends may block on I/O; keep them off the event loop
+        self.blocking = vm.get_vm_type() != "basic"
+
+    def get_vm_type(self) -> str:
+        return self.vm.get_vm_type()
+
+    def get_biological_type(self) -> str:
+        return self.vm.get_biological_type()
+
+    async def _call(self, operation: str, *args, blocking: bool = False) -> Any:
+        return await self.limiter.run(operation, getattr(self.vm, operation), *args,
+                                      blocking=blocking, vm_id=self.vm_id)
+
+    async def start(self) -> bool:
+        """Start the biological VM."""
+        return await self._call("start")
+
+    async def destroy(self) -> bool:
+        """Destroy the biological VM."""
+        return await self._call("destroy")
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Get current VM status."""
+        return await self._call("get_status")
+
+    async def execute_biological_process(self, process_code: str) -> Dict[str, Any]:
+        """Execute biological process."""
+        return await self._call("execute_biological_process", process_code, blocking=self.blocking)
+
+    async def get_biological_metrics(self) -> Dict[str, Any]:
+        """Get biological metrics."""
+        return await self._call("get_biological_metrics", blocking=self.blocking)
+
+    async def allocate_resources(self, resources: Dict[str, Any]) -> bool:
+        """Allocate resources to the VM."""
+        return await self._call("allocate_resources", resources)
+
+    async def get_resource_usage(self) -> Dict[str, Any]:
+        """Get current resource usage."""
+        return await self._call("get_resource_usage")
+
+
+async def create_async_bio_vm(vm_id: str, biological_type: str, vm_type: str = "basic",
+                              config: Optional[Dict[str, Any]] = None,
+                              limiter: Optional[OperationLimiter] = None) -> AsyncBiologicalVM:
+    """Async counterpart of create_bio_vm (construction runs in the executor)."""
+    loop = asyncio.get_running_loop()
+    vm = await loop.run_in_executor(
+        None, functools.partial(create_bio_vm, vm_id, biological_type, vm_type, config)
+    )
+    return AsyncBiologicalVM(vm, limiter=limiter)
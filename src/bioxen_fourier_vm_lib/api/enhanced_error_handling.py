@@ -11,6 +11,9 @@ from typing import Optional, Dict, Any
 from enum import Enum
 from dataclasses import dataclass
 
+from ..hypervisor.metrics import PERFORMANCE_METRICS
+from ..monitoring.tracing import TRACER
+
 
 class BioXenErrorCode(Enum):
     """Standardized error codes for BioXen operations"""
@@ -114,6 +117,7 @@ class ProductionLogger:
             "timestamp": time.time()
         }
         self.logger.info(f"Performance metric: {metric_name} = {value} {unit}", extra=log_data)
+        PERFORMANCE_METRICS[(metric_name, unit)] = value
 
 
 def handle_vm_operation(operation_name: str):
@@ -122,6 +126,7 @@ def handle_vm_operation(operation_name: str):
         def wrapper(*args, **kwargs):
             logger = ProductionLogger("vm_operations")
             start_time = time.time()
+            trace_start = time.perf_counter_ns() if TRACER.enabled else None
             
             try:
                 result = func(*args, **kwargs)
@@ -135,6 +140,9 @@ def handle_vm_operation(operation_name: str):
                     vm_id = kwargs['vm_id']
                 
                 logger.log_vm_operation(operation_name, vm_id, True, duration=duration)
+                if trace_start is not None:
+                    TRACER.record(operation_name, "vm_operation", trace_start,
+                                  time.perf_counter_ns() - trace_start, {"vm_id": vm_id})
                 return result
                 
             except Exception as e:
@@ -157,6 +165,10 @@ def handle_vm_operation(operation_name: str):
                 
                 logger.log_vm_operation(operation_name, vm_id, False, 
                                       details=bx_error.details, duration=duration)
+                if trace_start is not None:
+                    TRACER.record(operation_name, "vm_operation", trace_start,
+                                  time.perf_counter_ns() - trace_start,
+                                  {"vm_id": vm_id, "error": bx_error.code.value})
                 logger.log_error(bx_error, {"operation": operation_name, "args": str(args)})
                 raise bx_error
                 
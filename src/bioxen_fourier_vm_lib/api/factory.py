@@ -88,8 +88,8 @@ def _create_vm_template(biological_type: str, vm_type: str, config: Dict[str, An
     Create VM template based on biological type, VM type and config.
     Mirrors pylua template creation pattern with XCP-ng support.
     """
-    # Delegate to existing genome integration logic
-    from ..genome.parser import BioXenRealGenomeIntegrator
+    # Delegate to existing genome integration logic (templates are cached per genome)
+    from ..genome.cache import GENOME_CACHE
     from pathlib import Path
     
     genome_mapping = {
@@ -112,9 +112,7 @@ def _create_vm_template(biological_type: str, vm_type: str, config: Dict[str, An
             f.write(f"organism={biological_type}\n")
             f.write("genes=100\n")
     
-    integrator = BioXenRealGenomeIntegrator(str(genome_path))
-    integrator = BioXenRealGenomeIntegrator(str(genome_path))
-    template = integrator.create_vm_template()
+    template = GENOME_CACHE.template(genome_path)
     
     # Add VM type specific configuration
     template['vm_type'] = vm_type
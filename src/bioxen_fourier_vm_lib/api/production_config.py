@@ -28,6 +28,7 @@ class ProductionConfig:
     log_level: str = "INFO"
     metrics_collection: bool = True
     performance_monitoring_interval: float = 30.0
+    metrics_port: int = 9108  # Prometheus exporter (see monitoring/exporter.py)
     
     # Resource limits and safety
     max_ribosome_allocation: int = 60
@@ -139,6 +140,7 @@ class ProductionConfigManager:
             f"{self.ENV_PREFIX}ENABLE_MONITORING": ("enable_monitoring", self._parse_bool),
             f"{self.ENV_PREFIX}LOG_LEVEL": ("log_level", str),
             f"{self.ENV_PREFIX}METRICS_COLLECTION": ("metrics_collection", self._parse_bool),
+            f"{self.ENV_PREFIX}METRICS_PORT": ("metrics_port", int),
             f"{self.ENV_PREFIX}MAX_RIBOSOME_ALLOCATION": ("max_ribosome_allocation", int),
             f"{self.ENV_PREFIX}MAX_ATP_PERCENTAGE": ("max_atp_percentage", float),
             f"{self.ENV_PREFIX}MAX_MEMORY_KB": ("max_memory_kb", int),
@@ -1,11 +1,23 @@
 """
 Base chassis classes and types for BioXen biological virtualization.
+
+Concurrency: allocations and deallocations are serialized by a per-chassis
+lock, while ``current_resources`` is copy-on-write - every change publishes a
+new ``ChassisResources`` instead of mutating the old one - so monitoring
+threads can read a consistent resource status without taking the lock.
+
+Overcommit and ballooning: ``set_overcommit_ratio`` scales the ribosome and
+ATP pools beyond the physical chassis, and ``inflate_balloon`` /
+``deflate_balloon`` move part of a VM's allocation back into the free pool
+and return it later. A VM's record always holds what it currently has, so
+deallocation credits the right amounts whether or not it is ballooned.
 """
 
+import threading
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, replace
 
 class ChassisType(Enum):
     """Supported chassis types for biological virtualization"""
@@ -35,6 +47,8 @@ class ChassisResources:
     available_atp: float
     available_memory_kb: int
     organelle_capacity: Dict[str, int]
+    reclaimed_ribosomes: int = 0    # Held back from ballooned VMs
+    reclaimed_atp: float = 0.0
     
 class BaseChassis(ABC):
     """Abstract base class for all chassis implementations"""
@@ -45,6 +59,8 @@ class BaseChassis(ABC):
         self.capabilities: ChassisCapabilities = None
         self.current_resources: ChassisResources = None
         self.active_vms: Dict[str, Any] = {}
+        self.overcommit_ratio = 1.0
+        self._lock = threading.RLock()
         
     @abstractmethod
     def initialize(self) -> bool:
@@ -81,6 +97,140 @@ class BaseChassis(ABC):
         """Clean up VM environment after termination"""
         pass
         
+    def _reserve(self, vm_id: str, record: Dict[str, Any], ribosomes: int = 0,
+                 atp_percentage: float = 0.0, memory_kb: int = 0) -> bool:
+        """Atomically check availability, debit the pool and track the VM"""
+        with self._lock:
+            available = self.current_resources
+            if (ribosomes > available.available_ribosomes or
+                atp_percentage > available.available_atp or
+                memory_kb > available.available_memory_kb):
+                return False
+            self._adjust_pool(-ribosomes, -atp_percentage, -memory_kb)
+            self.active_vms[vm_id] = record
+            return True
+            
+    def _release(self, vm_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically stop tracking a VM and credit its resources back
+        
+        Returns the VM's allocation record, or None if it was not tracked.
+        """
+        with self._lock:
+            record = self.active_vms.pop(vm_id, None)
+            if record is not None:
+                balloon_ribosomes, balloon_atp = record.get("balloon", (0, 0.0))
+                self._adjust_pool(record.get("ribosomes", 0), record.get("atp_percentage", 0.0),
+                                  record.get("memory_kb", 0),
+                                  reclaimed_ribosomes=-balloon_ribosomes,
+                                  reclaimed_atp=-balloon_atp)
+            return record
+            
+    def set_overcommit_ratio(self, ratio: float) -> bool:
+        """Scale the ribosome and ATP pools to ``ratio`` times the physical chassis
+        
+        Returns False if lowering the ratio would leave less than is already
+        allocated.
+        """
+        if ratio < 1.0:
+            raise ValueError(f"Overcommit ratio must be at least 1.0, got {ratio}")
+        with self._lock:
+            current = self.current_resources
+            allocated_ribosomes = sum(record.get("ribosomes", 0) for record in self.active_vms.values())
+            allocated_atp = sum(record.get("atp_percentage", 0.0) for record in self.active_vms.values())
+            scale = ratio / self.overcommit_ratio
+            ribosome_pool = int(round((current.available_ribosomes + allocated_ribosomes) * scale))
+            atp_pool = (current.available_atp + allocated_atp) * scale
+            if ribosome_pool < allocated_ribosomes or atp_pool < allocated_atp:
+                return False
+            self._adjust_pool(ribosome_pool - allocated_ribosomes - current.available_ribosomes,
+                              atp_pool - allocated_atp - current.available_atp)
+            self.overcommit_ratio = ratio
+            return True
+            
+    def inflate_balloon(self, vm_id: str, ribosomes: int = 0,
+                        atp_percentage: float = 0.0) -> Tuple[int, float]:
+        """Reclaim up to the given amounts from a VM into the free pool
+        
+        Returns the (ribosomes, ATP) actually reclaimed, limited by what the
+        VM currently holds.
+        """
+        with self._lock:
+            record = self.active_vms.get(vm_id)
+            if record is None:
+                return 0, 0.0
+            ribosomes = max(0, min(ribosomes, record.get("ribosomes", 0)))
+            atp_percentage = max(0.0, min(atp_percentage, record.get("atp_percentage", 0.0)))
+            if ribosomes or atp_percentage:
+                self._move_balloon(vm_id, record, ribosomes, atp_percentage)
+            return ribosomes, atp_percentage
+            
+    def deflate_balloon(self, vm_id: str, ribosomes: Optional[int] = None,
+                        atp_percentage: Optional[float] = None) -> Tuple[int, float]:
+        """Return reclaimed resources to a VM as far as the free pool allows
+        
+        Returns the (ribosomes, ATP) given back, at most the given amounts
+        (default: the whole balloon).
+        """
+        with self._lock:
+            record = self.active_vms.get(vm_id)
+            if record is None:
+                return 0, 0.0
+            balloon_ribosomes, balloon_atp = record.get("balloon", (0, 0.0))
+            if ribosomes is not None:
+                balloon_ribosomes = min(balloon_ribosomes, ribosomes)
+            if atp_percentage is not None:
+                balloon_atp = min(balloon_atp, atp_percentage)
+            current = self.current_resources
+            ribosomes = max(0, min(balloon_ribosomes, current.available_ribosomes))
+            atp_percentage = max(0.0, min(balloon_atp, current.available_atp))
+            if ribosomes or atp_percentage:
+                self._move_balloon(vm_id, record, -ribosomes, -atp_percentage)
+            return ribosomes, atp_percentage
+            
+    def get_balloon(self, vm_id: str) -> Tuple[int, float]:
+        """(ribosomes, ATP) currently reclaimed from a VM"""
+        record = self.active_vms.get(vm_id)
+        if record is None:
+            return 0, 0.0
+        balloon_ribosomes, balloon_atp = record.get("balloon", (0, 0.0))
+        return balloon_ribosomes, balloon_atp
+            
+    def _move_balloon(self, vm_id: str, record: Dict[str, Any], ribosomes: int,
+                      atp_percentage: float) -> None:
+        """Shift resources between a VM and the pool (positive = reclaim; caller holds the lock)"""
+        balloon_ribosomes, balloon_atp = record.get("balloon", (0, 0.0))
+        record = dict(record,
+                      ribosomes=record.get("ribosomes", 0) - ribosomes,
+                      atp_percentage=record.get("atp_percentage", 0.0) - atp_percentage)
+        balloon = [balloon_ribosomes + ribosomes, balloon_atp + atp_percentage]
+        if balloon[0] or balloon[1] > 1e-9:
+            record["balloon"] = balloon
+        else:
+            record.pop("balloon", None)
+        self.active_vms[vm_id] = record
+        self._adjust_pool(ribosomes, atp_percentage, reclaimed_ribosomes=ribosomes,
+                          reclaimed_atp=atp_percentage)
+            
+    def _adjust_pool(self, ribosomes: int = 0, atp_percentage: float = 0.0, memory_kb: int = 0,
+                     organelles: Optional[Dict[str, int]] = None, reclaimed_ribosomes: int = 0,
+                     reclaimed_atp: float = 0.0) -> None:
+        """Publish a new resource pool with the given deltas applied (caller holds the lock)"""
+        current = self.current_resources
+        organelle_capacity = current.organelle_capacity
+        if organelles:
+            organelle_capacity = dict(organelle_capacity)
+            for name, delta in organelles.items():
+                organelle_capacity[name] = organelle_capacity.get(name, 0) + delta
+        self.current_resources = replace(
+            current,
+            available_ribosomes=current.available_ribosomes + ribosomes,
+            available_atp=current.available_atp + atp_percentage,
+            available_memory_kb=current.available_memory_kb + memory_kb,
+            organelle_capacity=organelle_capacity,
+            reclaimed_ribosomes=current.reclaimed_ribosomes + reclaimed_ribosomes,
+            reclaimed_atp=current.reclaimed_atp + reclaimed_atp
+        )
+        
     def get_chassis_info(self) -> Dict[str, Any]:
         """Get chassis information summary"""
         return {
@@ -89,5 +239,6 @@ class BaseChassis(ABC):
             "capabilities": self.capabilities,
             "current_resources": self.current_resources,
             "active_vms": len(self.active_vms),
+            "overcommit_ratio": self.overcommit_ratio,
             "max_vms": self.capabilities.max_concurrent_vms if self.capabilities else 0
         }
@@ -69,25 +69,16 @@ class EcoliChassis(BaseChassis):
             requested_atp = resource_request.get("atp_percentage", 0.0)
             requested_memory = resource_request.get("memory_kb", 0)
             
-            # Check resource availability
-            if (requested_ribosomes > self.current_resources.available_ribosomes or
-                requested_atp > self.current_resources.available_atp or
-                requested_memory > self.current_resources.available_memory_kb):
-                self.logger.warning(f"Insufficient resources for VM {vm_id}")
-                return False
-            
-            # Allocate resources
-            self.current_resources.available_ribosomes -= requested_ribosomes
-            self.current_resources.available_atp -= requested_atp
-            self.current_resources.available_memory_kb -= requested_memory
-            
-            # Track VM allocation
-            self.active_vms[vm_id] = {
+            # Check availability, debit the pool and track the VM in one step
+            record = {
                 "ribosomes": requested_ribosomes,
                 "atp_percentage": requested_atp,
                 "memory_kb": requested_memory,
                 "isolation_mechanisms": ["protein_tagging", "genetic_code_isolation"]
             }
+            if not self._reserve(vm_id, record, requested_ribosomes, requested_atp, requested_memory):
+                self.logger.warning(f"Insufficient resources for VM {vm_id}")
+                return False
             
             self.logger.info(f"Resources allocated to VM {vm_id}: {requested_ribosomes} ribosomes, "
                            f"{requested_atp}% ATP, {requested_memory}KB memory")
@@ -100,20 +91,11 @@ class EcoliChassis(BaseChassis):
     def deallocate_resources(self, vm_id: str) -> bool:
         """Deallocate E. coli resources from a VM"""
         try:
-            if vm_id not in self.active_vms:
+            # Stop tracking the VM and return its resources to the pool
+            if self._release(vm_id) is None:
                 self.logger.warning(f"VM {vm_id} not found in active VMs")
                 return False
             
-            vm_resources = self.active_vms[vm_id]
-            
-            # Return resources to available pool
-            self.current_resources.available_ribosomes += vm_resources["ribosomes"]
-            self.current_resources.available_atp += vm_resources["atp_percentage"]
-            self.current_resources.available_memory_kb += vm_resources["memory_kb"]
-            
-            # Remove VM tracking
-            del self.active_vms[vm_id]
-            
             self.logger.info(f"Resources deallocated from VM {vm_id}")
             return True
             
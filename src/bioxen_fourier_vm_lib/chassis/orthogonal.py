@@ -45,20 +45,12 @@ class OrthogonalChassis(BaseChassis):
         return self.capabilities
 
     def allocate_resources(self, vm_id: str, resource_request: Dict[str, Any]) -> bool:
-        # Simple allocation logic for experimental chassis
-        if self.current_resources.available_ribosomes >= resource_request.get("ribosomes", 1):
-            self.current_resources.available_ribosomes -= resource_request.get("ribosomes", 1)
-            self.active_vms[vm_id] = resource_request
-            return True
-        return False
+        # Simple allocation logic for experimental chassis (ribosomes only)
+        ribosomes = resource_request.get("ribosomes", 1)
+        return self._reserve(vm_id, dict(resource_request, ribosomes=ribosomes), ribosomes)
 
     def deallocate_resources(self, vm_id: str) -> bool:
-        if vm_id in self.active_vms:
-            ribosomes = self.active_vms[vm_id].get("ribosomes", 1)
-            self.current_resources.available_ribosomes += ribosomes
-            del self.active_vms[vm_id]
-            return True
-        return False
+        return self._release(vm_id) is not None
 
     def get_resource_status(self) -> ChassisResources:
         return self.current_resources
@@ -99,20 +99,8 @@ class YeastChassis(BaseChassis):
             requested_memory = resource_request.get("memory_kb", 0)
             requested_organelles = resource_request.get("organelles", {})
             
-            # PLACEHOLDER: Simplified resource checking
-            if (requested_ribosomes > self.current_resources.available_ribosomes or
-                requested_atp > self.current_resources.available_atp or
-                requested_memory > self.current_resources.available_memory_kb):
-                self.logger.warning(f"Insufficient resources for VM {vm_id} [PLACEHOLDER]")
-                return False
-            
-            # PLACEHOLDER: Allocate resources (simulated)
-            self.current_resources.available_ribosomes -= requested_ribosomes
-            self.current_resources.available_atp -= requested_atp
-            self.current_resources.available_memory_kb -= requested_memory
-            
             # Track VM allocation with eukaryotic-specific features
-            self.active_vms[vm_id] = {
+            record = {
                 "ribosomes": requested_ribosomes,
                 "atp_percentage": requested_atp,
                 "memory_kb": requested_memory,
@@ -128,6 +116,11 @@ class YeastChassis(BaseChassis):
                 ]
             }
             
+            # PLACEHOLDER: Simplified resource checking and allocation (simulated)
+            if not self._reserve(vm_id, record, requested_ribosomes, requested_atp, requested_memory):
+                self.logger.warning(f"Insufficient resources for VM {vm_id} [PLACEHOLDER]")
+                return False
+            
             self.logger.info(f"Resources allocated to VM {vm_id} [PLACEHOLDER]: "
                            f"{requested_ribosomes} ribosomes, {requested_atp}% ATP, "
                            f"{requested_memory}KB memory, organelles: {requested_organelles}")
@@ -140,23 +133,16 @@ class YeastChassis(BaseChassis):
     def deallocate_resources(self, vm_id: str) -> bool:
         """Deallocate yeast resources from a VM - PLACEHOLDER"""
         try:
-            if vm_id not in self.active_vms:
-                self.logger.warning(f"VM {vm_id} not found in active VMs")
-                return False
-            
-            vm_resources = self.active_vms[vm_id]
-            
-            # PLACEHOLDER: Return resources to available pool
-            self.current_resources.available_ribosomes += vm_resources["ribosomes"]
-            self.current_resources.available_atp += vm_resources["atp_percentage"]
-            self.current_resources.available_memory_kb += vm_resources["memory_kb"]
-            
-            # Return organelle capacity
-            if "mitochondrial_allocation" in vm_resources:
-                self.current_resources.organelle_capacity["mitochondria"] += vm_resources["mitochondrial_allocation"]
-            
-            # Remove VM tracking
-            del self.active_vms[vm_id]
+            with self._lock:
+                # PLACEHOLDER: Return resources to available pool
+                vm_resources = self._release(vm_id)
+                if vm_resources is None:
+                    self.logger.warning(f"VM {vm_id} not found in active VMs")
+                    return False
+                
+                # Return organelle capacity
+                if "mitochondrial_allocation" in vm_resources:
+                    self._adjust_pool(organelles={"mitochondria": vm_resources["mitochondrial_allocation"]})
             
             self.logger.info(f"Resources deallocated from VM {vm_id} [PLACEHOLDER]")
             return True
@@ -221,25 +207,26 @@ class YeastChassis(BaseChassis):
     
     def get_organelle_status(self) -> Dict[str, Any]:
         """Get detailed organelle utilization - PLACEHOLDER"""
+        vms = list(self.active_vms.values())  # Atomic copy; allocations may run concurrently
         return {
             "nucleus": {
                 "capacity": self.nucleus_capacity,
-                "active_compartments": len([vm for vm in self.active_vms.values() 
+                "active_compartments": len([vm for vm in vms 
                                           if "nuclear_compartment" in vm.get("isolation", {})])
             },
             "mitochondria": {
                 "total_count": self.mitochondria_count,
                 "allocated": sum(vm.get("mitochondrial_allocation", 0) 
-                               for vm in self.active_vms.values()),
+                               for vm in vms),
                 "available": self.current_resources.organelle_capacity.get("mitochondria", 0)
             },
             "endoplasmic_reticulum": {
                 "capacity": self.er_capacity,
-                "utilization": len([vm for vm in self.active_vms.values() 
+                "utilization": len([vm for vm in vms 
                                   if vm.get("er_allocation", 0) > 0])
             },
             "golgi": {
                 "capacity": self.golgi_capacity,
-                "active_processing": len(self.active_vms)  # Simplified
+                "active_processing": len(vms)  # Simplified
             }
         }
@@ -11,6 +11,7 @@ import re
 from dataclasses import dataclass
 from enum import Enum
 from .elements import GeneticCircuit, GeneticElement, CircuitType, ElementType
+from ....monitoring.tracing import traced
 
 
 class OptimizationLevel(Enum):
@@ -60,6 +61,7 @@ class BioCompiler:
             "GTCGAC",  # SalI
         ]
     
+    @traced("compile_hypervisor", category="circuits")
     def compile_hypervisor(self, vm_configs: List[Dict]) -> Dict[str, str]:
         """
         Compile complete hypervisor DNA sequence
@@ -0,0 +1,154 @@
+"""
+Process-wide cache of parsed genomes and VM templates
+
+Provisioning many VMs from one genome used to parse the genome and derive
+its VM template once per VM. ``GENOME_CACHE`` keeps parsed ``RealGenome`` and
+``BioXenGenomeSchema`` objects and VM templates in a bounded LRU keyed by
+the genome's path and content hash, so the parse cost is paid once per
+genome version:
+
+    template = GENOME_CACHE.template("genomes/syn3A.genome")
+
+Cached genomes and schemas are shared and must be treated as read-only;
+templates are returned as copies since callers customize them. Hit, miss
+and eviction counters are reported by ``PerformanceProfiler`` and the
+metrics exporter.
+"""
+
+import copy
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple, Union
+
+from .compiled import _content_hash
+from .index import _source_stamp
+from .parser import BioXenRealGenomeIntegrator, RealGenome
+from .schema import BioXenGenomeSchema
+
+# Rough per-gene object overhead (dataclass instance, ints, str headers)
+_GENE_OVERHEAD_BYTES = 400
+
+
+def _estimate_bytes(value: Any) -> int:
+    """Approximate memory held by a cached value"""
+    genes = getattr(value, "genes", None)
+    if genes is not None:
+        return 256 + sum(_GENE_OVERHEAD_BYTES
+                         + len(getattr(gene, "id", None) or getattr(gene, "gene_id", "") or "")
+                         + len(gene.description or "") for gene in genes)
+    return len(json.dumps(value, default=str))
+
+
+class GenomeCache:
+    """LRU cache of parsed genomes, genome schemas and VM templates"""
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached objects
+            max_bytes: Maximum estimated memory of cached objects
+        """
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[Tuple[str, str, str], Tuple[Any, int]]' = OrderedDict()
+        self._bytes = 0
+        self._hashes: Dict[str, Tuple[Dict[str, int], str]] = {}  # path -> (stamp, content hash)
+        self._lock = threading.RLock()
+
+    def genome(self, genome_path: Union[str, Path]) -> RealGenome:
+        """Parsed genome (as ``BioXenRealGenomeIntegrator.load_genome`` returns it)"""
+        return self._get("genome", genome_path,
+                         lambda path: BioXenRealGenomeIntegrator(path).load_genome())
+
+    def schema(self, genome_path: Union[str, Path]) -> BioXenGenomeSchema:
+        """Parsed BioXen genome schema"""
+        return self._get("schema", genome_path, BioXenGenomeSchema.load_from_file)
+
+    def template(self, genome_path: Union[str, Path]) -> Dict:
+        """Copy of the genome's VM template"""
+        template = self._get("template", genome_path,
+                             lambda path: BioXenRealGenomeIntegrator(path).create_vm_template())
+        return copy.deepcopy(template)
+
+    def _get(self, kind: str, genome_path: Union[str, Path], load: Callable[[Path], Any]) -> Any:
+        path = Path(genome_path).resolve()
+        with self._lock:
+            key = (kind, str(path), self._content_key(path))
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            # Loading under the lock makes concurrent provisioning parse a genome once
+            value = load(path)
+            size = _estimate_bytes(value)
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._evict()
+            return value
+
+    def _content_key(self, path: Path) -> str:
+        """Content hash of a genome file, rehashed only when its size or mtime changes"""
+        stamp = _source_stamp(path)
+        known = self._hashes.get(str(path))
+        if known is not None and known[0] == stamp:
+            return known[1]
+        digest = _content_hash(path)
+        if known is not None and known[1] != digest:
+            self._drop(lambda key: key[1] == str(path) and key[2] == known[1])
+        self._hashes[str(path)] = (stamp, digest)
+        return digest
+
+    def _evict(self) -> None:
+        # Keep the newest entry even if it alone exceeds max_bytes
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries
+                                          or self._bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def _drop(self, predicate: Callable[[Tuple[str, str, str]], bool]) -> None:
+        for key in [key for key in self._entries if predicate(key)]:
+            self._bytes -= self._entries.pop(key)[1]
+
+    def invalidate(self, genome_path: Union[str, Path]) -> None:
+        """Drop every cached object of a genome file"""
+        path = str(Path(genome_path).resolve())
+        with self._lock:
+            self._drop(lambda key: key[1] == path)
+            self._hashes.pop(path, None)
+
+    def clear(self) -> None:
+        """Drop every cached object (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._hashes.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache occupancy and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "estimated_bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+GENOME_CACHE = GenomeCache()
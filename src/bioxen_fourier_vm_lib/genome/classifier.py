@@ -0,0 +1,106 @@
+"""
+Keyword classifier for gene essentiality and functional category
+
+The keyword lists behind ``Gene.is_essential`` and
+``Gene.functional_category`` are compiled into regular expressions once at
+import. ``classify_descriptions`` classifies a whole genome in one pass and
+returns packed arrays; ``RealGenome`` keeps those arrays so that
+``essential_genes``, ``gene_count_by_category`` and the genome stats do not
+re-scan descriptions.
+
+Matching is case-insensitive substring matching on the lowercased
+description. A gene belongs to the first category in ``CATEGORY_RULES``
+with a matching term, so each category has its own pattern tried in
+priority order. One alternation over all terms would return the leftmost
+match instead (e.g. 'trna' in "trna polymerase" before 'rna polymerase').
+"""
+
+import hashlib
+import json
+import re
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+ESSENTIAL_KEYWORDS = [
+    'ribosomal', 'ribosome', 'rRNA', 'tRNA',
+    'DNA polymerase', 'RNA polymerase',
+    'ATP synthase', 'translation', 'transcription',
+    'replication', 'gyrase', 'helicase',
+    'aminoacyl', 'ligase', 'synthetase'
+]
+
+# (category, terms) in priority order; genes matching none are 'other'
+CATEGORY_RULES = [
+    ('protein_synthesis', ['ribosomal', 'ribosome', 'rrna']),
+    ('dna_replication', ['dna polymerase', 'replication', 'helicase']),
+    ('transcription', ['rna polymerase', 'transcription']),
+    ('energy_metabolism', ['atp synthase', 'kinase', 'phosphate']),
+    ('metabolism', ['ligase', 'synthetase', 'transferase']),
+    ('translation', ['trna']),
+    ('transport', ['transport', 'abc']),
+]
+
+# Category codes stored per gene: index into CATEGORIES
+CATEGORIES = tuple(category for category, _ in CATEGORY_RULES) + ('other',)
+OTHER = len(CATEGORIES) - 1
+CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+
+# Changes whenever the keyword tables do; stored classifications carry it
+RULES_DIGEST = hashlib.sha256(
+    json.dumps([ESSENTIAL_KEYWORDS, CATEGORY_RULES]).encode("utf-8")
+).hexdigest()
+
+
+def _alternation(terms: Iterable[str]) -> 're.Pattern':
+    return re.compile('|'.join(re.escape(term.lower()) for term in terms))
+
+
+_ESSENTIAL_PATTERN = _alternation(ESSENTIAL_KEYWORDS)
+_CATEGORY_PATTERNS = [_alternation(terms) for _, terms in CATEGORY_RULES]
+
+
+def _classify(desc_lower: str) -> Tuple[bool, int]:
+    essential = _ESSENTIAL_PATTERN.search(desc_lower) is not None
+    for code, pattern in enumerate(_CATEGORY_PATTERNS):
+        if pattern.search(desc_lower):
+            return essential, code
+    return essential, OTHER
+
+
+def is_essential_description(description: str) -> bool:
+    """Whether a gene description names an essential function"""
+    return _ESSENTIAL_PATTERN.search(description.lower()) is not None
+
+
+def category_of_description(description: str) -> str:
+    """Functional category of a gene description"""
+    return CATEGORIES[_classify(description.lower())[1]]
+
+
+def classify_descriptions(descriptions: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Classify many gene descriptions at once.
+
+    Repeated descriptions (common in annotations: "hypothetical protein")
+    are classified once.
+
+    Returns:
+        (essential flags as bool array, category codes as int8 array)
+    """
+    seen: Dict[str, Tuple[bool, int]] = {}
+    essential: List[bool] = []
+    codes: List[int] = []
+    for description in descriptions:
+        result = seen.get(description)
+        if result is None:
+            result = seen[description] = _classify(description.lower())
+        essential.append(result[0])
+        codes.append(result[1])
+    return np.array(essential, dtype=np.bool_), np.array(codes, dtype=np.int8)
+
+
+def count_by_category(codes: np.ndarray) -> Dict[str, int]:
+    """Genes per category, in order of each category's first gene"""
+    values, first, counts = np.unique(codes, return_index=True, return_counts=True)
+    return {CATEGORIES[values[i]]: int(counts[i]) for i in np.argsort(first)}
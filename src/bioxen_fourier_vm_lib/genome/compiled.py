@@ -0,0 +1,304 @@
+"""
+Compiled binary genome cache (.bxg)
+
+Parsing a text genome and classifying every gene is repeated each time a
+``BioXenRealGenomeIntegrator`` loads it. The first load now also writes a
+``.bxg`` file holding the parsed genome in columnar form:
+
+- gene coordinates, strand and type as typed arrays
+- gene IDs and descriptions as string tables (one byte blob plus offsets)
+- per-gene essential flags and functional category codes
+- precomputed stats (category counts, essential count, coding density)
+
+Later loads map the ``.bxg`` file and decode genes only when they are used.
+A cached file is used only if its format version matches ``BXG_VERSION``,
+it was classified with the current keyword tables (``classifier.RULES_DIGEST``)
+and the source file is unchanged: same size and mtime, or (after a touch or
+copy) same SHA-256 content hash.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .classifier import RULES_DIGEST, count_by_category
+from .index import _KIND_COMPILED, _default_index_path, _read_index, _source_stamp, _write_index
+from .parser import Gene, RealGenome
+
+BXG_VERSION = 1
+
+
+def default_compiled_path(source: Union[str, Path]) -> Path:
+    """Cache location of the compiled form of a genome file"""
+    return _default_index_path(Path(source), ".bxg")
+
+
+def _content_hash(source: Path) -> str:
+    digest = hashlib.sha256()
+    with open(source, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _string_table(values: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(UTF-8 blob, offsets) where value i is blob[offsets[i]:offsets[i + 1]]"""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+class _StringTable:
+    """Decoded view of a stored string table"""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        raw = blob.tobytes()
+        text = raw.decode("utf-8")
+        # ASCII tables can be sliced as text; otherwise slice bytes and decode
+        self._data: Union[str, bytes] = text if len(text) == len(raw) else raw
+        self._offsets = offsets.tolist()
+
+    def __getitem__(self, i: int) -> str:
+        value = self._data[self._offsets[i]:self._offsets[i + 1]]
+        return value if isinstance(value, str) else value.decode("utf-8")
+
+
+class _GeneSequence(Sequence):
+    """Genes of a compiled genome, built on access"""
+
+    def __init__(self, genome: 'CompiledGenome'):
+        self._genome = genome
+
+    def __len__(self) -> int:
+        return len(self._genome)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._genome.gene(j) for j in range(*i.indices(len(self)))]
+        return self._genome.gene(i)
+
+    def __iter__(self) -> Iterator[Gene]:
+        return (self._genome.gene(i) for i in range(len(self)))
+
+
+class CompiledGenome:
+    """A genome loaded from its ``.bxg`` file
+
+    Offers the read-only parts of the ``RealGenome`` interface (``organism``,
+    ``genes``, ``total_length``, ``essential_genes``,
+    ``gene_count_by_category``, ``genes_in_region``), so it can be passed
+    to ``RealGenomeParser.create_bioxen_compatible_template``.
+    """
+
+    def __init__(self, path: Path, metadata: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+        self.path = path
+        self.metadata = metadata
+        self._arrays = arrays
+        self._ids: Optional[_StringTable] = None
+        self._descriptions: Optional[_StringTable] = None
+
+    def __len__(self) -> int:
+        return len(self._arrays["start"])
+
+    @property
+    def organism(self) -> str:
+        return self.metadata["organism"]
+
+    @property
+    def total_length(self) -> int:
+        return self.metadata["total_length"]
+
+    @property
+    def gc_content(self) -> Optional[float]:
+        return self.metadata.get("gc_content")
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self._arrays["start"]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self._arrays["length"]
+
+    @property
+    def ends(self) -> np.ndarray:
+        return self._arrays["end"]
+
+    @property
+    def strands(self) -> np.ndarray:
+        return self._arrays["strand"]
+
+    @property
+    def types(self) -> np.ndarray:
+        return self._arrays["type"]
+
+    @property
+    def essential_flags(self) -> np.ndarray:
+        """Per-gene essential flags"""
+        return self._arrays["essential"]
+
+    @property
+    def category_codes(self) -> np.ndarray:
+        """Per-gene functional category codes (indexes into classifier.CATEGORIES)"""
+        return self._arrays["category"]
+
+    def gene_id(self, i: int) -> str:
+        if self._ids is None:
+            self._ids = _StringTable(self._arrays["id_blob"], self._arrays["id_offsets"])
+        return self._ids[i]
+
+    def description(self, i: int) -> str:
+        if self._descriptions is None:
+            self._descriptions = _StringTable(self._arrays["description_blob"],
+                                              self._arrays["description_offsets"])
+        return self._descriptions[i]
+
+    def gene(self, i: int) -> Gene:
+        if i < 0:
+            i += len(self)
+        return Gene(
+            start=int(self.starts[i]),
+            length=int(self.lengths[i]),
+            end=int(self.ends[i]),
+            strand=int(self.strands[i]),
+            type=int(self.types[i]),
+            id=self.gene_id(i),
+            description=self.description(i)
+        )
+
+    @property
+    def genes(self) -> Sequence[Gene]:
+        return _GeneSequence(self)
+
+    @property
+    def essential_genes(self) -> List[Gene]:
+        return [self.gene(int(i)) for i in np.flatnonzero(self.essential_flags)]
+
+    @property
+    def gene_count_by_category(self) -> Dict[str, int]:
+        return dict(self.metadata["category_counts"])
+
+    def genes_in_region(self, start: int, end: int) -> List[Gene]:
+        rows = np.flatnonzero((self.starts >= start) & (self.ends <= end))
+        return [self.gene(int(i)) for i in rows]
+
+    def to_real_genome(self) -> RealGenome:
+        """Materialize every gene as a RealGenome"""
+        genome = RealGenome(organism=self.organism, genes=list(self.genes),
+                            total_length=self.total_length)
+        genome.classify((np.array(self.essential_flags), np.array(self.category_codes)))
+        if self.gc_content is not None:
+            genome.gc_content = self.gc_content
+        return genome
+
+    def genome_stats(self) -> Dict[str, Any]:
+        """Same result as BioXenRealGenomeIntegrator.get_genome_stats, from stored stats"""
+        total_genes = len(self)
+        essential_genes = self.metadata["essential_genes"]
+        gene_length = self.metadata["total_gene_length"]
+        return {
+            'organism': self.organism,
+            'total_genes': total_genes,
+            'essential_genes': essential_genes,
+            'genome_length_bp': self.total_length,
+            'protein_coding_genes': self.metadata["protein_coding_genes"],
+            'rna_genes': self.metadata["rna_genes"],
+            'gene_categories': self.gene_count_by_category,
+            'essential_percentage': (essential_genes / total_genes) * 100 if total_genes > 0 else 0,
+            'average_gene_length': gene_length / total_genes if total_genes > 0 else 0,
+            'coding_density': self.metadata["coding_density"]
+        }
+
+
+def compile_genome(genome: RealGenome, source: Union[str, Path],
+                   path: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Write the compiled form of a parsed genome.
+
+    Args:
+        genome: Genome parsed from ``source``
+        source: Genome file the compiled form stands in for
+        path: Output file (defaults to ``default_compiled_path(source)``)
+
+    Returns:
+        Path of the written ``.bxg`` file
+    """
+    source = Path(source)
+    path = Path(path) if path else default_compiled_path(source)
+    stamp = _source_stamp(source)
+    genes = genome.genes
+
+    essential = np.asarray(genome.essential_flags, dtype=np.bool_)
+    categories = np.asarray(genome.category_codes, dtype=np.int8)
+
+    id_blob, id_offsets = _string_table([gene.id for gene in genes])
+    description_blob, description_offsets = _string_table([gene.description for gene in genes])
+    arrays = {
+        "start": np.array([gene.start for gene in genes], dtype=np.int64),
+        "length": np.array([gene.length for gene in genes], dtype=np.int64),
+        "end": np.array([gene.end for gene in genes], dtype=np.int64),
+        "strand": np.array([gene.strand for gene in genes], dtype=np.int8),
+        "type": np.array([gene.type for gene in genes], dtype=np.int8),
+        "essential": essential,
+        "category": categories,
+        "id_blob": id_blob,
+        "id_offsets": id_offsets,
+        "description_blob": description_blob,
+        "description_offsets": description_offsets,
+    }
+    total_gene_length = int(arrays["length"].sum())
+    metadata = {
+        "bxg_version": BXG_VERSION,
+        "source": stamp,
+        "sha256": _content_hash(source),
+        "classifier": RULES_DIGEST,
+        "organism": genome.organism,
+        "total_length": genome.total_length,
+        "gc_content": getattr(genome, "gc_content", None),
+        "category_counts": count_by_category(categories),
+        "essential_genes": int(arrays["essential"].sum()),
+        "protein_coding_genes": int((arrays["type"] == 1).sum()),
+        "rna_genes": int((arrays["type"] == 0).sum()),
+        "total_gene_length": total_gene_length,
+        "coding_density": (total_gene_length / genome.total_length) * 100 if genome.total_length > 0 else 0,
+    }
+    _write_index(path, _KIND_COMPILED, metadata, arrays)
+    return path
+
+
+def load_compiled(source: Union[str, Path],
+                  path: Optional[Union[str, Path]] = None) -> Optional[CompiledGenome]:
+    """
+    Map the compiled form of a genome file.
+
+    Returns None if there is no compiled file, it has another format version,
+    its genes were classified with other keyword tables, or the source file
+    changed since it was compiled.
+    """
+    source = Path(source)
+    path = Path(path) if path else default_compiled_path(source)
+    try:
+        stamp = _source_stamp(source)
+    except OSError:
+        return None
+    loaded = _read_index(path, _KIND_COMPILED, None)
+    if loaded is None or loaded[0].get("bxg_version") != BXG_VERSION:
+        return None
+    if loaded[0].get("classifier") != RULES_DIGEST:
+        return None
+    metadata, arrays = loaded
+    if metadata["source"] != stamp:
+        # Touched or copied: still valid if the content is identical
+        if metadata.get("sha256") != _content_hash(source):
+            return None
+        metadata = dict(metadata, source=stamp)
+        metadata.pop("arrays")
+        try:
+            _write_index(path, _KIND_COMPILED, metadata,
+                         {name: np.array(array) for name, array in arrays.items()})
+        except OSError:
+            pass  # Still usable; the hash is checked again next time
+    return CompiledGenome(path, metadata, arrays)
@@ -0,0 +1,428 @@
+"""
+Memory-mapped, indexed genome loading
+
+Parsing a genome annotation builds a ``Gene`` object per line and a FASTA
+file is read whole. The indexes here scan a file once, save a compact
+binary index (coordinates as typed arrays plus byte offsets into the source
+file), and on later runs just map the index and the source file:
+
+- ``GenomeIndex`` serves BioXen ``.genome`` / Syn3A annotation files: gene
+  coordinates are NumPy arrays, and IDs and descriptions are decoded from
+  the mapped source only when asked for.
+- ``FastaIndex`` serves (multi-)FASTA files like ``samtools faidx``:
+  sequence slices are read straight from the mapped file.
+
+Index files live in ``default_cache_dir()/genome-index`` (override with the
+``BIOXEN_CACHE_DIR`` environment variable or ``index_path``) and are rebuilt
+when the source file's size or modification time changes.
+"""
+
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .parser import Gene, RealGenome
+
+INDEX_VERSION = 1
+_MAGIC = b"BXGI"
+_HEADER = struct.Struct("<4sHHQ")  # magic, version, kind, metadata length
+_KIND_ANNOTATION = 0
+_KIND_FASTA = 1
+_KIND_COMPILED = 2
+_TOKEN = re.compile(rb"\S+")
+
+
+def default_cache_dir() -> Path:
+    """Directory for BioXen's derived genome files (indexes, compiled caches)"""
+    return Path(os.environ.get("BIOXEN_CACHE_DIR", Path.home() / ".cache" / "bioxen"))
+
+
+def _default_index_path(source: Path, suffix: str = ".bxi") -> Path:
+    digest = hashlib.sha1(str(source.resolve()).encode("utf-8")).hexdigest()[:16]
+    return default_cache_dir() / "genome-index" / f"{source.name}.{digest}{suffix}"
+
+
+def _source_stamp(source: Path) -> Dict[str, int]:
+    stat = source.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _write_index(path: Path, kind: int, metadata: Dict[str, Any],
+                 arrays: Dict[str, np.ndarray]) -> None:
+    """Write header, JSON metadata and 8-byte aligned arrays atomically"""
+    layout = []
+    offset = 0
+    for name, array in arrays.items():
+        layout.append({"name": name, "dtype": array.dtype.str, "count": len(array), "offset": offset})
+        offset += -(-array.nbytes // 8) * 8
+    metadata = dict(metadata, arrays=layout)
+    blob = json.dumps(metadata).encode("utf-8")
+    blob += b" " * (-(_HEADER.size + len(blob)) % 8)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, INDEX_VERSION, kind, len(blob)))
+        f.write(blob)
+        for array in arrays.values():
+            data = np.ascontiguousarray(array).tobytes()
+            f.write(data)
+            f.write(b"\0" * (-len(data) % 8))
+    os.replace(tmp, path)
+
+
+def _read_index(path: Path, kind: int, stamp: Optional[Dict[str, int]]):
+    """Map an index file; returns (metadata, arrays) or None if missing or stale
+
+    ``stamp=None`` skips the source size/mtime check.
+    """
+    try:
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+    except (OSError, ValueError):
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, file_kind, length = _HEADER.unpack(data[:_HEADER.size].tobytes())
+    if magic != _MAGIC or version != INDEX_VERSION or file_kind != kind:
+        return None
+    metadata = json.loads(data[_HEADER.size:_HEADER.size + length].tobytes())
+    if stamp is not None and metadata.get("source") != stamp:
+        return None
+    base = _HEADER.size + length
+    arrays = {entry["name"]: np.frombuffer(data, dtype=np.dtype(entry["dtype"]),
+                                           count=entry["count"], offset=base + entry["offset"])
+              for entry in metadata["arrays"]}
+    return metadata, arrays
+
+
+def _map_source(source: Path) -> Union[mmap.mmap, bytes]:
+    with open(source, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _SortedKeys:
+    """Sequence view of keys in sorted order, for bisect over an index"""
+
+    def __init__(self, key, order: np.ndarray):
+        self._key = key
+        self._order = order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, position: int) -> bytes:
+        return self._key(int(self._order[position]))
+
+
+class _IndexedFile(ABC):
+    """Shared open/build logic of the indexes"""
+
+    _kind = None
+
+    def __init__(self, path: Union[str, Path], index_path: Optional[Union[str, Path]] = None,
+                 rebuild: bool = False):
+        self.path = Path(path)
+        self.index_path = Path(index_path) if index_path else _default_index_path(self.path)
+        stamp = _source_stamp(self.path)
+        loaded = None if rebuild else _read_index(self.index_path, self._kind, stamp)
+        self.built = loaded is None
+        self._source = _map_source(self.path)
+        if loaded is None:
+            metadata, arrays = self._build(bytes(self._source))
+            metadata["source"] = stamp
+            _write_index(self.index_path, self._kind, metadata, arrays)
+            loaded = _read_index(self.index_path, self._kind, stamp)
+        self.metadata, self._arrays = loaded
+
+    @abstractmethod
+    def _build(self, data: bytes) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """(metadata, arrays) of the index over the source bytes"""
+
+    def _text(self, start: int, end: int) -> str:
+        return self._source[start:end].decode("utf-8", errors="replace")
+
+    def _find(self, name: str, starts: np.ndarray, ends: np.ndarray) -> Optional[int]:
+        """Row whose key (source bytes starts[i]:ends[i]) equals name, in O(log n)"""
+        order = self._arrays["key_order"]
+        keys = _SortedKeys(lambda i: self._source[int(starts[i]):int(ends[i])], order)
+        target = name.encode("utf-8")
+        position = bisect.bisect_left(keys, target)
+        if position < len(keys) and keys[position] == target:
+            return int(order[position])
+        return None
+
+    def close(self) -> None:
+        """Release the source mapping"""
+        if isinstance(self._source, mmap.mmap):
+            self._source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class GenomeIndex(_IndexedFile):
+    """Indexed BioXen ``.genome`` (or Syn3A annotation) file
+
+    Gene records are read lazily; coordinates are exposed as arrays::
+
+        index = GenomeIndex("genomes/syn3A.genome")
+        index.starts, index.ends, index.strands     # NumPy arrays
+        index.gene(10), index.find("JCVISYN3A_0002")
+    """
+
+    _kind = _KIND_ANNOTATION
+
+    def _build(self, data: bytes) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        # Same record rules as the text parsers: 7+ fields, the first five integers
+        columns: Dict[str, List[int]] = {name: [] for name in (
+            "start", "length", "end", "strand", "type", "id_start", "id_end",
+            "description_start", "description_end")}
+        metadata: Dict[str, Any] = {}
+        skipped = 0
+        offset = 0
+        for line in data.splitlines(keepends=True):
+            line_start = offset
+            offset += len(line)
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if stripped.startswith(b"#"):
+                self._parse_comment(stripped.decode("utf-8", errors="replace"), metadata)
+                continue
+            tokens = list(_TOKEN.finditer(line))
+            if len(tokens) < 7:
+                continue
+            try:
+                values = [int(token.group()) for token in tokens[:5]]
+            except ValueError:
+                skipped += 1
+                continue
+            for name, value in zip(("start", "length", "end", "strand", "type"), values):
+                columns[name].append(value)
+            columns["id_start"].append(line_start + tokens[5].start())
+            columns["id_end"].append(line_start + tokens[5].end())
+            columns["description_start"].append(line_start + tokens[6].start())
+            columns["description_end"].append(line_start + tokens[-1].end())
+
+        arrays = {
+            "start": np.array(columns["start"], dtype=np.int64),
+            "length": np.array(columns["length"], dtype=np.int64),
+            "end": np.array(columns["end"], dtype=np.int64),
+            "strand": np.array(columns["strand"], dtype=np.int8),
+            "type": np.array(columns["type"], dtype=np.int8),
+            "id_start": np.array(columns["id_start"], dtype=np.int64),
+            "id_end": np.array(columns["id_end"], dtype=np.int64),
+            "description_start": np.array(columns["description_start"], dtype=np.int64),
+            "description_end": np.array(columns["description_end"], dtype=np.int64),
+        }
+        ids = [data[s:e] for s, e in zip(columns["id_start"], columns["id_end"])]
+        arrays["key_order"] = np.array(sorted(range(len(ids)), key=ids.__getitem__), dtype=np.int32)
+        metadata["skipped_lines"] = skipped
+        return metadata, arrays
+
+    @staticmethod
+    def _parse_comment(line: str, metadata: Dict[str, Any]) -> None:
+        if 'Organism:' in line:
+            metadata['organism'] = line.split('Organism:', 1)[1].strip()
+        elif 'Strain:' in line:
+            metadata['strain'] = line.split('Strain:', 1)[1].strip()
+        elif 'Genome size:' in line:
+            size_str = line.split(':', 1)[1].strip().replace(',', '').split()
+            if size_str and size_str[0].isdigit():
+                metadata['genome_size'] = int(size_str[0])
+
+    def __len__(self) -> int:
+        return len(self._arrays["start"])
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self._arrays["start"]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self._arrays["length"]
+
+    @property
+    def ends(self) -> np.ndarray:
+        return self._arrays["end"]
+
+    @property
+    def strands(self) -> np.ndarray:
+        return self._arrays["strand"]
+
+    @property
+    def types(self) -> np.ndarray:
+        return self._arrays["type"]
+
+    @property
+    def organism(self) -> Optional[str]:
+        return self.metadata.get("organism")
+
+    @property
+    def total_length(self) -> int:
+        """Largest gene end coordinate (as ``RealGenomeParser.parse_syn3a`` reports)"""
+        return int(self.ends.max()) if len(self) else 0
+
+    def gene_id(self, i: int) -> str:
+        return self._text(int(self._arrays["id_start"][i]), int(self._arrays["id_end"][i]))
+
+    def description(self, i: int) -> str:
+        raw = self._text(int(self._arrays["description_start"][i]),
+                         int(self._arrays["description_end"][i]))
+        return ' '.join(raw.split())
+
+    def gene(self, i: int) -> Gene:
+        """Materialize one gene record"""
+        if i < 0:
+            i += len(self)
+        return Gene(
+            start=int(self.starts[i]),
+            length=int(self.lengths[i]),
+            end=int(self.ends[i]),
+            strand=int(self.strands[i]),
+            type=int(self.types[i]),
+            id=self.gene_id(i),
+            description=self.description(i)
+        )
+
+    def find(self, gene_id: str) -> Optional[Gene]:
+        """Gene with the given ID (binary search over the stored ID order)"""
+        i = self._find(gene_id, self._arrays["id_start"], self._arrays["id_end"])
+        return None if i is None else self.gene(i)
+
+    def genes_in_region(self, start: int, end: int) -> List[Gene]:
+        """Genes lying entirely within [start, end]"""
+        rows = np.flatnonzero((self.starts >= start) & (self.ends <= end))
+        return [self.gene(int(i)) for i in rows]
+
+    def __iter__(self) -> Iterator[Gene]:
+        for i in range(len(self)):
+            yield self.gene(i)
+
+    def to_real_genome(self, organism: Optional[str] = None) -> RealGenome:
+        """Materialize every record as a RealGenome"""
+        return RealGenome(
+            organism=organism or self.organism or "Unknown",
+            genes=list(self),
+            total_length=self.total_length
+        )
+
+
+class FastaIndex(_IndexedFile):
+    """Indexed (multi-)FASTA file with random-access sequence slices
+
+    Like ``samtools faidx``, every record must use one line width (except
+    for its last line)::
+
+        fasta = FastaIndex("genomes/syn3A.fasta")
+        fasta.names()[:3], fasta.length("JCVISYN3A_0002_001")
+        fasta.fetch("JCVISYN3A_0002_001", 0, 60)
+    """
+
+    _kind = _KIND_FASTA
+
+    def _build(self, data: bytes) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        columns: Dict[str, List[int]] = {name: [] for name in (
+            "name_start", "name_end", "header_end", "sequence_start", "length",
+            "line_bases", "line_bytes")}
+        record = None  # [name, sequence start, bases, line bases, line bytes, short line seen]
+
+        def finish():
+            if record is not None:
+                columns["length"].append(record[2])
+                columns["line_bases"].append(record[3])
+                columns["line_bytes"].append(record[4])
+
+        offset = 0
+        for line in data.splitlines(keepends=True):
+            line_start = offset
+            offset += len(line)
+            if line.startswith(b">"):
+                finish()
+                name = _TOKEN.search(line, 1)
+                if name is None:
+                    raise ValueError(f"FASTA record without a name at byte {line_start} of {self.path}")
+                columns["name_start"].append(line_start + name.start())
+                columns["name_end"].append(line_start + name.end())
+                columns["header_end"].append(line_start + len(line.rstrip(b"\r\n")))
+                columns["sequence_start"].append(offset)
+                record = [name.group(), offset, 0, 0, 0, False]
+                continue
+            if record is None:
+                if line.strip():
+                    raise ValueError(f"Sequence data before the first FASTA header in {self.path}")
+                continue
+            bases = len(line.rstrip(b"\r\n"))
+            if not bases:
+                continue
+            if record[5] or (record[3] and bases > record[3]):
+                raise ValueError(f"FASTA record {record[0].decode()} in {self.path} "
+                                 f"has inconsistent line lengths")
+            if not record[3]:
+                record[3], record[4] = bases, len(line)
+            elif bases < record[3]:
+                record[5] = True  # Only the last line may be shorter
+            record[2] += bases
+        finish()
+
+        arrays = {name: np.array(values, dtype=np.int64) for name, values in columns.items()}
+        names = [data[s:e] for s, e in zip(columns["name_start"], columns["name_end"])]
+        arrays["key_order"] = np.array(sorted(range(len(names)), key=names.__getitem__),
+                                       dtype=np.int32)
+        return {}, arrays
+
+    def __len__(self) -> int:
+        return len(self._arrays["length"])
+
+    def __contains__(self, name: str) -> bool:
+        return self._record(name, required=False) is not None
+
+    def names(self) -> List[str]:
+        """Record names in file order"""
+        return [self._text(int(s), int(e))
+                for s, e in zip(self._arrays["name_start"], self._arrays["name_end"])]
+
+    def _record(self, name: str, required: bool = True) -> Optional[int]:
+        i = self._find(name, self._arrays["name_start"], self._arrays["name_end"])
+        if i is None and required:
+            raise KeyError(f"No FASTA record named {name} in {self.path}")
+        return i
+
+    def length(self, name: str) -> int:
+        """Number of bases in a record"""
+        return int(self._arrays["length"][self._record(name)])
+
+    def header(self, name: str) -> str:
+        """Full header line of a record (without the leading '>')"""
+        i = self._record(name)
+        return self._text(int(self._arrays["name_start"][i]), int(self._arrays["header_end"][i]))
+
+    def fetch(self, name: str, start: int = 0, end: Optional[int] = None) -> str:
+        """Bases [start, end) of a record (0-based, end defaults to the record end)"""
+        i = self._record(name)
+        length = int(self._arrays["length"][i])
+        end = length if end is None else min(end, length)
+        start = max(0, start)
+        if start >= end:
+            return ""
+        line_bases = int(self._arrays["line_bases"][i])
+        line_bytes = int(self._arrays["line_bytes"][i])
+        base = int(self._arrays["sequence_start"][i])
+        first = base + (start // line_bases) * line_bytes + start % line_bases
+        last = base + ((end - 1) // line_bases) * line_bytes + (end - 1) % line_bases + 1
+        raw = self._source[first:last]
+        return raw.replace(b"\n", b"").replace(b"\r", b"").decode("ascii")
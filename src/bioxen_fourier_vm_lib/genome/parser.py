@@ -3,16 +3,26 @@ Real genome data parser for JCVI-Syn3A and other organisms.
 Extends BioXen to work with actual biological data.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import re
 
+import numpy as np
+
 try:
     from .schema import BioXenGenomeSchema, BioXenGeneRecord
+    from .classifier import (CATEGORIES, category_of_description, classify_descriptions,
+                             count_by_category, is_essential_description)
+    from .intervals import GeneIntervalIndex
+    from ..monitoring.tracing import traced
 except ImportError:
     # Fallback for direct execution
     from schema import BioXenGenomeSchema, BioXenGeneRecord
+    from classifier import (CATEGORIES, category_of_description, classify_descriptions,
+                            count_by_category, is_essential_description)
+    from intervals import GeneIntervalIndex
+    from monitoring.tracing import traced
 
 @dataclass
 class Gene:
@@ -28,37 +38,12 @@ class Gene:
     @property
     def is_essential(self) -> bool:
         """Determine if gene is essential based on known essential functions."""
-        essential_keywords = [
-            'ribosomal', 'ribosome', 'rRNA', 'tRNA',
-            'DNA polymerase', 'RNA polymerase',
-            'ATP synthase', 'translation', 'transcription',
-            'replication', 'gyrase', 'helicase',
-            'aminoacyl', 'ligase', 'synthetase'
-        ]
-        return any(keyword.lower() in self.description.lower() 
-                  for keyword in essential_keywords)
+        return is_essential_description(self.description)
     
     @property
     def functional_category(self) -> str:
-        """Categorize gene by function."""
-        desc_lower = self.description.lower()
-        
-        if any(term in desc_lower for term in ['ribosomal', 'ribosome', 'rrna']):
-            return 'protein_synthesis'
-        elif any(term in desc_lower for term in ['dna polymerase', 'replication', 'helicase']):
-            return 'dna_replication'
-        elif any(term in desc_lower for term in ['rna polymerase', 'transcription']):
-            return 'transcription'
-        elif any(term in desc_lower for term in ['atp synthase', 'kinase', 'phosphate']):
-            return 'energy_metabolism'
-        elif any(term in desc_lower for term in ['ligase', 'synthetase', 'transferase']):
-            return 'metabolism'
-        elif 'trna' in desc_lower:
-            return 'translation'
-        elif any(term in desc_lower for term in ['transport', 'abc']):
-            return 'transport'
-        else:
-            return 'other'
+        """Categorize gene by function (see genome/classifier.py for the keywords)."""
+        return category_of_description(self.description)
 
 @dataclass
 class RealGenome:
@@ -66,25 +51,62 @@ class RealGenome:
     organism: str
     genes: List[Gene]
     total_length: int
+    _interval_index: Optional[Tuple[int, int, GeneIntervalIndex]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _classification: Optional[Tuple[Tuple[int, int], np.ndarray, np.ndarray]] = field(
+        default=None, init=False, repr=False, compare=False)
+    
+    def classify(self, precomputed: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> None:
+        """Classify all genes at once, or adopt (essential flags, category codes) computed elsewhere."""
+        flags, codes = precomputed or classify_descriptions(gene.description for gene in self.genes)
+        self._classification = ((id(self.genes), len(self.genes)), flags, codes)
+    
+    def _classified(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Reclassified when the gene list is replaced or resized
+        if self._classification is None or self._classification[0] != (id(self.genes), len(self.genes)):
+            self.classify()
+        return self._classification[1], self._classification[2]
+    
+    @property
+    def essential_flags(self) -> np.ndarray:
+        """Per-gene essential flags (bool array)."""
+        return self._classified()[0]
+    
+    @property
+    def category_codes(self) -> np.ndarray:
+        """Per-gene functional category codes (int8 array indexing classifier.CATEGORIES)."""
+        return self._classified()[1]
     
     @property
     def essential_genes(self) -> List[Gene]:
         """Get all essential genes."""
-        return [gene for gene in self.genes if gene.is_essential]
+        return [self.genes[i] for i in np.flatnonzero(self.essential_flags)]
     
     @property
     def gene_count_by_category(self) -> Dict[str, int]:
         """Count genes by functional category."""
-        categories = {}
-        for gene in self.genes:
-            cat = gene.functional_category
-            categories[cat] = categories.get(cat, 0) + 1
-        return categories
+        return count_by_category(self.category_codes)
+    
+    @property
+    def interval_index(self) -> GeneIntervalIndex:
+        """Interval index over the genes (rebuilt when the gene list is replaced or resized)."""
+        stamp = (id(self.genes), len(self.genes))
+        if self._interval_index is None or self._interval_index[:2] != stamp:
+            self._interval_index = stamp + (GeneIntervalIndex.from_genes(self.genes),)
+        return self._interval_index[2]
     
-    def genes_in_region(self, start: int, end: int) -> List[Gene]:
+    def genes_in_region(self, start: int, end: int, strand: Optional[int] = None) -> List[Gene]:
         """Get genes within a genomic region."""
-        return [gene for gene in self.genes 
-                if gene.start >= start and gene.end <= end]
+        return [self.genes[i] for i in self.interval_index.in_region(start, end, strand)]
+    
+    def overlapping_genes(self, start: int, end: int, strand: Optional[int] = None) -> List[Gene]:
+        """Get genes sharing at least one position with a genomic region."""
+        return [self.genes[i] for i in self.interval_index.overlapping(start, end, strand)]
+    
+    def nearest_gene(self, position: int, strand: Optional[int] = None) -> Optional[Gene]:
+        """Get the gene closest to a genomic position."""
+        i = self.interval_index.nearest(position, strand)
+        return None if i is None else self.genes[i]
 
 class RealGenomeParser:
     """Parser for real genome annotation files."""
@@ -141,6 +163,7 @@ class RealGenomeParser:
     def create_bioxen_compatible_template(real_genome: RealGenome) -> Dict:
         """Convert real genome to BioXen template format."""
         essential_genes = real_genome.essential_genes
+        essential_codes = real_genome.category_codes[real_genome.essential_flags]
         
         template = {
             'organism': real_genome.organism,
@@ -160,8 +183,8 @@ class RealGenomeParser:
         }
         
         # Group essential genes by function
-        for gene in essential_genes:
-            category = gene.functional_category
+        for gene, code in zip(essential_genes, essential_codes):
+            category = CATEGORIES[code]
             if category not in template['essential_by_function']:
                 template['essential_by_function'][category] = []
             template['essential_by_function'][category].append({
@@ -191,20 +214,54 @@ class BioXenRealGenomeIntegrator:
             self.genome_path = genome_path
         self.real_genome = None
         self.bioxen_template = None
+        self.compiled = None  # CompiledGenome from the .bxg cache
     
+    @traced("load_genome", category="genome")
     def load_genome(self) -> RealGenome:
         """Load and parse the real genome."""
         if self.genome_path.name.lower().startswith('syn3a'):
             # Legacy syn3A format
-            self.real_genome = RealGenomeParser.parse_syn3a(self.genome_path)
+            parse = RealGenomeParser.parse_syn3a
         elif self.genome_path.suffix == '.genome':
             # New BioXen schema format
-            self.real_genome = self._parse_bioxen_format()
+            parse = lambda path: self._parse_bioxen_format()
         else:
             raise ValueError(f"Unsupported genome format: {self.genome_path.name}")
-        
+
+        if self.load_compiled() is not None:
+            self.real_genome = self.compiled.to_real_genome()
+            return self.real_genome
+
+        self.real_genome = parse(self.genome_path)
+        self.real_genome.classify()
+        self._compile()
         return self.real_genome
-    
+
+    def load_compiled(self):
+        """Map the genome's compiled .bxg cache; None if it is missing or stale."""
+        from .compiled import load_compiled
+
+        if self.compiled is None:
+            self.compiled = load_compiled(self.genome_path)
+        return self.compiled
+
+    def _compile(self) -> None:
+        """Write the .bxg cache of the parsed genome (best effort)."""
+        from .compiled import compile_genome, load_compiled
+
+        try:
+            self.compiled = load_compiled(self.genome_path, compile_genome(self.real_genome, self.genome_path))
+        except OSError:
+            self.compiled = None
+
+    def open_index(self, rebuild: bool = False):
+        """Open a memory-mapped index of the genome file (GenomeIndex or FastaIndex)."""
+        from .index import FastaIndex, GenomeIndex
+
+        if self.genome_path.suffix.lower() in ('.fasta', '.fa', '.fna'):
+            return FastaIndex(self.genome_path, rebuild=rebuild)
+        return GenomeIndex(self.genome_path, rebuild=rebuild)
+
     def _parse_bioxen_format(self) -> RealGenome:
         """Parse BioXen schema format genome files."""
         from .schema import BioXenGenomeSchema
@@ -248,16 +305,20 @@ class BioXenRealGenomeIntegrator:
     
     def create_vm_template(self) -> Dict:
         """Create BioXen VM template from real genome."""
-        if not self.real_genome:
+        if not self.real_genome and self.load_compiled() is None:
             self.load_genome()
-        
-        self.bioxen_template = RealGenomeParser.create_bioxen_compatible_template(self.real_genome)
+
+        # The compiled genome decodes only the essential genes the template lists
+        genome = self.compiled if self.compiled is not None else self.real_genome
+        self.bioxen_template = RealGenomeParser.create_bioxen_compatible_template(genome)
         return self.bioxen_template
     
     def simulate_vm_creation(self, vm_id: str, allocated_resources: Dict) -> Dict:
         """Simulate creating a VM with real genome constraints."""
         if not self.bioxen_template:
             self.create_vm_template()
+        if not self.real_genome:
+            self.load_genome()
         
         # Check resource constraints against real genome requirements
         min_memory = self.bioxen_template['min_memory_kb']
@@ -304,8 +365,10 @@ class BioXenRealGenomeIntegrator:
     
     def get_genome_stats(self) -> Dict:
         """Get comprehensive statistics about the real genome."""
-        if not self.real_genome:
+        if not self.real_genome and self.load_compiled() is None:
             self.load_genome()
+        if self.compiled is not None:
+            return self.compiled.genome_stats()
         
         total_genes = len(self.real_genome.genes)
         essential_genes = len(self.real_genome.essential_genes)
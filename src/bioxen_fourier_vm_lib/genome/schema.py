@@ -12,6 +12,14 @@ import json
 import re
 from enum import Enum
 
+try:
+    from .intervals import GeneIntervalIndex
+    from ..monitoring.tracing import traced
+except ImportError:
+    # Fallback for direct execution
+    from intervals import GeneIntervalIndex
+    from monitoring.tracing import traced
+
 class GeneType(Enum):
     """Standard gene types in BioXen genome format."""
     PROTEIN_CODING = 1
@@ -134,6 +142,7 @@ class BioXenGenomeSchema:
         self.calculate_statistics()
     
     @classmethod
+    @traced("load_genome_schema", category="genome", arg="genome_path")
     def load_from_file(cls, genome_path: Path) -> 'BioXenGenomeSchema':
         """Load a BioXen genome schema from a .genome file."""
         genes = []
@@ -387,29 +396,33 @@ class BioXenGenomeValidator:
             with open(genome_path, 'r') as f:
                 lines = f.readlines()
             
-            gene_count = 0
-            positions = []
+            line_errors = []  # Errors of each record line, in file order
+            genes = []
             
             for line_num, line in enumerate(lines, 1):
                 line = line.strip()
                 if not line or line.startswith('#'):
                     continue
                 
+                messages = []
                 try:
                     gene = BioXenGeneRecord.from_bioxen_line(line)
                     if not gene.validate():
-                        errors.append(f"Line {line_num}: Invalid gene record {gene.gene_id}")
-                    
-                    # Check for overlaps (basic)
-                    for pos in positions:
-                        if not (gene.end < pos[0] or gene.start > pos[1]):
-                            errors.append(f"Line {line_num}: Gene {gene.gene_id} overlaps with previous gene")
-                    
-                    positions.append((gene.start, gene.end))
-                    gene_count += 1
+                        messages.append(f"Line {line_num}: Invalid gene record {gene.gene_id}")
+                    genes.append((line_num, gene, messages))
                     
                 except Exception as e:
-                    errors.append(f"Line {line_num}: Parse error - {e}")
+                    messages.append(f"Line {line_num}: Parse error - {e}")
+                line_errors.append(messages)
+            
+            # Check for overlaps with previous genes (interval index, not pairwise)
+            index = GeneIntervalIndex.from_genes(gene for _, gene, _ in genes)
+            for (line_num, gene, messages), count in zip(genes, index.earlier_overlap_counts()):
+                messages.extend([f"Line {line_num}: Gene {gene.gene_id} overlaps with previous gene"] * int(count))
+            
+            for messages in line_errors:
+                errors.extend(messages)
+            gene_count = len(genes)
             
             if gene_count == 0:
                 errors.append("No valid gene records found")
@@ -6,12 +6,17 @@ virtualized versions for use in the BioXen hypervisor.
 """
 
 from typing import Dict, List, Optional, Set
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import json
 
 @dataclass
 class Gene:
-    """Represents a gene in the Syn3A genome"""
+    """Represents a gene in the Syn3A genome
+    
+    Cloned genomes share Gene objects with their source, so genes reachable
+    from more than one genome must be replaced (``dataclasses.replace``)
+    rather than modified in place.
+    """
     gene_id: str
     name: str
     sequence: str
@@ -177,24 +182,14 @@ class VMImageBuilder:
         return vm_image
     
     def _clone_genome(self, source: Syn3AGenome, new_id: str) -> Syn3AGenome:
-        """Create a copy of the genome for modification"""
-        cloned_genes = []
-        for gene in source.genes:
-            cloned_gene = Gene(
-                gene_id=gene.gene_id,
-                name=gene.name,
-                sequence=gene.sequence,
-                function=gene.function,
-                essential=gene.essential,
-                category=gene.category,
-                start_pos=gene.start_pos,
-                end_pos=gene.end_pos
-            )
-            cloned_genes.append(cloned_gene)
-            
+        """Create a copy-on-write copy of the genome for modification
+        
+        Only the gene list is copied; the Gene objects (and their sequences)
+        are shared with the source until a modification replaces them.
+        """
         return Syn3AGenome(
             genome_id=new_id,
-            genes=cloned_genes,
+            genes=list(source.genes),
             total_size=source.total_size,
             gc_content=source.gc_content
         )
@@ -202,25 +197,28 @@ class VMImageBuilder:
     def _add_vm_tags(self, genome: Syn3AGenome, vm_id: str) -> None:
         """Add VM-specific protein tags to all genes"""
         try:
-            from ..genetics.circuits import ProteinTagging
+            from ..genetics.circuits.core import ProteinTagging
         except ImportError:
             # Fallback for direct execution
             import sys
             import os
             sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-            from genetics.circuits import ProteinTagging
+            from genetics.circuits.core import ProteinTagging
         
         tagger = ProteinTagging()
         tag_sequence = tagger.get_protein_tag(vm_id)
+        # Convert tag to DNA sequence (simplified)
+        tag_dna = self._protein_to_dna(tag_sequence)
+        
+        if not tag_dna:
+            return  # Untagged VM: genes stay shared with the template
         
-        # Add tags to all protein-coding genes
-        for gene in genome.genes:
+        # Add tags to all protein-coding genes (tagged genes diverge from the template)
+        for index, gene in enumerate(genome.genes):
             if gene.category in ["transcription", "translation", "metabolism"]:
                 # Insert tag sequence after start codon
                 if gene.sequence.startswith("ATG"):
-                    # Convert tag to DNA sequence (simplified)
-                    tag_dna = self._protein_to_dna(tag_sequence)
-                    gene.sequence = "ATG" + tag_dna + gene.sequence[3:]
+                    genome.genes[index] = replace(gene, sequence="ATG" + tag_dna + gene.sequence[3:])
     
     def _add_isolation_markers(self, genome: Syn3AGenome, vm_id: str) -> None:
         """Add genetic markers for VM isolation"""
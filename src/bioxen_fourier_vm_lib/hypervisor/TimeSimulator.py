@@ -5,12 +5,18 @@ This module simulates Earth's natural temporal cycles (rotation, orbit, lunar ph
 to provide environmental cues for circadian rhythm modeling in biological VMs.
 """
 
-import time
 import math
 from enum import Enum
 from dataclasses import dataclass
 from typing import Optional
 
+try:
+    import numpy as np
+except ImportError:  # Vectorized evaluation is optional
+    np = None
+
+from .clock import WallClock
+
 
 class CyclePhase(Enum):
     """Phases based on Earth's astronomical cycles"""
@@ -40,6 +46,45 @@ class TemporalState:
     simulation_time_elapsed: float   # Total simulated seconds
 
 
+# Stable integer codes for CyclePhase, used by the vectorized batch API
+CYCLE_PHASES = tuple(CyclePhase)
+PHASE_CODES = {phase: code for code, phase in enumerate(CYCLE_PHASES)}
+
+
+@dataclass
+class TemporalStateBatch:
+    """Struct-of-arrays counterpart of TemporalState for many timestamps
+
+    Phase fields hold int8 codes into ``CYCLE_PHASES``.
+    """
+    solar_phase: "np.ndarray"
+    lunar_phase: "np.ndarray"
+    seasonal_phase: "np.ndarray"
+    light_intensity: "np.ndarray"
+    lunar_illumination: "np.ndarray"
+    seasonal_resource_factor: "np.ndarray"
+    temperature_modifier: "np.ndarray"
+    gravitational_tide_factor: "np.ndarray"
+    simulation_time_elapsed: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.simulation_time_elapsed)
+
+    def state_at(self, index: int) -> TemporalState:
+        """Materialize a single TemporalState from the batch"""
+        return TemporalState(
+            solar_phase=CYCLE_PHASES[self.solar_phase[index]],
+            lunar_phase=CYCLE_PHASES[self.lunar_phase[index]],
+            seasonal_phase=CYCLE_PHASES[self.seasonal_phase[index]],
+            light_intensity=float(self.light_intensity[index]),
+            lunar_illumination=float(self.lunar_illumination[index]),
+            seasonal_resource_factor=float(self.seasonal_resource_factor[index]),
+            temperature_modifier=float(self.temperature_modifier[index]),
+            gravitational_tide_factor=float(self.gravitational_tide_factor[index]),
+            simulation_time_elapsed=float(self.simulation_time_elapsed[index])
+        )
+
+
 class TimeSimulator:
     """
     Simulates Earth's natural temporal cycles for biological rhythm modeling.
@@ -58,7 +103,8 @@ class TimeSimulator:
                  latitude: float = 37.7749,  # San Francisco (radians would be better)
                  longitude: float = -122.4194,
                  start_time: Optional[float] = None,
-                 time_acceleration: float = 1.0):
+                 time_acceleration: float = 1.0,
+                 clock=None):
         """
         Initialize the time simulator.
 
@@ -67,10 +113,12 @@ class TimeSimulator:
             longitude: Geographic longitude in degrees (-180 to 180)
             start_time: Simulation start time (Unix timestamp, defaults to now)
             time_acceleration: Speed multiplier (1.0 = real Earth time)
+            clock: Time source with a ``now()`` method (defaults to the wall clock)
         """
         self.latitude = math.radians(latitude)  # Convert to radians
         self.longitude = math.radians(longitude)
-        self.start_time = start_time or time.time()
+        self.clock = clock or WallClock()
+        self.start_time = self.clock.now() if start_time is None else start_time
         self.time_acceleration = time_acceleration
 
         # Pre-compute some constants
@@ -85,7 +133,7 @@ class TimeSimulator:
         Returns:
             TemporalState with all current environmental conditions
         """
-        elapsed = (time.time() - self.start_time) * self.time_acceleration
+        elapsed = (self.clock.now() - self.start_time) * self.time_acceleration
 
         solar_phase = self._get_solar_phase(elapsed)
         lunar_phase = self._get_lunar_phase(elapsed)
@@ -109,6 +157,58 @@ class TimeSimulator:
             simulation_time_elapsed=elapsed
         )
 
+    def evaluate(self, elapsed) -> TemporalStateBatch:
+        """
+        Evaluate the temporal state for many timestamps in one vectorized call.
+
+        Produces the same values as calling get_current_state() at each
+        elapsed time, without reading the clock or looping in Python.
+
+        Args:
+            elapsed: Array-like of simulated seconds since simulation start
+
+        Returns:
+            TemporalStateBatch with one entry per timestamp
+        """
+        if np is None:
+            raise ImportError("TimeSimulator.evaluate() requires numpy")
+
+        elapsed = np.asarray(elapsed, dtype=np.float64)
+        two_pi = 2 * math.pi
+
+        solar_fraction = np.mod(elapsed, self.SOLAR_DAY_LENGTH) / self.SOLAR_DAY_LENGTH
+        lunar_fraction = np.mod(elapsed, self.LUNAR_SYNODIC_MONTH) / self.LUNAR_SYNODIC_MONTH
+        year_fraction = np.mod(elapsed, self.TROPICAL_YEAR) / self.TROPICAL_YEAR
+
+        solar_codes = np.array([PHASE_CODES[CyclePhase.SOLAR_DAY],
+                                PHASE_CODES[CyclePhase.SOLAR_NIGHT]], dtype=np.int8)
+        lunar_codes = np.array([PHASE_CODES[CyclePhase.LUNAR_NEW],
+                                PHASE_CODES[CyclePhase.LUNAR_WAXING],
+                                PHASE_CODES[CyclePhase.LUNAR_FULL],
+                                PHASE_CODES[CyclePhase.LUNAR_WANING],
+                                PHASE_CODES[CyclePhase.LUNAR_NEW]], dtype=np.int8)
+        seasonal_codes = np.array([PHASE_CODES[CyclePhase.SEASONAL_WINTER],
+                                   PHASE_CODES[CyclePhase.SEASONAL_SPRING],
+                                   PHASE_CODES[CyclePhase.SEASONAL_SUMMER],
+                                   PHASE_CODES[CyclePhase.SEASONAL_AUTUMN]], dtype=np.int8)
+
+        light_intensity = np.sin(math.pi * solar_fraction) * math.cos(self.latitude)
+        np.clip(light_intensity, 0.0, 1.0, out=light_intensity)
+
+        return TemporalStateBatch(
+            solar_phase=solar_codes[(solar_fraction >= 0.5).astype(np.intp)],
+            lunar_phase=lunar_codes[np.digitize(lunar_fraction, [0.125, 0.375, 0.625, 0.875])],
+            seasonal_phase=seasonal_codes[np.digitize(year_fraction, [0.25, 0.5, 0.75])],
+            light_intensity=light_intensity,
+            lunar_illumination=np.where(lunar_fraction < 0.5,
+                                        2 * lunar_fraction, 2 * (1 - lunar_fraction)),
+            seasonal_resource_factor=1.0 + 0.5 * np.sin(two_pi * year_fraction),
+            temperature_modifier=(20 * np.sin(two_pi * (year_fraction - 0.25))
+                                  - 10 * math.cos(self.latitude)),
+            gravitational_tide_factor=1.0 + 0.05 * np.sin(two_pi * lunar_fraction),
+            simulation_time_elapsed=elapsed
+        )
+
     def _get_solar_phase(self, elapsed: float) -> CyclePhase:
         """Determine solar day/night phase based on Earth's rotation."""
         solar_fraction = (elapsed % self.SOLAR_DAY_LENGTH) / self.SOLAR_DAY_LENGTH
@@ -225,13 +325,13 @@ class TimeSimulator:
 
     def get_circadian_phase(self) -> float:
         """Get current circadian phase (0-1, where 0 = dawn, 0.5 = dusk)."""
-        elapsed = (time.time() - self.start_time) * self.time_acceleration
+        elapsed = (self.clock.now() - self.start_time) * self.time_acceleration
         solar_fraction = (elapsed % self.SOLAR_DAY_LENGTH) / self.SOLAR_DAY_LENGTH
         return solar_fraction
 
     def get_circannual_phase(self) -> float:
         """Get current circannual phase (0-1, where 0 = winter solstice)."""
-        elapsed = (time.time() - self.start_time) * self.time_acceleration
+        elapsed = (self.clock.now() - self.start_time) * self.time_acceleration
         year_fraction = (elapsed % self.TROPICAL_YEAR) / self.TROPICAL_YEAR
         return year_fraction
 
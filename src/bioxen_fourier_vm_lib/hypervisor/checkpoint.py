@@ -0,0 +1,383 @@
+"""
+BioXen Hypervisor Checkpoints - Snapshot, restore and fork hypervisor state
+
+A checkpoint captures everything needed to resume a ``BioXenHypervisor``:
+the VM table and ``ResourceAllocation``s, the chassis resource pool and
+per-VM chassis records, the scheduler position, pending clock events and the
+``TimeSimulator`` offset. The format is a small binary container:
+
+- a fixed header (magic, format version, kind, stream ID, sequence numbers)
+- tagged sections: ``STAT`` (zlib-compressed JSON with the hypervisor,
+  scheduler and event state), ``VMS `` (the VM table as struct-packed
+  columns) and, in deltas, ``GONE`` (IDs of removed VMs)
+
+``CheckpointWriter`` produces a full checkpoint followed by incremental
+deltas that only carry the VMs changed since the previous checkpoint, so a
+long simulation can be checkpointed often at a cost proportional to what
+changed. ``restore(full, *deltas)`` rebuilds an independent hypervisor, and
+``fork`` clones a live one for what-if runs.
+
+The scheduling trace and decision-latency statistics are diagnostics and
+are not checkpointed. Genome templates are stored by name.
+"""
+
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..chassis import ChassisType
+from ..chassis.base import ChassisResources
+from .clock import EventType, SimulatedClock, WallClock
+from .core import BioXenHypervisor, ResourceAllocation, VirtualMachine, VMState
+from .schedulers import create_scheduler
+
+MAGIC = b"BXCK"
+FORMAT_VERSION = 1
+KIND_FULL = 0
+KIND_DELTA = 1
+
+# magic, version, kind, reserved, stream ID, sequence, base sequence
+_HEADER = struct.Struct("<4sBBHQQQ")
+_SECTION = struct.Struct("<4sI")
+
+_STATES = list(VMState)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+
+# Numeric VM columns: (name, array typecode); None is stored as NaN
+_VM_COLUMNS = (
+    ("state", "B"),
+    ("ribosomes", "q"),
+    ("atp_percentage", "d"),
+    ("rna_polymerase", "q"),
+    ("memory_kb", "q"),
+    ("priority", "q"),
+    ("boot_time", "d"),
+    ("start_time", "d"),
+    ("last_context_switch", "d"),
+    ("cpu_time_used", "d"),
+)
+
+_NAN = float("nan")
+
+
+def _optional(value: Optional[float]) -> float:
+    return _NAN if value is None else value
+
+
+def _from_optional(value: float) -> Optional[float]:
+    return None if value != value else value
+
+
+def _pack_array(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _unpack_array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def _pack_strings(strings: List[str]) -> bytes:
+    encoded = [s.encode("utf-8") for s in strings]
+    lengths = _pack_array(array("I", map(len, encoded)))
+    return struct.pack("<I", len(encoded)) + lengths + b"".join(encoded)
+
+
+def _unpack_strings(data: bytes, offset: int = 0) -> Tuple[List[str], int]:
+    (count,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    lengths = _unpack_array("I", data[offset:offset + 4 * count])
+    offset += 4 * count
+    strings = []
+    for length in lengths:
+        strings.append(data[offset:offset + length].decode("utf-8"))
+        offset += length
+    return strings, offset
+
+
+def _pack_json(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), 1)
+
+
+def _unpack_json(data: bytes) -> Any:
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+def _genome_name(genome_template: Any) -> str:
+    if isinstance(genome_template, str):
+        return genome_template
+    return str(getattr(genome_template, "organism", type(genome_template).__name__))
+
+
+def _vm_row(vm: VirtualMachine, chassis_record: Any) -> tuple:
+    """Everything checkpointed about one VM, used for delta change detection"""
+    resources = vm.resources
+    # Compare the chassis record by content: ballooning replaces records, and a
+    # new record can reuse a freed one's id()
+    return (
+        _genome_name(vm.genome_template), vm.health_status,
+        json.dumps(chassis_record, sort_keys=True, separators=(",", ":")),
+        _STATE_CODES[vm.state], resources.ribosomes, resources.atp_percentage,
+        resources.rna_polymerase, resources.memory_kb, resources.priority,
+        _optional(resources.boot_time), _optional(vm.start_time),
+        _optional(vm.last_context_switch), vm.cpu_time_used,
+    )
+
+
+def _encode_vms(vm_ids: List[str], rows: Dict[str, tuple], records: Dict[str, Any]) -> bytes:
+    """Columnar encoding of the given VMs"""
+    columns = list(zip(*(rows[vm_id] for vm_id in vm_ids))) or [()] * 13
+    parts = [
+        _pack_strings(vm_ids),
+        _pack_strings(list(columns[0])),
+        _pack_strings(list(columns[1])),
+    ]
+    for (_, typecode), values in zip(_VM_COLUMNS, columns[3:]):
+        parts.append(_pack_array(array(typecode, values)))
+    parts.append(_pack_json([records.get(vm_id) for vm_id in vm_ids]))
+    return b"".join(parts)
+
+
+def _decode_vms(data: bytes) -> Dict[str, Tuple[VirtualMachine, Any]]:
+    vm_ids, offset = _unpack_strings(data)
+    genomes, offset = _unpack_strings(data, offset)
+    health, offset = _unpack_strings(data, offset)
+    count = len(vm_ids)
+    columns = {}
+    for name, typecode in _VM_COLUMNS:
+        size = array(typecode).itemsize * count
+        columns[name] = _unpack_array(typecode, data[offset:offset + size])
+        offset += size
+    records = _unpack_json(data[offset:])
+
+    vms = {}
+    for i, vm_id in enumerate(vm_ids):
+        resources = ResourceAllocation(
+            ribosomes=columns["ribosomes"][i],
+            atp_percentage=columns["atp_percentage"][i],
+            rna_polymerase=columns["rna_polymerase"][i],
+            memory_kb=columns["memory_kb"][i],
+            priority=columns["priority"][i],
+            boot_time=_from_optional(columns["boot_time"][i]),
+        )
+        vm = VirtualMachine(
+            vm_id=vm_id,
+            state=_STATES[columns["state"][i]],
+            genome_template=genomes[i],
+            resources=resources,
+            start_time=_from_optional(columns["start_time"][i]),
+            last_context_switch=_from_optional(columns["last_context_switch"][i]),
+            cpu_time_used=columns["cpu_time_used"][i],
+            health_status=health[i],
+        )
+        vms[vm_id] = (vm, records[i])
+    return vms
+
+
+def _hypervisor_state(hypervisor: BioXenHypervisor) -> Dict[str, Any]:
+    """Scalar hypervisor, chassis, scheduler, event and time state"""
+    quantum_event = hypervisor._quantum_event
+    events = []
+    quantum_index = None
+    for event in hypervisor.events.pending():
+        if event is quantum_event:
+            quantum_index = len(events)
+        events.append([event.time, event.event_type.value, event.vm_id, event.payload])
+
+    resources = hypervisor.chassis.get_resource_status()
+    simulator = hypervisor.time_simulator
+    return {
+        "max_vms": hypervisor.max_vms,
+        "chassis_type": hypervisor.chassis_type.value,
+        "chassis_config": hypervisor.chassis_config,
+        "chassis_resources": {
+            "available_ribosomes": resources.available_ribosomes,
+            "available_atp": resources.available_atp,
+            "available_memory_kb": resources.available_memory_kb,
+            "organelle_capacity": resources.organelle_capacity,
+            "reclaimed_ribosomes": resources.reclaimed_ribosomes,
+            "reclaimed_atp": resources.reclaimed_atp,
+        },
+        "clock": {"simulated": bool(getattr(hypervisor.clock, "simulated", False)),
+                  "now": hypervisor.clock.now()},
+        "active_vm": hypervisor.active_vm,
+        "vm_order": list(hypervisor.vms),
+        "scheduler": hypervisor.scheduler.export_state(),
+        "events": events,
+        "quantum_event": quantum_index,
+        "time_simulator": {
+            "latitude": simulator.latitude,
+            "longitude": simulator.longitude,
+            "start_time": simulator.start_time,
+            "time_acceleration": simulator.time_acceleration,
+        },
+    }
+
+
+def _write(kind: int, stream: int, sequence: int, base: int,
+           sections: List[Tuple[bytes, bytes]]) -> bytes:
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, kind, 0, stream, sequence, base)]
+    for tag, payload in sections:
+        parts.append(_SECTION.pack(tag, len(payload)))
+        parts.append(payload)
+    return b"".join(parts)
+
+
+def _read(data: bytes) -> Tuple[int, int, int, int, Dict[bytes, bytes]]:
+    if len(data) < _HEADER.size:
+        raise ValueError("Checkpoint is truncated")
+    magic, version, kind, _, stream, sequence, base = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a BioXen checkpoint")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version: {version}. Supported: [{FORMAT_VERSION}]")
+    sections = {}
+    offset = _HEADER.size
+    view = memoryview(data)
+    while offset < len(data):
+        tag, length = _SECTION.unpack_from(data, offset)
+        offset += _SECTION.size
+        sections[tag] = bytes(view[offset:offset + length])
+        offset += length
+    return kind, stream, sequence, base, sections
+
+
+class CheckpointWriter:
+    """Produces a full checkpoint followed by incremental deltas
+
+    Each delta carries the hypervisor/scheduler state plus only the VMs that
+    were added or changed (and the IDs of those removed) since the previous
+    checkpoint from this writer.
+    """
+
+    def __init__(self, hypervisor: BioXenHypervisor):
+        self.hypervisor = hypervisor
+        self.stream = int.from_bytes(os.urandom(8), "little")
+        self.sequence = 0
+        self._rows: Optional[Dict[str, tuple]] = None
+
+    def _capture(self) -> Tuple[Dict[str, Any], Dict[str, tuple], Dict[str, Any]]:
+        hypervisor = self.hypervisor
+        with hypervisor._lock:
+            records = dict(hypervisor.chassis.active_vms)
+            rows = {vm_id: _vm_row(vm, records.get(vm_id))
+                    for vm_id, vm in hypervisor.vms.items()}
+            return _hypervisor_state(hypervisor), rows, records
+
+    def full(self) -> bytes:
+        """Checkpoint of the complete hypervisor state"""
+        state, rows, records = self._capture()
+        self.sequence += 1
+        self._rows = rows
+        return _write(KIND_FULL, self.stream, self.sequence, 0, [
+            (b"STAT", _pack_json(state)),
+            (b"VMS ", _encode_vms(list(rows), rows, records)),
+        ])
+
+    def delta(self) -> bytes:
+        """Changes since the previous checkpoint (requires a prior ``full``)"""
+        if self._rows is None:
+            raise RuntimeError("delta() requires a full checkpoint first")
+        state, rows, records = self._capture()
+        previous = self._rows
+        changed = [vm_id for vm_id, row in rows.items() if previous.get(vm_id) != row]
+        removed = [vm_id for vm_id in previous if vm_id not in rows]
+        base = self.sequence
+        self.sequence += 1
+        self._rows = rows
+        return _write(KIND_DELTA, self.stream, self.sequence, base, [
+            (b"STAT", _pack_json(state)),
+            (b"VMS ", _encode_vms(changed, rows, records)),
+            (b"GONE", _pack_strings(removed)),
+        ])
+
+
+def snapshot(hypervisor: BioXenHypervisor) -> bytes:
+    """Full checkpoint of a hypervisor"""
+    return CheckpointWriter(hypervisor).full()
+
+
+def restore(full: bytes, *deltas: bytes, clock=None) -> BioXenHypervisor:
+    """
+    Rebuild a hypervisor from a full checkpoint and any following deltas.
+
+    Args:
+        full: Output of ``snapshot`` or ``CheckpointWriter.full``
+        deltas: Deltas from the same writer, in order
+        clock: Clock for the restored hypervisor (defaults to a new
+               SimulatedClock at the checkpoint time, or a WallClock)
+
+    Raises:
+        ValueError: If the data is not a checkpoint or the delta chain is broken
+    """
+    kind, stream, sequence, _, sections = _read(full)
+    if kind != KIND_FULL:
+        raise ValueError("restore() needs a full checkpoint as its first argument")
+    state = _unpack_json(sections[b"STAT"])
+    vms = _decode_vms(sections[b"VMS "])
+
+    for delta in deltas:
+        kind, delta_stream, delta_sequence, base, sections = _read(delta)
+        if kind != KIND_DELTA or delta_stream != stream or base != sequence:
+            raise ValueError(f"Delta {delta_sequence} does not follow checkpoint {sequence}")
+        state = _unpack_json(sections[b"STAT"])
+        for vm_id in _unpack_strings(sections[b"GONE"])[0]:
+            vms.pop(vm_id, None)
+        vms.update(_decode_vms(sections[b"VMS "]))
+        sequence = delta_sequence
+
+    return _build(state, vms, clock)
+
+
+def fork(hypervisor: BioXenHypervisor, clock=None) -> BioXenHypervisor:
+    """Independent copy of a hypervisor for what-if analysis"""
+    return restore(snapshot(hypervisor), clock=clock)
+
+
+def _build(state: Dict[str, Any], vms: Dict[str, Tuple[VirtualMachine, Any]],
+           clock=None) -> BioXenHypervisor:
+    if clock is None:
+        clock_state = state["clock"]
+        clock = SimulatedClock(clock_state["now"]) if clock_state["simulated"] else WallClock()
+
+    scheduler_state = state["scheduler"]
+    scheduler = create_scheduler(scheduler_state["policy"], clock=clock)
+    hypervisor = BioXenHypervisor(
+        max_vms=state["max_vms"],
+        chassis_type=ChassisType(state["chassis_type"]),
+        chassis_config=state["chassis_config"],
+        clock=clock,
+        scheduler=scheduler,
+    )
+
+    chassis = hypervisor.chassis
+    chassis.current_resources = ChassisResources(**state["chassis_resources"])
+    chassis.active_vms = {}
+    for vm_id in state["vm_order"]:
+        vm, record = vms[vm_id]
+        hypervisor.vms[vm_id] = vm
+        if record is not None:
+            chassis.active_vms[vm_id] = record
+
+    scheduler.import_state(scheduler_state)
+    hypervisor.active_vm = state["active_vm"]
+    for index, (at_time, event_type, vm_id, payload) in enumerate(state["events"]):
+        event = hypervisor.events.schedule(at_time, EventType(event_type), vm_id=vm_id,
+                                           payload=payload)
+        if index == state["quantum_event"]:
+            hypervisor._quantum_event = event
+
+    simulator = hypervisor.time_simulator
+    for name, value in state["time_simulator"].items():
+        setattr(simulator, name, value)
+    return hypervisor
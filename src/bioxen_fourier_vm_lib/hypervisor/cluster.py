@@ -0,0 +1,395 @@
+"""
+BioXen Hypervisor Cluster - Shard VMs across chassis in worker processes
+
+A ``HypervisorCluster`` runs many ``BioXenHypervisor`` nodes (one chassis
+each) inside a pool of worker processes and exposes the familiar
+``create_vm`` / ``start_vm`` / ``list_vms`` API on top of them:
+
+- Each worker is a single-process ``ProcessPoolExecutor`` whose initializer
+  builds the worker's shard of hypervisors, so node state stays pinned to
+  one process while the shards run in parallel on all cores.
+- Calls are batched: every public operation (and the ``*_vms`` batch
+  variants) sends at most one IPC message per worker.
+- VMs are placed by bin-packing their ribosome/ATP/memory requests onto the
+  node with the tightest fit (best-fit decreasing for batches), using the
+  free capacity each worker reports back after every batch.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..chassis import ChassisType
+from .clock import SimulatedClock
+from .core import BioXenHypervisor, ResourceAllocation
+
+# Hypervisor methods that may be invoked remotely on a node
+_NODE_METHODS = {
+    "create_vm", "start_vm", "pause_vm", "resume_vm", "destroy_vm",
+    "get_vm_status", "list_vms", "run_scheduler", "run_for",
+    "get_system_resources", "allocate_vm_resources", "get_scheduler_stats",
+}
+
+# Per-process node table, populated by _init_worker inside each worker
+_NODES: Dict[str, BioXenHypervisor] = {}
+
+
+@dataclass
+class NodeCapacity:
+    """Free resources of one node as last reported by its worker"""
+    ribosomes: float
+    atp_percentage: float
+    memory_kb: float
+    vm_slots: int
+    total_ribosomes: float
+    total_atp: float
+    total_memory_kb: float
+
+    def fits(self, request: ResourceAllocation) -> bool:
+        return (self.vm_slots > 0 and
+                request.ribosomes <= self.ribosomes and
+                request.atp_percentage <= self.atp_percentage and
+                request.memory_kb <= self.memory_kb)
+
+    def leftover(self, request: ResourceAllocation) -> float:
+        """Normalized free capacity remaining after placing ``request``"""
+        return ((self.ribosomes - request.ribosomes) / max(self.total_ribosomes, 1) +
+                (self.atp_percentage - request.atp_percentage) / max(self.total_atp, 1) +
+                (self.memory_kb - request.memory_kb) / max(self.total_memory_kb, 1))
+
+    def reserve(self, request: ResourceAllocation, sign: int = 1) -> None:
+        self.ribosomes -= sign * request.ribosomes
+        self.atp_percentage -= sign * request.atp_percentage
+        self.memory_kb -= sign * request.memory_kb
+        self.vm_slots -= sign
+
+
+def _node_capacity(hypervisor: BioXenHypervisor) -> Dict[str, Any]:
+    """Free chassis resources of a node (chassis bookkeeping is authoritative)"""
+    resources = hypervisor.chassis.get_resource_status()
+    capabilities = hypervisor.chassis.get_capabilities()
+    return {
+        "ribosomes": resources.available_ribosomes,
+        "atp_percentage": resources.available_atp,
+        "memory_kb": resources.available_memory_kb,
+        "vm_slots": hypervisor.max_vms - len(hypervisor.vms),
+        "total_ribosomes": capabilities.max_ribosomes,
+        "total_atp": 100.0,
+        "total_memory_kb": resources.available_memory_kb + hypervisor.vms.allocated_memory_kb,
+    }
+
+
+def _init_worker(node_ids: List[str], hypervisor_kwargs: Dict[str, Any],
+                 simulated: bool, log_level: int) -> None:
+    """Build this worker's shard of hypervisors"""
+    logging.getLogger("bioxen_fourier_vm_lib").setLevel(log_level)
+    _NODES.clear()
+    for node_id in node_ids:
+        kwargs = dict(hypervisor_kwargs)
+        kwargs["chassis_config"] = {**kwargs.get("chassis_config", {}), "chassis_id": node_id}
+        if simulated:
+            kwargs["clock"] = SimulatedClock()
+        _NODES[node_id] = BioXenHypervisor(**kwargs)
+    # Hypervisor construction reconfigures logging; apply the level afterwards
+    logging.getLogger("bioxen_fourier_vm_lib").setLevel(log_level)
+
+
+def _execute_batch(operations: List[Tuple[str, str, tuple, dict]]
+                   ) -> Tuple[List[Any], Dict[str, Dict]]:
+    """Run a batch of node operations inside a worker
+
+    Returns the per-operation results and the updated capacity of every node
+    touched by the batch.
+    """
+    results = []
+    touched = set()
+    for node_id, method, args, kwargs in operations:
+        if method not in _NODE_METHODS:
+            results.append(ValueError(f"Unsupported cluster operation: {method}"))
+            continue
+        try:
+            results.append(getattr(_NODES[node_id], method)(*args, **kwargs))
+        except Exception as e:  # Returned, not raised, so one failure does not sink the batch
+            results.append(e)
+        touched.add(node_id)
+    return results, {node_id: _node_capacity(_NODES[node_id]) for node_id in touched}
+
+
+def _describe_worker() -> Dict[str, Dict[str, Any]]:
+    """Capacity and default allocation of every node in this worker"""
+    return {node_id: {"capacity": _node_capacity(hypervisor),
+                      "default_allocation": hypervisor.default_allocation()}
+            for node_id, hypervisor in _NODES.items()}
+
+
+class HypervisorCluster:
+    """Cluster of BioXen hypervisors sharded across worker processes"""
+
+    def __init__(self, n_nodes: int = 4, workers: Optional[int] = None,
+                 max_vms_per_node: int = 4, chassis_type: ChassisType = ChassisType.ECOLI,
+                 simulated: bool = False, log_level: int = logging.WARNING,
+                 hypervisor_kwargs: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the cluster (worker processes start on ``start()``).
+
+        Args:
+            n_nodes: Number of hypervisors (one chassis each)
+            workers: Worker processes (defaults to min(n_nodes, CPU count))
+            max_vms_per_node: ``max_vms`` of every hypervisor
+            chassis_type: Chassis type of every node
+            simulated: Give every node its own SimulatedClock (enables run_for)
+            log_level: Log level for the library inside worker processes
+            hypervisor_kwargs: Extra BioXenHypervisor arguments (e.g. scheduler)
+        """
+        if n_nodes <= 0:
+            raise ValueError("n_nodes must be positive")
+        self.n_nodes = n_nodes
+        self.workers = max(1, min(n_nodes, workers or os.cpu_count() or 1))
+        self.simulated = simulated
+        self.log_level = log_level
+        self.hypervisor_kwargs = {"max_vms": max_vms_per_node, "chassis_type": chassis_type,
+                                  **(hypervisor_kwargs or {})}
+
+        self.node_ids = [f"node-{i}" for i in range(n_nodes)]
+        self._worker_of = {node_id: i % self.workers for i, node_id in enumerate(self.node_ids)}
+        self._executors: List[ProcessPoolExecutor] = []
+
+        self.capacity: Dict[str, NodeCapacity] = {}
+        self.default_allocation: Dict[str, ResourceAllocation] = {}
+        self.placement: Dict[str, str] = {}  # vm_id -> node_id
+        self.logger = logging.getLogger(__name__)
+
+    # Lifecycle
+
+    def start(self) -> 'HypervisorCluster':
+        """Spawn the worker processes and build every node"""
+        if self._executors:
+            return self
+        for worker in range(self.workers):
+            node_ids = [node_id for node_id in self.node_ids if self._worker_of[node_id] == worker]
+            self._executors.append(ProcessPoolExecutor(
+                max_workers=1, initializer=_init_worker,
+                initargs=(node_ids, self.hypervisor_kwargs, self.simulated, self.log_level)
+            ))
+        for future in [executor.submit(_describe_worker) for executor in self._executors]:
+            for node_id, info in future.result().items():
+                self._update_capacity(node_id, info["capacity"])
+                self.default_allocation[node_id] = info["default_allocation"]
+        self.logger.info(f"Cluster started: {self.n_nodes} nodes on {self.workers} workers")
+        return self
+
+    def shutdown(self) -> None:
+        """Stop all worker processes (node state is discarded)"""
+        for executor in self._executors:
+            executor.shutdown(wait=True)
+        self._executors = []
+        self.capacity.clear()
+        self.placement.clear()
+
+    def __enter__(self) -> 'HypervisorCluster':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
+
+    # Batched IPC
+
+    def _update_capacity(self, node_id: str, reported: Dict[str, Any]) -> None:
+        self.capacity[node_id] = NodeCapacity(
+            ribosomes=reported["ribosomes"],
+            atp_percentage=reported["atp_percentage"],
+            memory_kb=reported["memory_kb"],
+            vm_slots=reported["vm_slots"],
+            total_ribosomes=reported["total_ribosomes"],
+            total_atp=reported["total_atp"],
+            total_memory_kb=reported["total_memory_kb"],
+        )
+
+    def execute(self, operations: Iterable[Tuple[str, str, tuple, dict]]) -> List[Any]:
+        """
+        Run ``(node_id, method, args, kwargs)`` operations with one IPC round
+        trip per worker; workers run their batches in parallel.
+
+        Returns results in input order. A failing operation yields its
+        exception object instead of raising.
+        """
+        if not self._executors:
+            raise RuntimeError("Cluster is not running; call start() first")
+
+        batches: Dict[int, List[Tuple[int, tuple]]] = {}
+        count = 0
+        for index, operation in enumerate(operations):
+            batches.setdefault(self._worker_of[operation[0]], []).append((index, operation))
+            count += 1
+
+        futures = {worker: self._executors[worker].submit(_execute_batch, [op for _, op in batch])
+                   for worker, batch in batches.items()}
+        results: List[Any] = [None] * count
+        for worker, future in futures.items():
+            batch_results, capacities = future.result()
+            for (index, _), result in zip(batches[worker], batch_results):
+                results[index] = result
+            for node_id, reported in capacities.items():
+                self._update_capacity(node_id, reported)
+        return results
+
+    def _broadcast(self, method: str, *args, **kwargs) -> Dict[str, Any]:
+        """Run a method on every node; re-raises the first node failure"""
+        results = self.execute((node_id, method, args, kwargs) for node_id in self.node_ids)
+        for node_id, result in zip(self.node_ids, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"{method} failed on node {node_id}: {result}")
+                raise result
+        return dict(zip(self.node_ids, results))
+
+    # Placement
+
+    def _place(self, request: ResourceAllocation) -> Optional[str]:
+        """Best fit: the node left with the least free capacity that still fits"""
+        best_node, best_leftover = None, None
+        for node_id, capacity in self.capacity.items():
+            if capacity.fits(request):
+                leftover = capacity.leftover(request)
+                if best_leftover is None or leftover < best_leftover:
+                    best_node, best_leftover = node_id, leftover
+        return best_node
+
+    def _request_for(self, allocation: Optional[ResourceAllocation]) -> ResourceAllocation:
+        if allocation is not None:
+            return allocation
+        return next(iter(self.default_allocation.values()))
+
+    # Hypervisor-compatible API
+
+    def create_vms(self, specs: Iterable[Tuple[str, str, Optional[ResourceAllocation]]]
+                   ) -> Dict[str, bool]:
+        """
+        Create many VMs with best-fit-decreasing placement and batched IPC.
+
+        Args:
+            specs: ``(vm_id, genome_template, resource_allocation)`` tuples
+
+        Returns:
+            Mapping of vm_id to creation success
+        """
+        specs = [(vm_id, genome, self._request_for(allocation))
+                 for vm_id, genome, allocation in specs]
+        # Largest requests first (by dominant normalized dimension)
+        totals = next(iter(self.capacity.values()))
+        specs.sort(key=lambda spec: -max(spec[2].ribosomes / max(totals.total_ribosomes, 1),
+                                         spec[2].atp_percentage / max(totals.total_atp, 1),
+                                         spec[2].memory_kb / max(totals.total_memory_kb, 1)))
+
+        outcome: Dict[str, bool] = {}
+        operations = []
+        placed = []
+        unplaced = []
+        for vm_id, genome, request in specs:
+            if vm_id in self.placement:
+                self.logger.error(f"VM {vm_id} already exists")
+                outcome[vm_id] = False
+                continue
+            node_id = self._place(request)
+            if node_id is None:
+                unplaced.append(vm_id)
+                outcome[vm_id] = False
+                continue
+            self.capacity[node_id].reserve(request)
+            self.placement[vm_id] = node_id
+            operations.append((node_id, "create_vm", (vm_id, genome, request), {}))
+            placed.append(vm_id)
+
+        if unplaced:
+            self.logger.error(f"No node has capacity for {len(unplaced)} VM(s): "
+                              f"{', '.join(unplaced[:5])}{', ...' if len(unplaced) > 5 else ''}")
+        for vm_id, result in zip(placed, self.execute(operations)):
+            outcome[vm_id] = result is True
+            if result is not True:
+                del self.placement[vm_id]
+        return outcome
+
+    def create_vm(self, vm_id: str, genome_template: str = "syn3a_minimal",
+                  resource_allocation: Optional[ResourceAllocation] = None) -> bool:
+        """Create a VM on the best-fitting node"""
+        return self.create_vms([(vm_id, genome_template, resource_allocation)])[vm_id]
+
+    def _per_vm(self, method: str, vm_ids: Iterable[str], *args) -> Dict[str, Any]:
+        """Run a method for each VM on its node; unknown or failing VMs map to False"""
+        vm_ids = list(vm_ids)
+        known = [vm_id for vm_id in vm_ids if vm_id in self.placement]
+        results = self.execute((self.placement[vm_id], method, (vm_id, *args), {})
+                               for vm_id in known)
+        outcome = dict.fromkeys(vm_ids, False)
+        for vm_id, result in zip(known, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"{method} failed for VM {vm_id}: {result}")
+                result = False
+            outcome[vm_id] = result
+        return outcome
+
+    def _per_vm_succeeded(self, method: str, vm_ids: Iterable[str]) -> Dict[str, bool]:
+        return {vm_id: result is True
+                for vm_id, result in self._per_vm(method, vm_ids).items()}
+
+    def start_vms(self, vm_ids: Iterable[str]) -> Dict[str, bool]:
+        """Start many VMs with one IPC round trip per worker"""
+        return self._per_vm_succeeded("start_vm", vm_ids)
+
+    def start_vm(self, vm_id: str) -> bool:
+        return self.start_vms([vm_id])[vm_id]
+
+    def pause_vm(self, vm_id: str) -> bool:
+        return self._per_vm_succeeded("pause_vm", [vm_id])[vm_id]
+
+    def resume_vm(self, vm_id: str) -> bool:
+        return self._per_vm_succeeded("resume_vm", [vm_id])[vm_id]
+
+    def destroy_vms(self, vm_ids: Iterable[str]) -> Dict[str, bool]:
+        """Destroy many VMs with one IPC round trip per worker"""
+        outcome = self._per_vm_succeeded("destroy_vm", vm_ids)
+        for vm_id, destroyed in outcome.items():
+            if destroyed:
+                self.placement.pop(vm_id, None)
+        return outcome
+
+    def destroy_vm(self, vm_id: str) -> bool:
+        return self.destroy_vms([vm_id])[vm_id]
+
+    def get_vm_status(self, vm_id: str) -> Optional[Dict[str, Any]]:
+        """Status of a VM, tagged with the node hosting it"""
+        status = self._per_vm("get_vm_status", [vm_id])[vm_id]
+        if not isinstance(status, dict):
+            return None
+        return {**status, "node": self.placement[vm_id]}
+
+    def list_vms(self) -> List[Dict[str, Any]]:
+        """List the VMs of every node, each tagged with its node"""
+        vms = []
+        for node_id, node_vms in self._broadcast("list_vms").items():
+            vms.extend({**status, "node": node_id} for status in node_vms)
+        return vms
+
+    def run_scheduler(self) -> None:
+        """Run one scheduler iteration on every node"""
+        self._broadcast("run_scheduler")
+
+    def run_for(self, seconds: float) -> int:
+        """Fast-forward every node's simulated clock in parallel"""
+        if not self.simulated:
+            raise RuntimeError("run_for() requires a cluster created with simulated=True")
+        return sum(self._broadcast("run_for", seconds).values())
+
+    def get_system_resources(self) -> Dict[str, Any]:
+        """Cluster-wide totals plus per-node resource reports"""
+        nodes = self._broadcast("get_system_resources")
+        return {
+            "nodes": nodes,
+            "total_nodes": self.n_nodes,
+            "total_vms": len(self.placement),
+            "active_vms": sum(node["active_vms"] for node in nodes.values()),
+            "allocated_ribosomes": sum(node["allocated_ribosomes"] for node in nodes.values()),
+            "available_ribosomes": sum(node["available_ribosomes"] for node in nodes.values()),
+            "total_atp_allocated": sum(node["total_atp_allocated"] for node in nodes.values()),
+        }
@@ -3,11 +3,29 @@ BioXen Hypervisor Core - Main hypervisor control logic
 
 This module implements the core biological hypervisor functionality,
 managing virtual machines running bacterial genomes on configurable cellular chassis.
+
+Concurrency model: lifecycle operations and scheduling are serialized by the
+hypervisor's lock. Readers (``list_vms``, ``get_system_resources``,
+``get_vm_status``) never take it; they read versioned snapshots of the VM
+table, so a monitoring thread can poll at high frequency without blocking
+or observing a half-applied change.
+
+Overcommit and ballooning: with ``chassis_config["overcommit_ratio"]`` above
+1.0 the chassis pools are scaled beyond the physical cell, and when an
+allocation does not fit the hypervisor reclaims ("balloons") part of the
+allocation of PAUSED and low-priority VMs. Reclaimed resources go back to
+their VM when it resumes. A VM's ResourceAllocation stays its nominal
+allocation; the chassis records what it currently holds.
 """
 
+import copy
 import time
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+from collections import deque
+from collections.abc import MutableMapping
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, NamedTuple, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -23,6 +41,10 @@ except ImportError:
 
 # Import time simulation
 from .TimeSimulator import TimeSimulator, TemporalState, CyclePhase
+from .clock import WallClock, EventQueue, EventType, SimulationEvent
+from .schedulers import VMScheduler, RoundRobinScheduler, create_scheduler
+from .metrics import HypervisorMetrics
+from ..monitoring.tracing import traced
 
 class VMState(Enum):
     """Virtual Machine states"""
@@ -73,10 +95,160 @@ class VirtualMachine:
     last_context_switch: Optional[float] = None
     cpu_time_used: float = 0.0
     health_status: str = "unknown"
+
+class RegistrySnapshot(NamedTuple):
+    """Consistent, read-only view of the VM table at one version"""
+    version: int
+    vms: Mapping[str, VirtualMachine]
+    by_state: Dict[VMState, Tuple[str, ...]]
+    allocated_ribosomes: int
+    allocated_atp: float
+    allocated_memory_kb: int
+
+class VMRegistry(MutableMapping):
+    """VM table with per-state indexes and running resource aggregates
+    
+    Behaves like the ``Dict[str, VirtualMachine]`` it replaces, but also keeps
+    an insertion-ordered index of VM IDs for every VMState plus totals of
+    allocated ribosomes, ATP and memory. State and resource changes must go
+    through ``set_state`` and ``update_resources`` so queries stay O(1).
+    
+    Writers are serialized by a lock and bump a sequence number before and
+    after each change (odd while a change is in progress). Readers take no
+    lock: ``snapshot`` and ``totals`` copy the state and retry if the sequence
+    number moved, so they never block writers and never see a torn update.
+    Snapshots share the VirtualMachine records themselves, whose fields may
+    be newer than the snapshot's version.
+    """
+    
+    def __init__(self):
+        self._vms: Dict[str, VirtualMachine] = {}
+        self._by_state: Dict[VMState, Dict[str, None]] = {state: {} for state in VMState}
+        self.allocated_ribosomes = 0
+        self.allocated_atp = 0.0
+        self.allocated_memory_kb = 0
+        self._write_lock = threading.Lock()
+        self._version = 0
+        self._snapshot: Optional[RegistrySnapshot] = None
+    
+    def __getitem__(self, vm_id: str) -> VirtualMachine:
+        return self._vms[vm_id]
+    
+    def __setitem__(self, vm_id: str, vm: VirtualMachine) -> None:
+        with self._write_lock:
+            self._version += 1
+            if vm_id in self._vms:
+                self._remove(vm_id)
+            self._vms[vm_id] = vm
+            self._by_state[vm.state][vm_id] = None
+            self._add_resources(vm.resources, 1)
+            self._version += 1
+    
+    def __delitem__(self, vm_id: str) -> None:
+        with self._write_lock:
+            if vm_id not in self._vms:
+                raise KeyError(vm_id)
+            self._version += 1
+            self._remove(vm_id)
+            self._version += 1
+    
+    def _remove(self, vm_id: str) -> None:
+        vm = self._vms.pop(vm_id)
+        del self._by_state[vm.state][vm_id]
+        self._add_resources(vm.resources, -1)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._vms)
+    
+    def __len__(self) -> int:
+        return len(self._vms)
+    
+    def __contains__(self, vm_id) -> bool:
+        return vm_id in self._vms
+    
+    def get(self, vm_id: str, default=None):
+        return self._vms.get(vm_id, default)
     
-    def __post_init__(self):
-        if self.start_time is None:
-            self.start_time = time.time()
+    def keys(self):
+        return self._vms.keys()
+    
+    def values(self):
+        return self._vms.values()
+    
+    def items(self):
+        return self._vms.items()
+    
+    def _add_resources(self, resources: ResourceAllocation, sign: int) -> None:
+        self.allocated_ribosomes += sign * resources.ribosomes
+        self.allocated_atp += sign * resources.atp_percentage
+        self.allocated_memory_kb += sign * resources.memory_kb
+    
+    def set_state(self, vm_id: str, state: VMState) -> None:
+        """Transition a VM to a new state, updating the state index"""
+        with self._write_lock:
+            vm = self._vms[vm_id]
+            if vm.state != state:
+                self._version += 1
+                del self._by_state[vm.state][vm_id]
+                self._by_state[state][vm_id] = None
+                vm.state = state
+                self._version += 1
+    
+    def update_resources(self, vm_id: str, **changes) -> None:
+        """Change ResourceAllocation fields of a VM, updating the aggregates"""
+        with self._write_lock:
+            vm = self._vms[vm_id]
+            # Copy-on-write so readers never see a half-updated allocation
+            resources = copy.copy(vm.resources)
+            for name, value in changes.items():
+                setattr(resources, name, value)
+            self._version += 1
+            self._add_resources(vm.resources, -1)
+            vm.resources = resources
+            self._add_resources(resources, 1)
+            self._version += 1
+    
+    def _read_consistent(self, read):
+        """Run ``read`` until it completes without a concurrent write (seqlock)"""
+        while True:
+            version = self._version
+            if not version & 1:
+                result = read(version)
+                if self._version == version:
+                    return result
+            time.sleep(0)  # Let the writer finish
+    
+    def snapshot(self) -> RegistrySnapshot:
+        """Consistent read-only view of the table, rebuilt only after a change"""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != self._version:
+            snapshot = self._snapshot = self._read_consistent(self._build_snapshot)
+        return snapshot
+    
+    def _build_snapshot(self, version: int) -> RegistrySnapshot:
+        return RegistrySnapshot(
+            version=version,
+            vms=MappingProxyType(self._vms.copy()),
+            by_state={state: tuple(ids) for state, ids in self._by_state.items()},
+            allocated_ribosomes=self.allocated_ribosomes,
+            allocated_atp=self.allocated_atp,
+            allocated_memory_kb=self.allocated_memory_kb
+        )
+    
+    def totals(self) -> Tuple[int, float, int, int]:
+        """Consistent (ribosomes, ATP, memory, running VMs) aggregates in O(1)"""
+        return self._read_consistent(lambda version: (
+            self.allocated_ribosomes, self.allocated_atp,
+            self.allocated_memory_kb, len(self._by_state[VMState.RUNNING])
+        ))
+    
+    def ids_in_state(self, state: VMState):
+        """View of the IDs of VMs in a state (creation order)"""
+        return self._by_state[state].keys()
+    
+    def count(self, state: VMState) -> int:
+        """Number of VMs in a state"""
+        return len(self._by_state[state])
 
 class BioXenHypervisor:
     def get_vm_state(self, vm_id: str):
@@ -93,20 +265,49 @@ class BioXenHypervisor:
     """
     
     def __init__(self, max_vms: int = 4, chassis_type: ChassisType = ChassisType.ECOLI, 
-                 chassis_config: Optional[Dict[str, Any]] = None):
+                 chassis_config: Optional[Dict[str, Any]] = None, clock=None,
+                 scheduler=None):
         self.max_vms = max_vms
         self.chassis_type = chassis_type
-        self.chassis_config = chassis_config or {}
+        self.chassis_config = dict(chassis_config or {})
         
         # Initialize chassis
         self.chassis = self._initialize_chassis()
         if not self.chassis or not self.chassis.initialize():
             raise RuntimeError(f"Failed to initialize {chassis_type.value} chassis")
+        self.chassis.set_overcommit_ratio(self.chassis_config.get("overcommit_ratio", 1.0))
         
-        self.vms: Dict[str, VirtualMachine] = {}
+        # Ballooning: VMs at or below this priority (and all PAUSED VMs) may
+        # have their allocation reclaimed, down to balloon_floor of nominal
+        self.balloon_max_priority = self.chassis_config.get("balloon_max_priority", 2)
+        self.balloon_floor = self.chassis_config.get("balloon_floor", 0.25)
+        self.balloon_stats = {"inflations": 0, "deflations": 0,
+                              "ribosomes_reclaimed": 0, "ribosomes_returned": 0,
+                              "atp_reclaimed": 0.0, "atp_returned": 0.0}
+        
+        # Time source: wall clock by default, SimulatedClock for fast-forward runs
+        self.clock = clock or WallClock()
+        self.events = EventQueue()
+        self.scheduling_trace: deque = deque(maxlen=10000)  # (time, event, vm_id)
+        self._quantum_event: Optional[SimulationEvent] = None
+        
+        # Serializes lifecycle changes and scheduling; readers use VM table snapshots
+        self._lock = threading.RLock()
+        self.vms = VMRegistry()
         self.active_vm: Optional[str] = None
         self.resource_monitor = ResourceMonitor()
-        self.scheduler = RoundRobinScheduler()
+        # Pre-aggregated counters/histograms for the metrics exporter
+        self.metrics = HypervisorMetrics()
+        # Scheduling policy: a VMScheduler instance or a policy name ("priority", "fair", ...)
+        if scheduler is None:
+            self.scheduler: VMScheduler = RoundRobinScheduler(clock=self.clock)
+        elif isinstance(scheduler, str):
+            self.scheduler = create_scheduler(scheduler, clock=self.clock)
+        else:
+            self.scheduler = scheduler
+            self.scheduler.clock = self.clock
+            self.scheduler.last_switch_time = self.clock.now()
+        self.scheduler.decision_histogram = self.metrics.scheduler_decision_latency
         
         # Get chassis-specific resource limits
         capabilities = self.chassis.get_capabilities()
@@ -114,14 +315,14 @@ class BioXenHypervisor:
         
         # Hypervisor overhead tracking
         self.hypervisor_overhead = 0.15  # 15% overhead
-        self.available_ribosomes = int(self.total_ribosomes * (1 - self.hypervisor_overhead))
+        self._update_available_ribosomes()
         
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         self.logger.info(f"BioXen Hypervisor initialized with {chassis_type.value} chassis")
         
         # Initialize time simulator for circadian rhythm modeling
-        self.time_simulator = TimeSimulator()
+        self.time_simulator = TimeSimulator(clock=self.clock)
     
     def _initialize_chassis(self) -> Optional[BaseChassis]:
         """Initialize the appropriate chassis based on type"""
@@ -134,154 +335,436 @@ class BioXenHypervisor:
         else:
             raise ValueError(f"Unsupported chassis type: {self.chassis_type}")
     
+    def _update_available_ribosomes(self) -> None:
+        self.available_ribosomes = int(self.total_ribosomes * self.chassis.overcommit_ratio *
+                                       (1 - self.hypervisor_overhead))
+    
+    @property
+    def overcommit_ratio(self) -> float:
+        return self.chassis.overcommit_ratio
+    
+    def set_overcommit_ratio(self, ratio: float) -> bool:
+        """Allow allocations up to ``ratio`` times the chassis' ribosomes and ATP
+        
+        Ratios above 1.0 also enable ballooning on demand. Returns False if
+        the ratio is too low for what is already allocated.
+        """
+        with self._lock:
+            if not self.chassis.set_overcommit_ratio(ratio):
+                self.logger.error(f"Cannot set overcommit ratio {ratio}: "
+                                  f"resources already allocated")
+                return False
+            self.chassis_config["overcommit_ratio"] = ratio
+            self._update_available_ribosomes()
+            self.logger.info(f"Overcommit ratio set to {ratio}")
+            return True
+    
     def get_chassis_info(self) -> Dict[str, Any]:
         """Get information about the current chassis"""
         if self.chassis:
             return self.chassis.get_chassis_info()
         return {"error": "No chassis initialized"}
         
+    def default_allocation(self) -> ResourceAllocation:
+        """Resource allocation used when a VM is created without one"""
+        return ResourceAllocation(
+            ribosomes=self.available_ribosomes // 4,  # Fair share
+            atp_percentage=25.0,  # 25% of ATP
+            rna_polymerase=10,
+            memory_kb=120 if self.chassis_type == ChassisType.ECOLI else 500,  # KB
+            priority=1
+        )
+        
+    @traced("create_vm", arg="vm_id")
     def create_vm(self, vm_id: str, genome_template: str = "syn3a_minimal", 
                   resource_allocation: Optional[ResourceAllocation] = None) -> bool:
         """Create a new virtual machine"""
-        
-        if len(self.vms) >= self.max_vms:
-            self.logger.error(f"Cannot create VM {vm_id}: Maximum VMs ({self.max_vms}) reached")
-            return False
+        with self._lock:
+            if len(self.vms) >= self.max_vms:
+                self.logger.error(f"Cannot create VM {vm_id}: Maximum VMs ({self.max_vms}) reached")
+                return False
             
-        if vm_id in self.vms:
-            self.logger.error(f"VM {vm_id} already exists")
-            return False
+            if vm_id in self.vms:
+                self.logger.error(f"VM {vm_id} already exists")
+                return False
             
-        if resource_allocation is None:
-            # Default resource allocation based on chassis
-            capabilities = self.chassis.get_capabilities()
-            default_ribosomes = self.available_ribosomes // 4  # Fair share
-            default_memory = 120 if self.chassis_type == ChassisType.ECOLI else 500  # KB
-            
-            resource_allocation = ResourceAllocation(
-                ribosomes=default_ribosomes,
-                atp_percentage=25.0,  # 25% of ATP
-                rna_polymerase=10,
-                memory_kb=default_memory,
-                priority=1
-            )
+            if resource_allocation is None:
+                resource_allocation = self.default_allocation()
+                self.logger.info(f"No resource allocation given for VM {vm_id}; using the default "
+                                 f"({resource_allocation.ribosomes} ribosomes, "
+                                 f"{resource_allocation.atp_percentage}% ATP, "
+                                 f"{resource_allocation.memory_kb}KB memory)")
         
-        # Prepare resource request for chassis
-        resource_request = {
-            "ribosomes": resource_allocation.ribosomes,
-            "atp_percentage": resource_allocation.atp_percentage,
-            "memory_kb": resource_allocation.memory_kb,
-            "rna_polymerase": resource_allocation.rna_polymerase
-        }
+            # Prepare resource request for chassis
+            resource_request = {
+                "ribosomes": resource_allocation.ribosomes,
+                "atp_percentage": resource_allocation.atp_percentage,
+                "memory_kb": resource_allocation.memory_kb,
+                "rna_polymerase": resource_allocation.rna_polymerase
+            }
         
-        # Try to allocate resources through chassis
-        if not self.chassis.allocate_resources(vm_id, resource_request):
-            self.logger.error(f"Failed to allocate chassis resources for VM {vm_id}")
-            return False
+            # Try to allocate resources through chassis
+            if not self._allocate_chassis(vm_id, resource_request):
+                self.logger.error(f"Failed to allocate chassis resources for VM {vm_id}")
+                return False
         
-        # Create VM instance
-        vm = VirtualMachine(
-            vm_id=vm_id,
-            genome_template=genome_template,
-            resources=resource_allocation
-        )
+            # Create VM instance
+            vm = VirtualMachine(
+                vm_id=vm_id,
+                genome_template=genome_template,
+                resources=resource_allocation,
+                start_time=self.clock.now()
+            )
         
-        # Create isolation environment
-        if not self.chassis.create_isolation_environment(vm_id):
-            self.logger.warning(f"Failed to create isolation environment for VM {vm_id}")
-            # Continue anyway - isolation is best-effort
+            # Create isolation environment
+            if not self.chassis.create_isolation_environment(vm_id):
+                self.logger.warning(f"Failed to create isolation environment for VM {vm_id}")
+                # Continue anyway - isolation is best-effort
         
-        self.vms[vm_id] = vm
+            self.vms[vm_id] = vm
         
-        # Create concise genome description for logging
-        if hasattr(genome_template, 'organism'):
-            genome_desc = f"{genome_template.organism} ({len(genome_template.genes)} genes)"
-        elif isinstance(genome_template, str):
-            genome_desc = genome_template
-        else:
-            genome_desc = f"{type(genome_template).__name__}"
+            # Create concise genome description for logging
+            if hasattr(genome_template, 'organism'):
+                genome_desc = f"{genome_template.organism} ({len(genome_template.genes)} genes)"
+            elif isinstance(genome_template, str):
+                genome_desc = genome_template
+            else:
+                genome_desc = f"{type(genome_template).__name__}"
             
-        self.logger.info(f"VM {vm_id} created successfully with {genome_desc} on {self.chassis_type.value} chassis")
-        return True
+            self.logger.info(f"VM {vm_id} created successfully with {genome_desc} "
+                             f"on {self.chassis_type.value} chassis")
+            return True
         
     def start_vm(self, vm_id: str) -> bool:
         """Start a virtual machine"""
-        if vm_id not in self.vms:
-            self.logger.error(f"VM {vm_id} does not exist")
-            return False
+        with self._lock:
+            if vm_id not in self.vms:
+                self.logger.error(f"VM {vm_id} does not exist")
+                return False
             
-        vm = self.vms[vm_id]
-        if vm.state != VMState.CREATED and vm.state != VMState.STOPPED:
-            self.logger.error(f"VM {vm_id} cannot be started from state {vm.state}")
-            return False
+            vm = self.vms[vm_id]
+            if vm.state != VMState.CREATED and vm.state != VMState.STOPPED:
+                self.logger.error(f"VM {vm_id} cannot be started from state {vm.state}")
+                return False
             
-        # Simulate boot sequence
-        self._boot_vm(vm)
-        vm.state = VMState.RUNNING
-        vm.start_time = time.time()
+            # Simulate boot sequence
+            vm.start_time = self.clock.now()
+            self._boot_vm(vm)
+            self.vms.set_state(vm_id, VMState.RUNNING)
+            self.scheduler.add_vm(vm_id, vm.resources.priority)
         
-        self.logger.info(f"Started VM {vm_id}")
-        return True
+            self.logger.info(f"Started VM {vm_id}")
+            return True
         
     def pause_vm(self, vm_id: str) -> bool:
         """Pause a running virtual machine"""
-        if vm_id not in self.vms:
-            return False
+        with self._lock:
+            if vm_id not in self.vms:
+                return False
             
-        vm = self.vms[vm_id]
-        if vm.state != VMState.RUNNING:
-            return False
+            vm = self.vms[vm_id]
+            if vm.state != VMState.RUNNING:
+                return False
             
-        vm.state = VMState.PAUSED
-        self.logger.info(f"Paused VM {vm_id}")
-        return True
+            self.vms.set_state(vm_id, VMState.PAUSED)
+            self.scheduler.remove_vm(vm_id)
+            self.logger.info(f"Paused VM {vm_id}")
+            return True
         
     def resume_vm(self, vm_id: str) -> bool:
         """Resume a paused virtual machine"""
-        if vm_id not in self.vms:
-            return False
+        with self._lock:
+            if vm_id not in self.vms:
+                return False
             
-        vm = self.vms[vm_id]
-        if vm.state != VMState.PAUSED:
-            return False
+            vm = self.vms[vm_id]
+            if vm.state != VMState.PAUSED:
+                return False
             
-        vm.state = VMState.RUNNING
-        self.logger.info(f"Resumed VM {vm_id}")
-        return True
+            self.vms.set_state(vm_id, VMState.RUNNING)
+            self._return_balloon(vm_id)
+            self.scheduler.add_vm(vm_id, vm.resources.priority)
+            self.logger.info(f"Resumed VM {vm_id}")
+            return True
         
     def destroy_vm(self, vm_id: str) -> bool:
         """Destroy a virtual machine and free its resources"""
-        if vm_id not in self.vms:
-            return False
+        with self._lock:
+            if vm_id not in self.vms:
+                return False
             
-        vm = self.vms[vm_id]
+            vm = self.vms[vm_id]
+        
+            # Cleanup chassis resources
+            if not self.chassis.deallocate_resources(vm_id):
+                self.logger.warning(f"Failed to deallocate chassis resources for VM {vm_id}")
+        
+            # Cleanup chassis environment
+            if not self.chassis.cleanup_vm_environment(vm_id):
+                self.logger.warning(f"Failed to cleanup chassis environment for VM {vm_id}")
+        
+            # Cleanup VM-specific resources
+            self._cleanup_vm(vm)
+        
+            # Remove from scheduler if active
+            self.scheduler.remove_vm(vm_id)
+            if self.active_vm == vm_id:
+                self.active_vm = None
+            self.events.remove_vm_events(vm_id)
+            
+            del self.vms[vm_id]
+            pool = self.chassis.get_resource_status()
+            if pool.reclaimed_ribosomes or pool.reclaimed_atp:
+                # Freed resources go back to ballooned VMs first
+                self.return_reclaimed()
+            self.logger.info(f"Destroyed VM {vm_id} and cleaned up "
+                             f"{self.chassis_type.value} chassis resources")
+            return True
         
-        # Cleanup chassis resources
-        if not self.chassis.deallocate_resources(vm_id):
-            self.logger.warning(f"Failed to deallocate chassis resources for VM {vm_id}")
+    def admit_vms(self, requests, start: bool = False):
+        """
+        Plan and create a batch of VMs with the admission controller.
         
-        # Cleanup chassis environment
-        if not self.chassis.cleanup_vm_environment(vm_id):
-            self.logger.warning(f"Failed to cleanup chassis environment for VM {vm_id}")
+        Requests are packed into the chassis' free resources with
+        first-fit decreasing plus local search (see ``admission.py``) instead
+        of being allocated one by one in arrival order.
         
-        # Cleanup VM-specific resources
-        self._cleanup_vm(vm)
+        Args:
+            requests: ``AdmissionRequest`` objects
+            start: Also start every admitted VM
+        
+        Returns:
+            AdmissionPlan with the admitted VMs and a reason per rejection
+        """
+        from .admission import AdmissionController
         
-        # Remove from scheduler if active
-        if self.active_vm == vm_id:
-            self.active_vm = None
+        requests = list(requests)
+        with self._lock:
+            existing = [request for request in requests if request.vm_id in self.vms]
+            controller = AdmissionController.from_hypervisor(self)
+            plan = controller.plan(request for request in requests if request.vm_id not in self.vms)
+            for request in existing:
+                plan.rejections[request.vm_id] = "VM already exists"
             
-        del self.vms[vm_id]
-        self.logger.info(f"Destroyed VM {vm_id} and cleaned up {self.chassis_type.value} chassis resources")
-        return True
+            for request in requests:
+                if request.vm_id not in plan.placements:
+                    continue
+                if not self.create_vm(request.vm_id, request.genome_template, request.resources):
+                    del plan.placements[request.vm_id]
+                    plan.rejections[request.vm_id] = "chassis allocation failed"
+                elif start:
+                    self.start_vm(request.vm_id)
+        
+        self.logger.info(f"Admitted {len(plan.placements)} of {len(requests)} VMs "
+                         f"in {plan.planning_time_ms:.1f} ms")
+        return plan
+        
+    def fork_vm(self, vm_id: str, n: int = 1, child_ids: Optional[List[str]] = None,
+                variants: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+        """
+        Fork a VM into ``n`` children for what-if experiments.
+        
+        Children share the parent's genome template and ResourceAllocation
+        copy-on-write: a child only gets its own allocation once one of its
+        fields changes (``variants`` or a later ``allocate_vm_resources``).
+        Each child inherits the parent's state, CPU time and health and gets
+        its own chassis allocation.
         
+        Args:
+            vm_id: VM to fork
+            n: Number of children
+            child_ids: IDs for the children (defaults to ``{vm_id}.fork{i}``)
+            variants: Per-child ResourceAllocation field overrides, e.g.
+                      ``[{"atp_percentage": 10.0}, {"atp_percentage": 20.0}]``
+        
+        Returns:
+            IDs of the children created (fewer than ``n`` if resources run out)
+        """
+        if child_ids is None:
+            child_ids = [f"{vm_id}.fork{i}" for i in range(n)]
+        if len(child_ids) != n or (variants is not None and len(variants) != n):
+            raise ValueError(f"Expected {n} child IDs and variants for fork of VM {vm_id}")
+        
+        with self._lock:
+            parent = self.vms.get(vm_id)
+            if parent is None:
+                self.logger.error(f"VM {vm_id} does not exist")
+                return []
+            boot_complete = None
+            if parent.health_status == "booting":
+                boot_complete = next((event.time for event in self.events.pending()
+                                      if event.vm_id == vm_id
+                                      and event.event_type == EventType.VM_BOOT_COMPLETE), None)
+            
+            created = []
+            for index, child_id in enumerate(child_ids):
+                if len(self.vms) >= self.max_vms or child_id in self.vms:
+                    self.logger.error(f"Cannot fork VM {vm_id} as {child_id}")
+                    break
+                resources = parent.resources
+                if variants is not None and variants[index]:
+                    resources = copy.copy(resources)
+                    for name, value in variants[index].items():
+                        setattr(resources, name, value)
+                resource_request = {
+                    "ribosomes": resources.ribosomes,
+                    "atp_percentage": resources.atp_percentage,
+                    "memory_kb": resources.memory_kb,
+                    "rna_polymerase": resources.rna_polymerase
+                }
+                if not self._allocate_chassis(child_id, resource_request):
+                    self.logger.error(f"Failed to allocate chassis resources for fork {child_id}")
+                    break
+                self.chassis.create_isolation_environment(child_id)
+                
+                self.vms[child_id] = VirtualMachine(
+                    vm_id=child_id,
+                    state=parent.state,
+                    genome_template=parent.genome_template,
+                    resources=resources,
+                    start_time=parent.start_time,
+                    cpu_time_used=parent.cpu_time_used,
+                    health_status=parent.health_status
+                )
+                if parent.state == VMState.RUNNING:
+                    self.scheduler.add_vm(child_id, resources.priority)
+                if boot_complete is not None:
+                    self.events.schedule(boot_complete, EventType.VM_BOOT_COMPLETE, vm_id=child_id)
+                created.append(child_id)
+            
+            self.logger.info(f"Forked VM {vm_id} into {len(created)} children")
+            return created
+        
+    @traced("allocate_resources", arg="vm_id")
+    def _allocate_chassis(self, vm_id: str, resource_request: Dict[str, Any]) -> bool:
+        """Allocate chassis resources, ballooning other VMs if overcommitted"""
+        start = time.perf_counter()
+        moves: List[Tuple[str, int, float]] = []
+        if self.chassis.overcommit_ratio > 1.0:
+            available = self.chassis.get_resource_status()
+            shortfall_ribosomes = (resource_request.get("ribosomes", 0)
+                                   - available.available_ribosomes)
+            shortfall_atp = resource_request.get("atp_percentage", 0.0) - available.available_atp
+            fits_memory = resource_request.get("memory_kb", 0) <= available.available_memory_kb
+            spare_ribosomes, spare_atp = self._reclaimable()
+            # Only balloon when that makes the allocation fit (memory cannot be ballooned)
+            if (fits_memory and (shortfall_ribosomes > 0 or shortfall_atp > 0) and
+                    shortfall_ribosomes <= spare_ribosomes and shortfall_atp <= spare_atp):
+                moves = self._reclaim(max(0, shortfall_ribosomes), max(0.0, shortfall_atp))
+        allocated = self.chassis.allocate_resources(vm_id, resource_request)
+        if not allocated and moves:
+            # The chassis refused anyway: give back what was just reclaimed
+            for balloon_vm_id, ribosomes, atp_percentage in moves:
+                self._deflate(balloon_vm_id, ribosomes, atp_percentage)
+        self.metrics.record_allocation(time.perf_counter() - start, allocated)
+        return allocated
+    
+    def _balloon_candidates(self, exclude: Optional[str] = None) -> List[VirtualMachine]:
+        """VMs whose allocation may be reclaimed: PAUSED first, then low priority"""
+        paused = [self.vms[vm_id] for vm_id in self.vms.ids_in_state(VMState.PAUSED)]
+        low_priority = [vm for vm in self.vms.values()
+                        if vm.state != VMState.PAUSED
+                        and vm.resources.priority <= self.balloon_max_priority]
+        candidates = (sorted(paused, key=lambda vm: vm.resources.priority) +
+                      sorted(low_priority, key=lambda vm: vm.resources.priority))
+        return [vm for vm in candidates if vm.vm_id != exclude]
+    
+    def _spare(self, vm: VirtualMachine) -> Tuple[int, float]:
+        """(ribosomes, ATP) that could still be reclaimed from a VM"""
+        held_ribosomes, held_atp = self.chassis.get_balloon(vm.vm_id)
+        return (int(vm.resources.ribosomes * (1 - self.balloon_floor)) - held_ribosomes,
+                vm.resources.atp_percentage * (1 - self.balloon_floor) - held_atp)
+    
+    def _reclaimable(self, exclude: Optional[str] = None) -> Tuple[int, float]:
+        """Total (ribosomes, ATP) that ballooning could free"""
+        spare = [self._spare(vm) for vm in self._balloon_candidates(exclude)]
+        return (sum(max(0, ribosomes) for ribosomes, _ in spare),
+                sum(max(0.0, atp) for _, atp in spare))
+    
+    def reclaim_resources(self, ribosomes: int = 0, atp_percentage: float = 0.0,
+                          exclude: Optional[str] = None) -> Tuple[int, float]:
+        """
+        Balloon PAUSED and low-priority VMs until the requested amounts are free.
+        
+        Each VM keeps at least ``balloon_floor`` of its nominal allocation.
+        
+        Returns:
+            (ribosomes, ATP) actually reclaimed
+        """
+        moves = self._reclaim(ribosomes, atp_percentage, exclude)
+        return (sum(ribosomes for _, ribosomes, _ in moves),
+                sum(atp for _, _, atp in moves))
+    
+    def _reclaim(self, ribosomes: int, atp_percentage: float,
+                 exclude: Optional[str] = None) -> List[Tuple[str, int, float]]:
+        """reclaim_resources, returning the (VM, ribosomes, ATP) taken from each VM"""
+        with self._lock:
+            moves = []
+            reclaimed_ribosomes, reclaimed_atp = 0, 0.0
+            for vm in self._balloon_candidates(exclude):
+                if reclaimed_ribosomes >= ribosomes and reclaimed_atp >= atp_percentage:
+                    break
+                spare_ribosomes, spare_atp = self._spare(vm)
+                got_ribosomes, got_atp = self.chassis.inflate_balloon(
+                    vm.vm_id,
+                    min(spare_ribosomes, ribosomes - reclaimed_ribosomes),
+                    min(spare_atp, atp_percentage - reclaimed_atp)
+                )
+                if got_ribosomes or got_atp:
+                    moves.append((vm.vm_id, got_ribosomes, got_atp))
+                    reclaimed_ribosomes += got_ribosomes
+                    reclaimed_atp += got_atp
+                    self.balloon_stats["inflations"] += 1
+                    self.logger.info(f"Reclaimed {got_ribosomes} ribosomes and {got_atp:.1f}% ATP "
+                                     f"from VM {vm.vm_id}")
+            self.balloon_stats["ribosomes_reclaimed"] += reclaimed_ribosomes
+            self.balloon_stats["atp_reclaimed"] += reclaimed_atp
+            return moves
+    
+    def return_reclaimed(self) -> None:
+        """Give ballooned resources back from the free pool, highest priority VMs first"""
+        with self._lock:
+            ballooned = [vm for vm in self.vms.values()
+                         if vm.state != VMState.PAUSED and any(self.chassis.get_balloon(vm.vm_id))]
+            for vm in sorted(ballooned, key=lambda vm: -vm.resources.priority):
+                self._deflate(vm.vm_id)
+    
+    def _deflate(self, vm_id: str, ribosomes: Optional[int] = None,
+                 atp_percentage: Optional[float] = None) -> None:
+        returned_ribosomes, returned_atp = self.chassis.deflate_balloon(vm_id, ribosomes,
+                                                                        atp_percentage)
+        if returned_ribosomes or returned_atp:
+            self.balloon_stats["deflations"] += 1
+            self.balloon_stats["ribosomes_returned"] += returned_ribosomes
+            self.balloon_stats["atp_returned"] += returned_atp
+            self.logger.info(f"Returned {returned_ribosomes} ribosomes and {returned_atp:.1f}% ATP "
+                             f"to VM {vm_id}")
+    
+    def _return_balloon(self, vm_id: str) -> None:
+        """Give a VM back what was reclaimed from it, ballooning others if needed"""
+        held_ribosomes, held_atp = self.chassis.get_balloon(vm_id)
+        if not held_ribosomes and not held_atp:
+            return
+        available = self.chassis.get_resource_status()
+        vm = self.vms[vm_id]
+        if vm.resources.priority > self.balloon_max_priority:
+            # Only VMs that are not themselves balloon candidates may take it back
+            self.reclaim_resources(max(0, held_ribosomes - available.available_ribosomes),
+                                   max(0.0, held_atp - available.available_atp), exclude=vm_id)
+        self._deflate(vm_id)
+    
     def get_vm_status(self, vm_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed status of a virtual machine"""
-        if vm_id not in self.vms:
+        vm = self.vms.get(vm_id)
+        if vm is None:
             return None
             
-        vm = self.vms[vm_id]
-        uptime = time.time() - vm.start_time if vm.start_time else 0
+        return self._vm_status(vm, self.clock.now())
+    
+    @staticmethod
+    def _vm_status(vm: VirtualMachine, now: float) -> Dict[str, Any]:
+        """Status dictionary of a VM at time ``now``"""
+        uptime = now - vm.start_time if vm.start_time is not None else 0
         
         return {
             "vm_id": vm.vm_id,
@@ -295,29 +778,96 @@ class BioXenHypervisor:
             "priority": vm.resources.priority
         }
         
-    def list_vms(self) -> List[Dict[str, Any]]:
-        """List all virtual machines"""
-        return [self.get_vm_status(vm_id) for vm_id in self.vms.keys()]
+    def list_vms(self, state: Optional[VMState] = None) -> List[Dict[str, Any]]:
+        """List all virtual machines, or only those in ``state``"""
+        now = self.clock.now()
+        snapshot = self.vms.snapshot()
+        if state is None:
+            return [self._vm_status(vm, now) for vm in snapshot.vms.values()]
+        vms = snapshot.vms
+        return [self._vm_status(vms[vm_id], now) for vm_id in snapshot.by_state[state]]
         
     def run_scheduler(self) -> None:
         """Run one iteration of the VM scheduler"""
-        running_vms = [vm_id for vm_id, vm in self.vms.items() 
-                      if vm.state == VMState.RUNNING]
+        with self._lock:
+            self._dispatch_due_events()
+            self._schedule_tick()
+        
+    def run_for(self, seconds: float) -> int:
+        """Fast-forward a simulated clock, dispatching events in time order
+        
+        Jumps directly from one scheduled event (quantum expiry, boot
+        completion) to the next instead of sleeping, so hours of scheduling
+        are simulated in milliseconds. Returns the number of events dispatched.
+        """
+        with self._lock:
+            if not getattr(self.clock, "simulated", False):
+                raise RuntimeError("run_for() requires the hypervisor to use a SimulatedClock")
+        
+            target = self.clock.now() + seconds
+            self._schedule_tick()
+        
+            dispatched = 0
+            while self.events and self.events.peek_time() <= target:
+                event = self.events.pop()
+                self.clock.set_time(max(event.time, self.clock.now()))
+                self._dispatch_event(event)
+                dispatched += 1
+        
+            self.clock.set_time(target)
+            return dispatched
         
-        if not running_vms:
+    def _schedule_tick(self) -> None:
+        """Make one scheduling decision and arm the next quantum timer"""
+        next_vm = self.scheduler.schedule(self.active_vm)
+        if next_vm is None:
             return
             
         # Context switch if needed
-        next_vm = self.scheduler.select_next_vm(running_vms, self.active_vm)
-        
         if next_vm != self.active_vm:
             self._context_switch(self.active_vm, next_vm)
             self.active_vm = next_vm
+        
+        self._arm_quantum_timer()
+        
+    def _arm_quantum_timer(self) -> None:
+        """Schedule the next quantum expiry event if none is pending"""
+        if self._quantum_event is not None:
+            return
+        last_switch = getattr(self.scheduler, "last_switch_time", None)
+        quantum = getattr(self.scheduler, "time_quantum", None)
+        if last_switch is None or quantum is None:
+            return
+        expiry = max(last_switch + quantum, self.clock.now())
+        self._quantum_event = self.events.schedule(expiry, EventType.QUANTUM_EXPIRY)
+        
+    def _dispatch_due_events(self) -> None:
+        """Dispatch all events whose time has been reached on the clock"""
+        for event in self.events.pop_due(self.clock.now()):
+            self._dispatch_event(event)
+            
+    def _dispatch_event(self, event: SimulationEvent) -> None:
+        """Handle a single discrete event"""
+        if event.event_type == EventType.QUANTUM_EXPIRY:
+            self._quantum_event = None
+            self._schedule_tick()
+        elif event.event_type == EventType.VM_BOOT_COMPLETE:
+            vm = self.vms.get(event.vm_id)
+            if vm and vm.health_status == "booting":
+                vm.health_status = "healthy"
+                self._record_trace(EventType.VM_BOOT_COMPLETE, vm.vm_id)
+                
+    def _record_trace(self, event_type: EventType, vm_id: Optional[str]) -> None:
+        """Append an entry to the scheduling trace"""
+        self.scheduling_trace.append((self.clock.now(), event_type.value, vm_id))
             
     def get_system_resources(self) -> Dict[str, Any]:
         """Get current system resource usage"""
-        allocated_ribosomes = sum(vm.resources.ribosomes for vm in self.vms.values())
-        allocated_atp = sum(vm.resources.atp_percentage for vm in self.vms.values())
+        allocated_ribosomes, allocated_atp, _, running = self.vms.totals()
+        chassis = self.chassis.get_resource_status()
+        # Ballooned resources are back in the pool, so they do not count as allocated
+        allocated_ribosomes -= chassis.reclaimed_ribosomes
+        allocated_atp -= chassis.reclaimed_atp
         
         return {
             "total_ribosomes": self.total_ribosomes,
@@ -326,9 +876,16 @@ class BioXenHypervisor:
             "free_ribosomes": self.available_ribosomes - allocated_ribosomes,
             "total_atp_allocated": allocated_atp,
             "hypervisor_overhead": self.hypervisor_overhead,
-            "active_vms": len([vm for vm in self.vms.values() if vm.state == VMState.RUNNING])
+            "active_vms": running,
+            "overcommit_ratio": self.chassis.overcommit_ratio,
+            "reclaimed_ribosomes": chassis.reclaimed_ribosomes,
+            "reclaimed_atp": chassis.reclaimed_atp
         }
         
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """Get the scheduling policy and its decision latency statistics"""
+        return self.scheduler.get_decision_stats()
+        
     def get_environmental_state(self) -> TemporalState:
         """Get current environmental state for circadian rhythm modeling
         
@@ -337,6 +894,7 @@ class BioXenHypervisor:
         """
         return self.time_simulator.get_current_state()
         
+    @traced("boot_vm", arg="vm")
     def _boot_vm(self, vm: VirtualMachine) -> None:
         """Simulate the VM boot sequence"""
         self.logger.info(f"Booting VM {vm.vm_id}...")
@@ -344,7 +902,14 @@ class BioXenHypervisor:
         # 2. Initialize core genes  
         # 3. Allocate resources
         # 4. Start transcription/translation
-        vm.health_status = "healthy"
+        if vm.resources.boot_time:
+            # Boot completes asynchronously on the hypervisor clock
+            vm.health_status = "booting"
+            self.events.schedule(self.clock.now() + vm.resources.boot_time,
+                                 EventType.VM_BOOT_COMPLETE, vm_id=vm.vm_id)
+        else:
+            vm.health_status = "healthy"
+            self._record_trace(EventType.VM_BOOT_COMPLETE, vm.vm_id)
         
     def _cleanup_vm(self, vm: VirtualMachine) -> None:
         """Clean up VM resources"""
@@ -354,42 +919,53 @@ class BioXenHypervisor:
         # 3. Free allocated memory
         # 4. Release resources
         
+    @traced("context_switch", arg="next_vm")
     def _context_switch(self, current_vm: Optional[str], next_vm: str) -> None:
         """Perform context switch between VMs"""
         context_switch_time = 30.0  # 30 seconds as specified in readme
+        now = self.clock.now()
         
         if current_vm:
             # Save current VM state
             current = self.vms[current_vm]
-            current.last_context_switch = time.time()
+            current.last_context_switch = now
             current.cpu_time_used += context_switch_time
             self.logger.info(f"Context switch: {current_vm} -> {next_vm}")
         
         # Load next VM state  
+        self.metrics.context_switches += 1
         next_vm_obj = self.vms[next_vm]
-        next_vm_obj.last_context_switch = time.time()
+        next_vm_obj.last_context_switch = now
+        self._record_trace(EventType.CONTEXT_SWITCH, next_vm)
     
     def allocate_vm_resources(self, vm_id: str, resources: Dict[str, Any]) -> bool:
         """Allocate resources to a specific VM."""
-        if vm_id not in self.vms:
-            self.logger.error(f"VM {vm_id} not found for resource allocation")
-            return False
+        with self._lock:
+            if vm_id not in self.vms:
+                self.logger.error(f"VM {vm_id} not found for resource allocation")
+                return False
         
-        vm = self.vms[vm_id]
-        try:
-            # Update VM resources
-            if 'atp' in resources:
-                vm.resources.atp_percentage = min(100.0, max(0.0, float(resources['atp'])))
-            if 'ribosomes' in resources:
-                vm.resources.ribosomes = max(0, int(resources['ribosomes']))
-            if 'memory_kb' in resources:
-                vm.resources.memory_kb = max(0, int(resources['memory_kb']))
+            vm = self.vms[vm_id]
+            try:
+                # Update VM resources
+                changes = {}
+                if 'atp' in resources:
+                    changes['atp_percentage'] = min(100.0, max(0.0, float(resources['atp'])))
+                if 'ribosomes' in resources:
+                    changes['ribosomes'] = max(0, int(resources['ribosomes']))
+                if 'memory_kb' in resources:
+                    changes['memory_kb'] = max(0, int(resources['memory_kb']))
+                if 'priority' in resources:
+                    changes['priority'] = max(1, int(resources['priority']))
+                self.vms.update_resources(vm_id, **changes)
+                if 'priority' in changes:
+                    self.scheduler.update_vm(vm_id, vm.resources.priority)
             
-            self.logger.info(f"Resources allocated to VM {vm_id}: {resources}")
-            return True
-        except Exception as e:
-            self.logger.error(f"Failed to allocate resources to VM {vm_id}: {e}")
-            return False
+                self.logger.info(f"Resources allocated to VM {vm_id}: {resources}")
+                return True
+            except Exception as e:
+                self.logger.error(f"Failed to allocate resources to VM {vm_id}: {e}")
+                return False
     
     def get_vm_resource_usage(self, vm_id: str) -> Dict[str, Any]:
         """Get current resource usage for a specific VM."""
@@ -397,11 +973,14 @@ class BioXenHypervisor:
             return {"error": f"VM {vm_id} not found"}
         
         vm = self.vms[vm_id]
+        ballooned_ribosomes, ballooned_atp = self.chassis.get_balloon(vm_id)
         return {
             "vm_id": vm_id,
             "ribosomes": vm.resources.ribosomes,
             "atp_percentage": vm.resources.atp_percentage,
             "memory_kb": vm.resources.memory_kb,
+            "ballooned_ribosomes": ballooned_ribosomes,
+            "ballooned_atp_percentage": ballooned_atp,
             "priority": vm.resources.priority,
             "state": vm.state.value,
             "cpu_time_used": getattr(vm, 'cpu_time_used', 0.0),
@@ -446,31 +1025,3 @@ class ResourceMonitor:
     def get_ribosome_utilization(self) -> float:
         """Get current ribosome utilization (0-100%)"""
         return self.ribosome_utilization
-
-
-class RoundRobinScheduler:
-    """Simple round-robin scheduler for VMs"""
-    
-    def __init__(self, time_quantum: float = 60.0):
-        self.time_quantum = time_quantum  # seconds
-        self.last_switch_time = time.time()
-        
-    def select_next_vm(self, running_vms: List[str], current_vm: Optional[str]) -> str:
-        """Select next VM to run"""
-        if not running_vms:
-            return current_vm
-            
-        if current_vm is None:
-            return running_vms[0]
-            
-        # Check if time quantum expired
-        if time.time() - self.last_switch_time >= self.time_quantum:
-            try:
-                current_index = running_vms.index(current_vm)
-                next_index = (current_index + 1) % len(running_vms)
-                self.last_switch_time = time.time()
-                return running_vms[next_index]
-            except ValueError:
-                return running_vms[0]
-                
-        return current_vm
@@ -0,0 +1,65 @@
+"""
+Pre-aggregated hypervisor metrics
+
+Hot paths (chassis allocation, scheduling decisions, context switches)
+update a few counters and fixed-bucket histograms in O(1) as they run, so an
+exporter can publish them without walking the VM table. See
+``monitoring/exporter.py`` for the Prometheus/OpenMetrics endpoint.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+# Latency buckets (seconds): 1 us .. 1 s
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                   1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram with cumulative counts computed at read time"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Tuple[List[Tuple[float, int]], float, int]:
+        """(cumulative (upper bound, count) pairs ending with +Inf, sum, count)"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative = []
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            cumulative.append((bound, running))
+        return cumulative, total, running
+
+
+class HypervisorMetrics:
+    """Counters and histograms maintained by a BioXenHypervisor"""
+
+    def __init__(self):
+        self.context_switches = 0
+        self.allocations = 0
+        self.allocation_failures = 0
+        self.allocation_latency = Histogram()
+        self.scheduler_decision_latency = Histogram()
+
+    def record_allocation(self, elapsed: float, success: bool) -> None:
+        self.allocations += 1
+        if not success:
+            self.allocation_failures += 1
+        self.allocation_latency.observe(elapsed)
+
+
+# Latest value of every metric reported through ProductionLogger.log_performance_metric
+PERFORMANCE_METRICS: Dict[Tuple[str, str], float] = {}
@@ -0,0 +1,514 @@
+"""
+BioXen Hypervisor Schedulers - Pluggable VM scheduling policies
+
+Every scheduler tracks the set of runnable VMs incrementally (VMs are added
+when they start or resume and removed when they pause or are destroyed), so
+a scheduling decision never scans the whole VM table:
+
+- ``RoundRobinScheduler``: FIFO rotation, O(1) per decision
+- ``PriorityScheduler``: strict priority heap, round-robin within a level
+- ``FairScheduler``: CFS-style weighted fair queuing on virtual runtime
+- ``StrideScheduler``: deterministic proportional share (stride scheduling)
+- ``LotteryScheduler``: randomized proportional share over a Fenwick tree
+
+The heap and tree based policies are O(log n) per decision. Weights come from
+``ResourceAllocation.priority`` (1=low, 5=high), mirroring the priority and
+resource-aware scheduler circuits in the genetic circuit library.
+"""
+
+import heapq
+import itertools
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional
+
+from .clock import WallClock
+
+# Tolerance for float round-off when comparing simulated event times
+_TIME_EPSILON = 1e-9
+
+
+class VMScheduler(ABC):
+    """Base class for VM scheduling policies"""
+
+    policy = "base"
+
+    def __init__(self, time_quantum: float = 60.0, clock=None):
+        self.time_quantum = time_quantum  # seconds
+        self.clock = clock or WallClock()
+        self.last_switch_time = self.clock.now()
+
+        # Decision latency statistics (wall-clock cost of pick_next)
+        self.decisions = 0
+        self.total_decision_time = 0.0
+        self.max_decision_time = 0.0
+        self.recent_decision_times: deque = deque(maxlen=1024)
+        self.decision_histogram = None  # Optional metrics Histogram (seconds)
+
+    @abstractmethod
+    def add_vm(self, vm_id: str, priority: int = 1) -> None:
+        """Mark a VM as runnable"""
+
+    @abstractmethod
+    def remove_vm(self, vm_id: str) -> None:
+        """Mark a VM as no longer runnable (no-op if unknown)"""
+
+    @abstractmethod
+    def pick_next(self, current_vm: Optional[str]) -> Optional[str]:
+        """Choose the next VM among runnable VMs (None if there are none)"""
+
+    @abstractmethod
+    def __contains__(self, vm_id: str) -> bool:
+        """Whether a VM is runnable"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of runnable VMs"""
+
+    def charge(self, vm_id: str, runtime: float) -> None:
+        """Account ``runtime`` seconds of execution to a VM"""
+
+    def update_vm(self, vm_id: str, priority: int) -> None:
+        """Change the priority of a runnable VM"""
+        if vm_id in self:
+            self.remove_vm(vm_id)
+            self.add_vm(vm_id, priority)
+
+    def schedule(self, current_vm: Optional[str]) -> Optional[str]:
+        """
+        Decide which VM runs next.
+
+        The current VM keeps running until its time quantum expires; then (or
+        when it is no longer runnable) it is charged for the time it ran and
+        the policy picks the next VM.
+        """
+        if not len(self):
+            return None
+
+        now = self.clock.now()
+        if current_vm is not None and current_vm not in self:
+            current_vm = None
+        if current_vm is not None and now - self.last_switch_time < self.time_quantum - _TIME_EPSILON:
+            return current_vm
+
+        start = time.perf_counter()
+        if current_vm is not None:
+            self.charge(current_vm, now - self.last_switch_time)
+        next_vm = self.pick_next(current_vm)
+        self._record_decision(time.perf_counter() - start)
+
+        self.last_switch_time = now
+        return next_vm
+
+    def select_next_vm(self, running_vms: List[str], current_vm: Optional[str]) -> Optional[str]:
+        """Select next VM from an explicit list of running VMs
+
+        Compatibility entry point: synchronizes the runnable set with
+        ``running_vms`` (O(n)) and then makes a normal decision.
+        """
+        running = set(running_vms)
+        for vm_id in [vm_id for vm_id in self.runnable_vms() if vm_id not in running]:
+            self.remove_vm(vm_id)
+        for vm_id in running_vms:
+            if vm_id not in self:
+                self.add_vm(vm_id)
+        return self.schedule(current_vm) or current_vm
+
+    @abstractmethod
+    def runnable_vms(self) -> List[str]:
+        """Runnable VM IDs (order is policy specific)"""
+
+    def export_state(self) -> Dict[str, Any]:
+        """JSON-serializable scheduling position (runnable set and ordering)"""
+        return {
+            "policy": self.policy,
+            "time_quantum": self.time_quantum,
+            "last_switch_time": self.last_switch_time,
+        }
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        """Restore a position captured by ``export_state``"""
+        self.time_quantum = state["time_quantum"]
+        self.last_switch_time = state["last_switch_time"]
+
+    def _record_decision(self, elapsed: float) -> None:
+        if self.decision_histogram is not None:
+            self.decision_histogram.observe(elapsed)
+        self.decisions += 1
+        self.total_decision_time += elapsed
+        self.max_decision_time = max(self.max_decision_time, elapsed)
+        self.recent_decision_times.append(elapsed)
+
+    def get_decision_stats(self) -> Dict[str, float]:
+        """Decision latency statistics in microseconds"""
+        recent = sorted(self.recent_decision_times)
+        p99 = recent[min(len(recent) - 1, int(0.99 * len(recent)))] if recent else 0.0
+        return {
+            "policy": self.policy,
+            "runnable_vms": len(self),
+            "decisions": self.decisions,
+            "mean_latency_us": (self.total_decision_time / self.decisions * 1e6
+                                if self.decisions else 0.0),
+            "p99_latency_us": p99 * 1e6,
+            "max_latency_us": self.max_decision_time * 1e6,
+        }
+
+
+class RoundRobinScheduler(VMScheduler):
+    """Simple round-robin scheduler for VMs"""
+
+    policy = "round_robin"
+
+    def __init__(self, time_quantum: float = 60.0, clock=None):
+        super().__init__(time_quantum, clock)
+        self._queue: "OrderedDict[str, None]" = OrderedDict()
+
+    def add_vm(self, vm_id: str, priority: int = 1) -> None:
+        if vm_id not in self._queue:
+            self._queue[vm_id] = None
+
+    def remove_vm(self, vm_id: str) -> None:
+        self._queue.pop(vm_id, None)
+
+    def pick_next(self, current_vm: Optional[str]) -> Optional[str]:
+        if not self._queue:
+            return None
+        # Head of the queue runs next and rotates to the back
+        vm_id = next(iter(self._queue))
+        self._queue.move_to_end(vm_id)
+        return vm_id
+
+    def runnable_vms(self) -> List[str]:
+        return list(self._queue)
+
+    def export_state(self) -> Dict[str, Any]:
+        state = super().export_state()
+        state["queue"] = list(self._queue)
+        return state
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        super().import_state(state)
+        self._queue = OrderedDict.fromkeys(state["queue"])
+
+    def __contains__(self, vm_id: str) -> bool:
+        return vm_id in self._queue
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+class _HeapScheduler(VMScheduler):
+    """Min-heap of runnable VMs keyed by a policy-specific sort key
+
+    Updates use lazy deletion: each VM has one live (key, sequence) entry and
+    stale heap items are skipped when popped. The VM that is currently
+    running is kept out of the heap and re-inserted when it is preempted.
+    """
+
+    def __init__(self, time_quantum: float = 60.0, clock=None):
+        super().__init__(time_quantum, clock)
+        self._heap: List[tuple] = []
+        self._entries: Dict[str, tuple] = {}   # vm_id -> live (key, sequence)
+        self._priorities: Dict[str, int] = {}
+        self._running: Optional[str] = None
+        self._sequence = itertools.count()
+
+    @abstractmethod
+    def _key(self, vm_id: str) -> float:
+        """Sort key of a VM; the smallest key runs next"""
+
+    def _push(self, vm_id: str) -> None:
+        entry = (self._key(vm_id), next(self._sequence))
+        self._entries[vm_id] = entry
+        heapq.heappush(self._heap, (*entry, vm_id))
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop stale heap items"""
+        self._heap = [item for item in self._heap
+                      if self._entries.get(item[2]) == item[:2]]
+        heapq.heapify(self._heap)
+
+    def add_vm(self, vm_id: str, priority: int = 1) -> None:
+        if vm_id in self._priorities:
+            return
+        self._priorities[vm_id] = max(1, int(priority))
+        self._push(vm_id)
+
+    def remove_vm(self, vm_id: str) -> None:
+        if self._priorities.pop(vm_id, None) is None:
+            return
+        self._entries.pop(vm_id, None)
+        if self._running == vm_id:
+            self._running = None
+
+    def pick_next(self, current_vm: Optional[str]) -> Optional[str]:
+        # Preempted VM goes back into the heap with its updated key
+        if self._running is not None and self._running in self._priorities:
+            self._push(self._running)
+        self._running = None
+
+        heap = self._heap
+        while heap:
+            key, sequence, vm_id = heapq.heappop(heap)
+            if self._entries.get(vm_id) == (key, sequence):
+                del self._entries[vm_id]
+                self._running = vm_id
+                return vm_id
+        return None
+
+    def runnable_vms(self) -> List[str]:
+        return list(self._priorities)
+
+    def export_state(self) -> Dict[str, Any]:
+        state = super().export_state()
+        state["priorities"] = self._priorities.copy()
+        # Queued VMs in pop order; ties keep their relative order on restore
+        state["queue"] = [vm_id for _, vm_id in
+                          sorted((entry, vm_id) for vm_id, entry in self._entries.items())]
+        state["running"] = self._running
+        return state
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        super().import_state(state)
+        self._priorities = dict(state["priorities"])
+        self._running = state["running"]
+        self._heap = []
+        self._entries = {}
+        self._sequence = itertools.count()
+        for vm_id in state["queue"]:
+            self._push(vm_id)
+
+    def __contains__(self, vm_id: str) -> bool:
+        return vm_id in self._priorities
+
+    def __len__(self) -> int:
+        return len(self._priorities)
+
+
+class PriorityScheduler(_HeapScheduler):
+    """Strict priority scheduling: the highest priority runnable VM runs
+
+    VMs with equal priority share the CPU round-robin (FIFO by insertion).
+    Lower priorities only run when no higher priority VM is runnable.
+    """
+
+    policy = "priority"
+
+    def _key(self, vm_id: str) -> float:
+        return -self._priorities[vm_id]
+
+
+class FairScheduler(_HeapScheduler):
+    """Weighted fair queuing on virtual runtime (CFS-style)
+
+    Each VM accumulates virtual runtime at ``runtime / weight`` and the VM
+    with the smallest virtual runtime runs next, so CPU time converges to
+    shares proportional to priority. Newly runnable VMs start at the minimum
+    virtual runtime so they neither starve others nor are starved.
+    """
+
+    policy = "fair"
+
+    def __init__(self, time_quantum: float = 60.0, clock=None):
+        super().__init__(time_quantum, clock)
+        self._vruntime: Dict[str, float] = {}
+        self._min_vruntime = 0.0
+
+    def _key(self, vm_id: str) -> float:
+        return self._vruntime[vm_id]
+
+    def _increment(self, vm_id: str, runtime: float) -> float:
+        """Virtual runtime added for ``runtime`` seconds of execution"""
+        return runtime / self._priorities[vm_id]
+
+    def add_vm(self, vm_id: str, priority: int = 1) -> None:
+        if vm_id in self._priorities:
+            return
+        self._vruntime[vm_id] = max(self._vruntime.get(vm_id, 0.0), self._min_vruntime)
+        super().add_vm(vm_id, priority)
+
+    def remove_vm(self, vm_id: str) -> None:
+        super().remove_vm(vm_id)
+        self._vruntime.pop(vm_id, None)
+
+    def update_vm(self, vm_id: str, priority: int) -> None:
+        # Keep the accumulated virtual runtime; only the weight changes
+        if vm_id not in self._priorities:
+            return
+        self._priorities[vm_id] = max(1, int(priority))
+        if vm_id in self._entries:
+            self._push(vm_id)
+
+    def charge(self, vm_id: str, runtime: float) -> None:
+        if vm_id in self._priorities:
+            self._vruntime[vm_id] += self._increment(vm_id, runtime)
+
+    def pick_next(self, current_vm: Optional[str]) -> Optional[str]:
+        vm_id = super().pick_next(current_vm)
+        if vm_id is not None:
+            self._min_vruntime = max(self._min_vruntime, self._vruntime[vm_id])
+        return vm_id
+
+    def export_state(self) -> Dict[str, Any]:
+        state = super().export_state()
+        state["vruntime"] = self._vruntime.copy()
+        state["min_vruntime"] = self._min_vruntime
+        return state
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        # Virtual runtimes are the heap keys, so restore them first
+        self._vruntime = dict(state["vruntime"])
+        self._min_vruntime = state["min_vruntime"]
+        super().import_state(state)
+
+
+class StrideScheduler(FairScheduler):
+    """Stride scheduling: deterministic proportional share
+
+    Each VM holds ``priority`` tickets and advances its pass value by
+    ``STRIDE1 / tickets`` per time quantum it runs; the lowest pass runs next.
+    """
+
+    policy = "stride"
+    STRIDE1 = 1 << 20
+
+    def _increment(self, vm_id: str, runtime: float) -> float:
+        quanta = runtime / self.time_quantum if self.time_quantum else 1.0
+        return (self.STRIDE1 / self._priorities[vm_id]) * quanta
+
+
+class LotteryScheduler(VMScheduler):
+    """Lottery scheduling: each decision draws a ticket at random
+
+    A VM holds ``priority`` tickets, so its expected CPU share is proportional
+    to priority. Tickets are kept in a Fenwick tree, making both updates and
+    draws O(log n). Pass ``seed`` (or ``rng``) for reproducible runs.
+    """
+
+    policy = "lottery"
+
+    def __init__(self, time_quantum: float = 60.0, clock=None, seed: Optional[int] = None,
+                 rng: Optional[random.Random] = None):
+        super().__init__(time_quantum, clock)
+        self.rng = rng or random.Random(seed)
+        self._capacity = 16
+        self._tree = [0] * (self._capacity + 1)
+        self._tickets = [0] * self._capacity
+        self._slots: Dict[str, int] = {}
+        self._vm_at: List[Optional[str]] = [None] * self._capacity
+        self._free: List[int] = list(range(self._capacity - 1, -1, -1))
+        self._total = 0
+
+    def _tree_add(self, slot: int, delta: int) -> None:
+        i = slot + 1
+        while i <= self._capacity:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _grow(self) -> None:
+        """Double the slot capacity and rebuild the tree in O(n)"""
+        old = self._capacity
+        self._capacity *= 2
+        self._tickets.extend([0] * old)
+        self._vm_at.extend([None] * old)
+        self._free.extend(range(self._capacity - 1, old - 1, -1))
+        self._rebuild_tree()
+
+    def _rebuild_tree(self) -> None:
+        """Rebuild the Fenwick tree from the per-slot tickets in O(n)"""
+        tree = [0] + self._tickets[:]
+        for i in range(1, self._capacity + 1):
+            parent = i + (i & -i)
+            if parent <= self._capacity:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def add_vm(self, vm_id: str, priority: int = 1) -> None:
+        if vm_id in self._slots:
+            return
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        tickets = max(1, int(priority))
+        self._slots[vm_id] = slot
+        self._vm_at[slot] = vm_id
+        self._tickets[slot] = tickets
+        self._tree_add(slot, tickets)
+        self._total += tickets
+
+    def remove_vm(self, vm_id: str) -> None:
+        slot = self._slots.pop(vm_id, None)
+        if slot is None:
+            return
+        tickets = self._tickets[slot]
+        self._tree_add(slot, -tickets)
+        self._total -= tickets
+        self._tickets[slot] = 0
+        self._vm_at[slot] = None
+        self._free.append(slot)
+
+    def pick_next(self, current_vm: Optional[str]) -> Optional[str]:
+        if self._total <= 0:
+            return None
+        # Descend the Fenwick tree to the slot holding the winning ticket
+        winner = self.rng.randrange(self._total)
+        position = 0
+        step = 1 << (self._capacity.bit_length() - 1)
+        while step:
+            candidate = position + step
+            if candidate <= self._capacity and self._tree[candidate] <= winner:
+                position = candidate
+                winner -= self._tree[candidate]
+            step >>= 1
+        return self._vm_at[position]
+
+    def runnable_vms(self) -> List[str]:
+        return list(self._slots)
+
+    def export_state(self) -> Dict[str, Any]:
+        state = super().export_state()
+        # Slot layout decides which VM a ticket maps to, so keep it verbatim
+        state["slots"] = list(self._vm_at)
+        state["tickets"] = list(self._tickets)
+        state["free"] = list(self._free)
+        version, internal, gauss_next = self.rng.getstate()
+        state["rng"] = [version, list(internal), gauss_next]
+        return state
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        super().import_state(state)
+        self._vm_at = list(state["slots"])
+        self._tickets = list(state["tickets"])
+        self._free = list(state["free"])
+        self._capacity = len(self._vm_at)
+        self._slots = {vm_id: slot for slot, vm_id in enumerate(self._vm_at) if vm_id is not None}
+        self._total = sum(self._tickets)
+        self._rebuild_tree()
+        version, internal, gauss_next = state["rng"]
+        self.rng.setstate((version, tuple(internal), gauss_next))
+
+    def __contains__(self, vm_id: str) -> bool:
+        return vm_id in self._slots
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+SCHEDULER_POLICIES = {
+    cls.policy: cls for cls in (RoundRobinScheduler, PriorityScheduler, FairScheduler,
+                                StrideScheduler, LotteryScheduler)
+}
+
+
+def create_scheduler(policy: str = "round_robin", **kwargs) -> VMScheduler:
+    """Create a scheduler by policy name"""
+    try:
+        scheduler_class = SCHEDULER_POLICIES[policy]
+    except KeyError:
+        raise ValueError(f"Unsupported scheduler policy: {policy}. "
+                         f"Supported: {list(SCHEDULER_POLICIES)}")
+    return scheduler_class(**kwargs)
@@ -0,0 +1,239 @@
+"""
+Prometheus/OpenMetrics exporter for BioXen hypervisors
+
+Serves ``/metrics`` in the Prometheus text exposition format from the
+standard library HTTP server, so a local Prometheus (or ``curl``) can scrape
+a running hypervisor without any external service.
+
+Every value is pre-aggregated: VM counts per state come from the VM
+registry's state indexes, allocation totals from its running aggregates,
+free resources from the chassis pool, and the allocation and scheduling
+latency histograms are filled in by the hypervisor as it runs (see
+``hypervisor/metrics.py``). A scrape never walks the VM table.
+
+Usage:
+    exporter = start_metrics_server(hypervisor)   # port from ProductionConfig
+    ...
+    exporter.stop()
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+from ..api.production_config import ProductionConfig, get_config
+from ..genome.cache import GENOME_CACHE
+from ..hypervisor.core import BioXenHypervisor, VMState
+from ..hypervisor.metrics import PERFORMANCE_METRICS, Histogram
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Family:
+    """Samples of one metric family"""
+
+    def __init__(self, name: str, kind: str, help_text: str):
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.samples: List[Tuple[str, Dict[str, str], float]] = []
+
+    def add(self, labels: Dict[str, str], value: float, suffix: str = "") -> None:
+        self.samples.append((suffix, labels, value))
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples:
+            lines.append(f"{self.name}{suffix}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines)
+
+
+class MetricsExporter:
+    """Collects hypervisor metrics and serves them over HTTP"""
+
+    def __init__(self, hypervisors: Union[BioXenHypervisor, Mapping[str, BioXenHypervisor]],
+                 host: str = "127.0.0.1", port: int = 9108):
+        """
+        Initialize the exporter.
+
+        Args:
+            hypervisors: A hypervisor, or a mapping of name -> hypervisor
+                         (each name becomes a ``hypervisor`` label)
+            host: Interface to bind (local only by default)
+            port: TCP port (0 picks a free port)
+        """
+        if isinstance(hypervisors, BioXenHypervisor):
+            hypervisors = {"default": hypervisors}
+        self.hypervisors = dict(hypervisors)
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, hypervisors,
+                    config: Optional[ProductionConfig] = None) -> 'MetricsExporter':
+        """Create an exporter on the configured metrics port"""
+        config = config or get_config()
+        return cls(hypervisors, port=config.metrics_port)
+
+    def collect(self) -> str:
+        """Render every metric in the Prometheus text format"""
+        families: Dict[str, _Family] = {}
+
+        def family(name: str, kind: str, help_text: str) -> _Family:
+            if name not in families:
+                families[name] = _Family(name, kind, help_text)
+            return families[name]
+
+        for name, hypervisor in self.hypervisors.items():
+            self._collect_hypervisor(family, {"hypervisor": name}, hypervisor)
+
+        cache = GENOME_CACHE.stats()
+        lookups = family("bioxen_genome_cache_events_total", "counter",
+                         "Genome/template cache hits, misses and evictions")
+        for event, key in (("hit", "hits"), ("miss", "misses"), ("eviction", "evictions")):
+            lookups.add({"event": event}, cache[key])
+        family("bioxen_genome_cache_entries", "gauge", "Cached genomes, schemas and templates").add(
+            {}, cache["entries"])
+        family("bioxen_genome_cache_bytes", "gauge", "Estimated memory of the genome cache").add(
+            {}, cache["estimated_bytes"])
+
+        performance = family("bioxen_performance_metric", "gauge",
+                             "Last value reported through ProductionLogger.log_performance_metric")
+        for (metric, unit), value in list(PERFORMANCE_METRICS.items()):
+            performance.add({"metric": metric, "unit": unit}, value)
+
+        return "\n".join(f.render() for f in families.values() if f.samples) + "\n"
+
+    def _collect_hypervisor(self, family, base: Dict[str, str],
+                            hypervisor: BioXenHypervisor) -> None:
+        vms = family("bioxen_vms", "gauge", "Number of VMs by state")
+        for state in VMState:
+            vms.add({**base, "state": state.value}, hypervisor.vms.count(state))
+        family("bioxen_vm_limit", "gauge", "Maximum number of VMs").add(base, hypervisor.max_vms)
+
+        resources = hypervisor.get_system_resources()
+        allocated = family("bioxen_allocated_resources", "gauge",
+                           "Resources allocated to VMs (ballooned resources excluded)")
+        allocated.add({**base, "resource": "ribosomes"}, resources["allocated_ribosomes"])
+        allocated.add({**base, "resource": "atp_percentage"}, resources["total_atp_allocated"])
+        reclaimed = family("bioxen_reclaimed_resources", "gauge",
+                           "Resources currently reclaimed from VMs by ballooning")
+        reclaimed.add({**base, "resource": "ribosomes"}, resources["reclaimed_ribosomes"])
+        reclaimed.add({**base, "resource": "atp_percentage"}, resources["reclaimed_atp"])
+        family("bioxen_overcommit_ratio", "gauge", "Chassis overcommit ratio").add(
+            base, resources["overcommit_ratio"])
+
+        pool = hypervisor.chassis.get_resource_status()
+        chassis = {**base, "chassis": hypervisor.chassis.chassis_id}
+        free = family("bioxen_chassis_free_resources", "gauge",
+                      "Free resources in the chassis pool")
+        free.add({**chassis, "resource": "ribosomes"}, pool.available_ribosomes)
+        free.add({**chassis, "resource": "atp_percentage"}, pool.available_atp)
+        free.add({**chassis, "resource": "memory_kb"}, pool.available_memory_kb)
+        for organelle, capacity in pool.organelle_capacity.items():
+            free.add({**chassis, "resource": organelle}, capacity)
+
+        metrics = hypervisor.metrics
+        scheduler = hypervisor.scheduler
+        policy = {**base, "policy": scheduler.policy}
+        family("bioxen_scheduler_runnable_vms", "gauge", "VMs in the scheduler run queue").add(
+            policy, len(scheduler))
+        family("bioxen_scheduler_decisions_total", "counter", "Scheduling decisions made").add(
+            policy, scheduler.decisions)
+        self._histogram(family("bioxen_scheduler_decision_seconds", "histogram",
+                               "Wall-clock cost of scheduling decisions"),
+                        policy, metrics.scheduler_decision_latency)
+        family("bioxen_context_switches_total", "counter", "VM context switches").add(
+            base, metrics.context_switches)
+
+        family("bioxen_allocations_total", "counter", "Chassis allocation attempts").add(
+            base, metrics.allocations)
+        family("bioxen_allocation_failures_total", "counter", "Failed chassis allocations").add(
+            base, metrics.allocation_failures)
+        self._histogram(family("bioxen_allocation_seconds", "histogram",
+                               "Latency of chassis resource allocation"),
+                        base, metrics.allocation_latency)
+
+        balloon = family("bioxen_balloon_events_total", "counter",
+                         "Balloon inflations and deflations")
+        balloon.add({**base, "direction": "inflate"}, hypervisor.balloon_stats["inflations"])
+        balloon.add({**base, "direction": "deflate"}, hypervisor.balloon_stats["deflations"])
+
+    @staticmethod
+    def _histogram(family: _Family, labels: Dict[str, str], histogram: Histogram) -> None:
+        buckets, total, count = histogram.snapshot()
+        for bound, cumulative in buckets:
+            family.add({**labels, "le": _number(bound)}, cumulative, "_bucket")
+        family.add(labels, total, "_sum")
+        family.add(labels, count, "_count")
+
+    def start(self) -> int:
+        """Serve ``/metrics`` on a background thread; returns the bound port"""
+        if self._server is not None:
+            return self.port
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.collect().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes are too frequent for access logs
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self) -> None:
+        """Stop serving"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+
+def start_metrics_server(hypervisors,
+                         config: Optional[ProductionConfig] = None) -> Optional[MetricsExporter]:
+    """
+    Start an exporter if the configuration enables monitoring.
+
+    Returns None when ``enable_monitoring`` or ``metrics_collection`` is off.
+    """
+    config = config or get_config()
+    if not (config.enable_monitoring and config.metrics_collection):
+        return None
+    exporter = MetricsExporter.from_config(hypervisors, config)
+    exporter.start()
+    return exporter
@@ -0,0 +1,105 @@
+"""
+Columnar metric storage for the BioXen performance profiler
+
+Metrics are kept as preallocated NumPy columns in a fixed-capacity ring
+buffer instead of a deque of dataclass instances. Every append is O(1) and
+writes each value twice (at ``i`` and ``i + capacity``), so the most recent
+``n`` samples of any column are always a contiguous zero-copy view.
+"""
+
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import numpy as np
+
+
+class ColumnarRingBuffer:
+    """Fixed-capacity ring buffer of typed NumPy columns"""
+
+    def __init__(self, columns: Dict[str, Any], capacity: int = 1000,
+                 record_type: Optional[Callable[..., Any]] = None,
+                 record_defaults: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the buffer.
+
+        Args:
+            columns: Column name -> NumPy dtype
+            capacity: Number of most recent samples retained
+            record_type: Callable used to rebuild row objects (e.g. a dataclass)
+            record_defaults: Extra constant fields passed to ``record_type``
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.record_type = record_type
+        self.record_defaults = record_defaults or {}
+        # Mirrored storage: each value lives at i and i + capacity
+        self._columns = {name: np.zeros(2 * capacity, dtype=dtype)
+                         for name, dtype in columns.items()}
+        self._next = 0      # Next write position in [0, capacity)
+        self._size = 0
+
+    @property
+    def columns(self):
+        """Names of the stored columns"""
+        return tuple(self._columns)
+
+    def append(self, **values) -> None:
+        """Append one sample in O(1); missing columns are stored as zero"""
+        i = self._next
+        j = i + self.capacity
+        for name, column in self._columns.items():
+            value = values.get(name, 0)
+            column[i] = value
+            column[j] = value
+        self._next = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def window(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """Zero-copy view of the last ``n`` values of a column (oldest first)"""
+        n = self._size if n is None else min(n, self._size)
+        end = self._next + self.capacity
+        view = self._columns[name][end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def latest(self, name: str):
+        """Most recent value of a column"""
+        if not self._size:
+            raise IndexError("buffer is empty")
+        return self._columns[name][self._next + self.capacity - 1].item()
+
+    def clear(self) -> None:
+        """Drop all samples"""
+        self._next = 0
+        self._size = 0
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Get one sample as a dict (negative indices count from the newest)"""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("buffer index out of range")
+        position = self._next + self.capacity - self._size + index
+        return {name: column[position].item() for name, column in self._columns.items()}
+
+    def __getitem__(self, index: int):
+        row = self.row(index)
+        if self.record_type is None:
+            return row
+        return self.record_type(**self.record_defaults, **row)
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(self._size):
+            yield self[index]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the column storage"""
+        return sum(column.nbytes for column in self._columns.values())
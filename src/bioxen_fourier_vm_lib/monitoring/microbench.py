@@ -0,0 +1,360 @@
+"""
+Microbenchmarks for BioXen hypervisor hot paths
+
+Measures the per-operation cost (ops/sec) and memory allocations of the
+hypervisor and chassis operations that run on every VM lifecycle event or
+monitoring pass, at increasing VM populations (4, 64, 1024, 10k by default).
+Results can be stored as a JSON baseline and compared against later runs to
+find regressions and the population at which an operation stops scaling.
+
+Usage:
+    python -m bioxen_fourier_vm_lib.monitoring.microbench --save baseline.json
+    python -m bioxen_fourier_vm_lib.monitoring.microbench --baseline baseline.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..hypervisor.clock import SimulatedClock
+from ..hypervisor.core import BioXenHypervisor, ResourceAllocation
+
+DEFAULT_SIZES = (4, 64, 1024, 10000)
+
+# Zero-footprint allocation so populations are not limited by chassis capacity;
+# the benchmark measures bookkeeping cost, not resource exhaustion.
+_EMPTY_REQUEST = {"ribosomes": 0, "atp_percentage": 0.0, "memory_kb": 0, "rna_polymerase": 0}
+
+
+@dataclass
+class OperationResult:
+    """Timing and allocation figures for one operation at one VM population"""
+    operation: str
+    n_vms: int
+    iterations: int
+    ops_per_sec: float
+    best_us: float
+    mean_us: float
+    peak_bytes: int             # Peak traced memory of a single operation
+    retained_bytes_per_op: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.operation}@{self.n_vms}"
+
+
+def _empty_allocation() -> ResourceAllocation:
+    return ResourceAllocation(ribosomes=0, atp_percentage=0.0, rna_polymerase=0, memory_kb=0)
+
+
+def build_hypervisor(n_vms: int, headroom: int = 0) -> BioXenHypervisor:
+    """Create a simulated-clock hypervisor populated with ``n_vms`` running VMs"""
+    hypervisor = BioXenHypervisor(max_vms=n_vms + headroom, clock=SimulatedClock())
+    for i in range(n_vms):
+        vm_id = f"bench_{i}"
+        hypervisor.create_vm(vm_id, "syn3a_minimal", _empty_allocation())
+        hypervisor.start_vm(vm_id)
+    return hypervisor
+
+
+class _Operation:
+    """One benchmarked operation: prepare arguments, run, clean up"""
+
+    def __init__(self, name: str, run: Callable, prepare: Optional[Callable] = None,
+                 cleanup: Optional[Callable] = None):
+        self.name = name
+        self.run = run
+        self.prepare = prepare or (lambda hv, batch: [None] * len(batch))
+        self.cleanup = cleanup or (lambda hv, args: None)
+
+
+def _fresh_ids(hv, batch):
+    return list(batch)
+
+
+def _create_ids(hv, batch):
+    for vm_id in batch:
+        hv.create_vm(vm_id, "syn3a_minimal", _empty_allocation())
+    return list(batch)
+
+
+def _destroy_ids(hv, args):
+    for vm_id in args:
+        hv.destroy_vm(vm_id)
+
+
+def _deallocate_ids(hv, args):
+    for vm_id in args:
+        hv.chassis.deallocate_resources(vm_id)
+
+
+def _run_scheduler(hv, _):
+    # Expire the quantum first, or every call after the first returns early
+    hv.clock.advance(hv.scheduler.time_quantum)
+    hv.run_scheduler()
+
+
+OPERATIONS: Dict[str, _Operation] = {
+    op.name: op for op in [
+        _Operation("create_vm",
+                   run=lambda hv, vm_id: hv.create_vm(vm_id, "syn3a_minimal", _empty_allocation()),
+                   prepare=_fresh_ids, cleanup=_destroy_ids),
+        _Operation("start_vm",
+                   run=lambda hv, vm_id: hv.start_vm(vm_id),
+                   prepare=_create_ids, cleanup=_destroy_ids),
+        _Operation("destroy_vm",
+                   run=lambda hv, vm_id: hv.destroy_vm(vm_id),
+                   prepare=_create_ids),
+        _Operation("run_scheduler",
+                   run=_run_scheduler),
+        _Operation("get_system_resources",
+                   run=lambda hv, _: hv.get_system_resources()),
+        _Operation("list_vms",
+                   run=lambda hv, _: hv.list_vms()),
+        _Operation("allocate_resources",
+                   run=lambda hv, vm_id: hv.chassis.allocate_resources(vm_id, _EMPTY_REQUEST),
+                   prepare=_fresh_ids, cleanup=_deallocate_ids),
+    ]
+}
+
+
+class MicroBenchmark:
+    """Adaptive timing harness for hypervisor operations"""
+
+    def __init__(self, sizes: Sequence[int] = DEFAULT_SIZES,
+                 operations: Optional[Sequence[str]] = None,
+                 min_time: float = 0.05, repeat: int = 3, max_iterations: int = 4096):
+        """
+        Initialize the harness.
+
+        Args:
+            sizes: VM populations to benchmark
+            operations: Operation names (defaults to all of OPERATIONS)
+            min_time: Minimum seconds per timed batch; batches double until reached
+            repeat: Timed batches per measurement (best is reported)
+            max_iterations: Upper bound on batch size
+        """
+        unknown = set(operations or []) - set(OPERATIONS)
+        if unknown:
+            raise ValueError(f"Unknown operations: {sorted(unknown)}. Available: {list(OPERATIONS)}")
+        self.sizes = list(sizes)
+        self.operations = list(operations or OPERATIONS)
+        self.min_time = min_time
+        self.repeat = repeat
+        self.max_iterations = max_iterations
+        self._batch_counter = 0
+
+    def _next_batch(self, size: int) -> List[str]:
+        start = self._batch_counter
+        self._batch_counter += size
+        return [f"mb_{i}" for i in range(start, start + size)]
+
+    def _time_batch(self, hv, op: _Operation, iterations: int) -> float:
+        """Run one prepared batch and return its elapsed seconds"""
+        args = op.prepare(hv, self._next_batch(iterations))
+        run = op.run
+        start = time.perf_counter()
+        for arg in args:
+            run(hv, arg)
+        elapsed = time.perf_counter() - start
+        op.cleanup(hv, args)
+        return elapsed
+
+    def _measure_allocations(self, hv, op: _Operation, iterations: int) -> Tuple[int, float]:
+        """Traced peak bytes of one operation and bytes retained per operation"""
+        args = op.prepare(hv, self._next_batch(iterations))
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            op.run(hv, args[0])
+            _, peak = tracemalloc.get_traced_memory()
+            for arg in args[1:]:
+                op.run(hv, arg)
+            after, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        op.cleanup(hv, args)
+        return max(0, peak - before), (after - before) / iterations
+
+    def measure(self, hv, name: str) -> OperationResult:
+        """Benchmark one operation against a populated hypervisor"""
+        op = OPERATIONS[name]
+
+        # Grow the batch until it runs long enough to time reliably
+        iterations = 1
+        while True:
+            elapsed = self._time_batch(hv, op, iterations)
+            if elapsed >= self.min_time or iterations >= self.max_iterations:
+                break
+            iterations = min(self.max_iterations, iterations * 2)
+
+        timings = [elapsed] + [self._time_batch(hv, op, iterations) for _ in range(self.repeat - 1)]
+        best = min(timings) / iterations
+        mean = sum(timings) / len(timings) / iterations
+
+        alloc_iterations = min(iterations, 64)
+        peak, retained = self._measure_allocations(hv, op, alloc_iterations)
+
+        return OperationResult(
+            operation=name,
+            n_vms=len(hv.vms),
+            iterations=iterations,
+            ops_per_sec=1.0 / best if best > 0 else float('inf'),
+            best_us=best * 1e6,
+            mean_us=mean * 1e6,
+            peak_bytes=peak,
+            retained_bytes_per_op=retained
+        )
+
+    def run(self) -> List[OperationResult]:
+        """Benchmark every operation at every population size"""
+        results = []
+        # Logging dominates per-operation cost; measure the hypervisor itself
+        logging.disable(logging.INFO)
+        try:
+            for n_vms in self.sizes:
+                hv = build_hypervisor(n_vms, headroom=self.max_iterations)
+                for name in self.operations:
+                    results.append(self.measure(hv, name))
+        finally:
+            logging.disable(logging.NOTSET)
+        return results
+
+
+def results_to_dict(results: Sequence[OperationResult]) -> Dict:
+    """Serialize results (with environment metadata) for storage as a baseline"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {result.key: asdict(result) for result in results}
+    }
+
+
+def save_baseline(results: Sequence[OperationResult], path: str) -> None:
+    """Store results as a JSON baseline"""
+    with open(path, 'w') as f:
+        json.dump(results_to_dict(results), f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, OperationResult]:
+    """Load a JSON baseline keyed by ``operation@n_vms``"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return {key: OperationResult(**value) for key, value in data["results"].items()}
+
+
+def compare(results: Sequence[OperationResult], baseline: Dict[str, OperationResult],
+            tolerance: float = 0.25) -> List[Dict]:
+    """
+    Compare results against a baseline.
+
+    A result is a regression when its best per-operation time is more than
+    ``tolerance`` slower than the baseline, an improvement when it is more than
+    ``tolerance`` faster.
+    """
+    rows = []
+    for result in results:
+        reference = baseline.get(result.key)
+        if reference is None:
+            rows.append({"key": result.key, "ratio": None, "status": "new"})
+            continue
+        ratio = result.best_us / reference.best_us if reference.best_us else float('inf')
+        if ratio > 1 + tolerance:
+            status = "regression"
+        elif ratio < 1 / (1 + tolerance):
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({"key": result.key, "ratio": ratio, "status": status})
+    return rows
+
+
+def scaling_exponents(results: Sequence[OperationResult]) -> Dict[str, List[Tuple[int, float]]]:
+    """
+    Empirical scaling exponent of each operation between consecutive sizes.
+
+    The exponent is log(cost ratio) / log(population ratio): ~0 means O(1) per
+    operation, ~1 means the operation is linear in the number of VMs.
+    """
+    by_operation: Dict[str, List[OperationResult]] = {}
+    for result in results:
+        by_operation.setdefault(result.operation, []).append(result)
+
+    exponents = {}
+    for name, series in by_operation.items():
+        series.sort(key=lambda r: r.n_vms)
+        exponents[name] = [
+            (current.n_vms, math.log(current.best_us / previous.best_us) /
+             math.log(current.n_vms / previous.n_vms))
+            for previous, current in zip(series, series[1:])
+            if previous.n_vms and current.n_vms > previous.n_vms and previous.best_us > 0
+        ]
+    return exponents
+
+
+def format_report(results: Sequence[OperationResult],
+                  comparison: Optional[List[Dict]] = None) -> str:
+    """Render results (and an optional baseline comparison) as a text table"""
+    status = {row["key"]: row for row in comparison or []}
+    exponents = {(name, n): value
+                 for name, series in scaling_exponents(results).items()
+                 for n, value in series}
+
+    lines = ["BioXen Hypervisor Microbenchmarks", "=" * 40, "",
+             f"{'operation':<22}{'VMs':>7}{'ops/sec':>14}{'best us':>11}"
+             f"{'peak B':>9}{'scale':>7}  baseline"]
+    for result in results:
+        exponent = exponents.get((result.operation, result.n_vms))
+        row = status.get(result.key)
+        baseline = ""
+        if row is not None:
+            baseline = row["status"] if row["ratio"] is None else f"{row['status']} ({row['ratio']:.2f}x)"
+        lines.append(
+            f"{result.operation:<22}{result.n_vms:>7}{result.ops_per_sec:>14,.0f}"
+            f"{result.best_us:>11.2f}{result.peak_bytes:>9}"
+            f"{'' if exponent is None else f'{exponent:.2f}':>7}  {baseline}"
+        )
+
+    superlinear = sorted({name for (name, _), value in exponents.items() if value > 0.5})
+    if superlinear:
+        lines += ["", f"Per-op cost grows with VM count: {', '.join(superlinear)}"]
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="BioXen hypervisor microbenchmarks")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='VM populations to benchmark')
+    parser.add_argument('--operations', nargs='+', choices=list(OPERATIONS),
+                        help='Operations to benchmark (default: all)')
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help='Minimum seconds per timed batch')
+    parser.add_argument('--baseline', help='Compare against this JSON baseline')
+    parser.add_argument('--save', help='Write results to this JSON baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Relative slowdown tolerated before flagging a regression')
+    args = parser.parse_args(argv)
+
+    bench = MicroBenchmark(sizes=args.sizes, operations=args.operations, min_time=args.min_time)
+    results = bench.run()
+
+    comparison = None
+    if args.baseline:
+        comparison = compare(results, load_baseline(args.baseline), args.tolerance)
+    print(format_report(results, comparison))
+
+    if args.save:
+        save_baseline(results, args.save)
+    return 1 if comparison and any(row["status"] == "regression" for row in comparison) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,13 +5,22 @@ This module provides tools for monitoring resource usage, scheduling fairness,
 and identifying performance bottlenecks in the biological hypervisor.
 """
 
+import json
+import random
 import time
 import threading
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
-from collections import defaultdict, deque
+from collections import deque
 import statistics
 
+import numpy as np
+
+from .metrics_store import ColumnarRingBuffer
+from ..genome.cache import GENOME_CACHE
+from ..hypervisor.clock import EventType, SimulatedClock, WallClock
+from ..hypervisor.core import VMState
+
 @dataclass
 class ResourceMetrics:
     """Resource usage metrics for a time period"""
@@ -21,6 +30,8 @@ class ResourceMetrics:
     memory_usage: float          # 0-100%
     active_vms: int
     context_switches: int
+    reclaimed_ribosomes: int = 0  # Held back from ballooned VMs
+    reclaimed_atp: float = 0.0
 
 @dataclass
 class VMMetrics:
@@ -31,6 +42,7 @@ class VMMetrics:
     context_switches: int        # Number of context switches
     resource_violations: int     # Times resource limits were exceeded
     health_score: float          # Overall health (0-100)
+    timestamp: Optional[float] = None  # Sample time
 
 @dataclass
 class SchedulingMetrics:
@@ -41,24 +53,94 @@ class SchedulingMetrics:
     average_wait_time: float
     max_wait_time: float
 
+# Column layouts for the columnar metric stores
+SYSTEM_METRIC_COLUMNS = {
+    "timestamp": np.float64,
+    "ribosome_utilization": np.float32,
+    "atp_level": np.float32,
+    "memory_usage": np.float32,
+    "active_vms": np.int32,
+    "context_switches": np.int64,
+    "reclaimed_ribosomes": np.int32,
+    "reclaimed_atp": np.float32,
+}
+
+VM_METRIC_COLUMNS = {
+    "timestamp": np.float64,
+    "cpu_time": np.float64,
+    "wait_time": np.float64,
+    "context_switches": np.int64,
+    "resource_violations": np.int32,
+    "health_score": np.float32,
+}
+
 class PerformanceProfiler:
     """Real-time performance profiler for BioXen hypervisor"""
     
-    def __init__(self, hypervisor, monitoring_interval: float = 5.0):
+    def __init__(self, hypervisor, monitoring_interval: float = 5.0, history_size: int = 1000):
         self.hypervisor = hypervisor
         self.monitoring_interval = monitoring_interval
+        self.history_size = history_size
+        # Share the hypervisor's time source so simulated runs get simulated timestamps
+        self.clock = getattr(hypervisor, 'clock', None) or WallClock()
         self.running = False
         self.monitor_thread = None
         
-        # Metrics storage
-        self.system_metrics: deque = deque(maxlen=1000)  # Last 1000 samples
-        self.vm_metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        # Metrics storage: ring buffers of NumPy columns (last history_size samples)
+        self.system_metrics = ColumnarRingBuffer(SYSTEM_METRIC_COLUMNS, history_size,
+                                                 record_type=ResourceMetrics)
+        self.vm_metrics: Dict[str, ColumnarRingBuffer] = {}
         self.scheduling_metrics: deque = deque(maxlen=100)
         
         # Performance counters
         self.context_switch_count = 0
-        self.last_context_switch_time = time.time()
+        self.last_context_switch_time = self.clock.now()
         self.resource_contention_events = 0
+        # Process-wide cache of parsed genomes and VM templates (reported, not owned)
+        self.genome_cache = GENOME_CACHE
+        
+        # Optional streaming periodograms (see enable_spectral_tracking)
+        self.spectral_monitor = None
+        # Optional on-disk history (see enable_telemetry)
+        self.telemetry = None
+        self._last_cpu_time: Dict[str, float] = {}
+        
+    def enable_spectral_tracking(self, min_period: Optional[float] = None,
+                                 max_period: float = 172800.0, n_frequencies: int = 256,
+                                 window: Optional[int] = None):
+        """Track dominant periods of each metric incrementally as samples arrive
+        
+        Every collected sample updates a streaming Lomb-Scargle estimator in
+        O(n_frequencies), so live period readouts never need a full recompute.
+        """
+        from ..analysis.streaming import SpectralMonitor
+        
+        if min_period is None:
+            min_period = 4 * self.monitoring_interval  # Stay well above Nyquist
+        self.spectral_monitor = SpectralMonitor.for_periods(
+            min_period, max_period, n_frequencies=n_frequencies, window=window
+        )
+        return self.spectral_monitor
+    
+    def enable_telemetry(self, sink, **kwargs):
+        """Also write every sample to an on-disk TelemetrySink
+        
+        ``sink`` is a TelemetrySink or a directory to open one in (``kwargs``
+        are passed to it). System metrics go to the ``"system"`` series and
+        per-VM metrics to ``"vm/<vm_id>"``.
+        """
+        from .telemetry import TelemetrySink
+        
+        if not isinstance(sink, TelemetrySink):
+            sink = TelemetrySink(sink, **kwargs)
+        self.telemetry = sink
+        return sink
+    
+    def get_live_periods(self) -> Dict[str, Optional[float]]:
+        """Get the current dominant period (seconds) of every tracked metric"""
+        if self.spectral_monitor is None:
+            return {}
+        return self.spectral_monitor.dominant_periods()
         
     def start_monitoring(self):
         """Start the performance monitoring thread"""
@@ -75,29 +157,34 @@ class PerformanceProfiler:
         self.running = False
         if self.monitor_thread:
             self.monitor_thread.join()
+        if self.telemetry is not None:
+            self.telemetry.flush()
     
     def _monitoring_loop(self):
         """Main monitoring loop"""
         while self.running:
             try:
-                # Collect system metrics
-                self._collect_system_metrics()
-                
-                # Collect VM metrics
-                self._collect_vm_metrics()
-                
-                # Analyze scheduling performance
-                self._analyze_scheduling()
-                
+                self.sample()
                 time.sleep(self.monitoring_interval)
                 
             except Exception as e:
                 print(f"Monitoring error: {e}")
                 time.sleep(self.monitoring_interval)
     
+    def sample(self):
+        """Take one monitoring sample (system, VM and scheduling metrics)"""
+        # Collect system metrics
+        self._collect_system_metrics()
+        
+        # Collect VM metrics
+        self._collect_vm_metrics()
+        
+        # Analyze scheduling performance
+        self._analyze_scheduling()
+    
     def _collect_system_metrics(self):
         """Collect system-level performance metrics"""
-        current_time = time.time()
+        current_time = self.clock.now()
         
         # Get system resources
         resources = self.hypervisor.get_system_resources()
@@ -110,19 +197,26 @@ class PerformanceProfiler:
         atp_level = self._simulate_atp_level()
         memory_usage = self._simulate_memory_usage()
         
-        metrics = ResourceMetrics(
-            timestamp=current_time,
+        sample = dict(
             ribosome_utilization=ribosome_util,
             atp_level=atp_level,
             memory_usage=memory_usage,
             active_vms=resources['active_vms'],
-            context_switches=self.context_switch_count
+            context_switches=self.context_switch_count,
+            reclaimed_ribosomes=resources.get('reclaimed_ribosomes', 0),
+            reclaimed_atp=resources.get('reclaimed_atp', 0.0)
         )
+        self.system_metrics.append(timestamp=current_time, **sample)
+        if self.telemetry is not None:
+            self.telemetry.record("system", current_time, sample)
         
-        self.system_metrics.append(metrics)
+        if self.spectral_monitor is not None:
+            self.spectral_monitor.update("atp_level", current_time, atp_level)
+            self.spectral_monitor.update("ribosome_utilization", current_time, ribosome_util)
     
     def _collect_vm_metrics(self):
         """Collect per-VM performance metrics"""
+        current_time = self.clock.now()
         vms = self.hypervisor.list_vms()
         
         for vm_data in vms:
@@ -133,16 +227,42 @@ class PerformanceProfiler:
             wait_time = self._calculate_wait_time(vm_id)
             violations = self._count_resource_violations(vm_id)
             
-            metrics = VMMetrics(
-                vm_id=vm_id,
+            sample = dict(
                 cpu_time=vm_data['cpu_time_used'],
                 wait_time=wait_time,
                 context_switches=self._get_vm_context_switches(vm_id),
                 resource_violations=violations,
                 health_score=health_score
             )
+            self._vm_store(vm_id).append(timestamp=current_time, **sample)
+            if self.telemetry is not None:
+                self.telemetry.record(f"vm/{vm_id}", current_time, sample)
             
-            self.vm_metrics[vm_id].append(metrics)
+            if self.spectral_monitor is not None:
+                # CPU time is cumulative; track the per-sample increment
+                cpu_time = vm_data['cpu_time_used']
+                previous = self._last_cpu_time.get(vm_id)
+                self._last_cpu_time[vm_id] = cpu_time
+                if previous is not None:
+                    self.spectral_monitor.update(f"{vm_id}.cpu_time", current_time,
+                                                 cpu_time - previous)
+        
+        # Drop the streaming state of destroyed VMs
+        present = {vm_data['vm_id'] for vm_data in vms}
+        for vm_id in [vm_id for vm_id in self._last_cpu_time if vm_id not in present]:
+            del self._last_cpu_time[vm_id]
+            if self.spectral_monitor is not None:
+                self.spectral_monitor.remove(f"{vm_id}.cpu_time")
+    
+    def _vm_store(self, vm_id: str) -> ColumnarRingBuffer:
+        """Get (or create) the metric store for a VM"""
+        store = self.vm_metrics.get(vm_id)
+        if store is None:
+            store = ColumnarRingBuffer(VM_METRIC_COLUMNS, self.history_size,
+                                       record_type=VMMetrics,
+                                       record_defaults={"vm_id": vm_id})
+            self.vm_metrics[vm_id] = store
+        return store
     
     def _analyze_scheduling(self):
         """Analyze scheduling fairness and performance"""
@@ -153,11 +273,11 @@ class PerformanceProfiler:
         vm_allocations = {}
         total_cpu_time = 0
         
-        for vm_id, metrics_deque in self.vm_metrics.items():
-            if metrics_deque:
-                latest_metric = metrics_deque[-1]
-                vm_allocations[vm_id] = latest_metric.cpu_time
-                total_cpu_time += latest_metric.cpu_time
+        for vm_id, store in self.vm_metrics.items():
+            if store:
+                cpu_time = store.latest('cpu_time')
+                vm_allocations[vm_id] = cpu_time
+                total_cpu_time += cpu_time
         
         # Calculate fairness score (how close to equal allocation)
         if total_cpu_time > 0:
@@ -175,9 +295,9 @@ class PerformanceProfiler:
         
         # Calculate wait times
         wait_times = []
-        for metrics_deque in self.vm_metrics.values():
-            if metrics_deque:
-                wait_times.append(metrics_deque[-1].wait_time)
+        for store in self.vm_metrics.values():
+            if store:
+                wait_times.append(store.latest('wait_time'))
         
         avg_wait = statistics.mean(wait_times) if wait_times else 0
         max_wait = max(wait_times) if wait_times else 0
@@ -197,26 +317,20 @@ class PerformanceProfiler:
         if not self.system_metrics:
             return {"error": "No metrics collected yet"}
         
-        # System performance summary
-        recent_metrics = list(self.system_metrics)[-10:]  # Last 10 samples
-        
-        avg_ribosome_util = statistics.mean([m.ribosome_utilization for m in recent_metrics])
-        avg_atp_level = statistics.mean([m.atp_level for m in recent_metrics])
-        avg_memory_usage = statistics.mean([m.memory_usage for m in recent_metrics])
+        # System performance summary (last 10 samples)
+        avg_ribosome_util = self._recent_mean(self.system_metrics, 'ribosome_utilization')
+        avg_atp_level = self._recent_mean(self.system_metrics, 'atp_level')
+        avg_memory_usage = self._recent_mean(self.system_metrics, 'memory_usage')
         
         # VM performance summary
         vm_summary = {}
-        for vm_id, metrics_deque in self.vm_metrics.items():
-            if metrics_deque:
-                recent_vm_metrics = list(metrics_deque)[-10:]
-                avg_health = statistics.mean([m.health_score for m in recent_vm_metrics])
-                total_violations = sum([m.resource_violations for m in recent_vm_metrics])
-                
+        for vm_id, store in self.vm_metrics.items():
+            if store:
                 vm_summary[vm_id] = {
-                    "average_health": avg_health,
-                    "total_violations": total_violations,
-                    "current_cpu_time": recent_vm_metrics[-1].cpu_time,
-                    "current_wait_time": recent_vm_metrics[-1].wait_time
+                    "average_health": self._recent_mean(store, 'health_score'),
+                    "total_violations": int(store.window('resource_violations', 10).sum()),
+                    "current_cpu_time": store.latest('cpu_time'),
+                    "current_wait_time": store.latest('wait_time')
                 }
         
         # Scheduling performance
@@ -233,7 +347,7 @@ class PerformanceProfiler:
             }
         
         return {
-            "timestamp": time.time(),
+            "timestamp": self.clock.now(),
             "monitoring_duration": len(self.system_metrics) * self.monitoring_interval,
             "system_performance": {
                 "average_ribosome_utilization": avg_ribosome_util,
@@ -241,12 +355,30 @@ class PerformanceProfiler:
                 "average_memory_usage": avg_memory_usage,
                 "resource_contention_events": self.resource_contention_events
             },
+            "overcommit": self._overcommit_summary(),
+            "genome_cache": self.genome_cache.stats(),
             "vm_performance": vm_summary,
             "scheduling_performance": scheduling_summary,
             "bottlenecks": self._identify_bottlenecks(),
             "recommendations": self._generate_recommendations()
         }
     
+    def get_spectral_report(self, lens=None) -> Dict:
+        """Report dominant periods of collected metrics using the Fourier lens"""
+        if lens is None:
+            from ..analysis.fourier import FourierLens
+            lens = FourierLens()
+        
+        periodograms = lens.analyze_profiler(self)
+        return {
+            metric: {
+                "dominant_period_seconds": result.best_period,
+                "dominant_frequency_hz": result.best_frequency,
+                "peak_power": float(result.power.max())
+            }
+            for metric, result in periodograms.items()
+        }
+    
     def _identify_bottlenecks(self) -> List[str]:
         """Identify performance bottlenecks"""
         bottlenecks = []
@@ -254,18 +386,16 @@ class PerformanceProfiler:
         if not self.system_metrics:
             return bottlenecks
         
-        recent_metrics = list(self.system_metrics)[-10:]
-        
         # Check for resource saturation
-        avg_ribosome_util = statistics.mean([m.ribosome_utilization for m in recent_metrics])
+        avg_ribosome_util = self._recent_mean(self.system_metrics, 'ribosome_utilization')
         if avg_ribosome_util > 80:
             bottlenecks.append("High ribosome utilization (>80%)")
         
-        avg_atp = statistics.mean([m.atp_level for m in recent_metrics])
+        avg_atp = self._recent_mean(self.system_metrics, 'atp_level')
         if avg_atp < 30:
             bottlenecks.append("Low ATP levels (<30%)")
         
-        avg_memory = statistics.mean([m.memory_usage for m in recent_metrics])
+        avg_memory = self._recent_mean(self.system_metrics, 'memory_usage')
         if avg_memory > 85:
             bottlenecks.append("High memory usage (>85%)")
         
@@ -304,20 +434,38 @@ class PerformanceProfiler:
             recommendations.append("Increase time quantum to reduce context switch overhead")
         
         # VM-specific recommendations
-        for vm_id, metrics_deque in self.vm_metrics.items():
-            if metrics_deque:
-                latest = metrics_deque[-1]
-                if latest.health_score < 60:
+        for vm_id, store in self.vm_metrics.items():
+            if store:
+                if store.latest('health_score') < 60:
                     recommendations.append(f"Investigate health issues in VM {vm_id}")
-                if latest.resource_violations > 5:
+                if store.latest('resource_violations') > 5:
                     recommendations.append(f"Review resource allocation for VM {vm_id}")
         
         return recommendations
     
+    def _overcommit_summary(self) -> Dict:
+        """Overcommit ratio and resources reclaimed by ballooning"""
+        stats = getattr(self.hypervisor, 'balloon_stats', {})
+        return {
+            "overcommit_ratio": getattr(self.hypervisor, 'overcommit_ratio', 1.0),
+            "current_reclaimed_ribosomes": self.system_metrics.latest('reclaimed_ribosomes'),
+            "current_reclaimed_atp": self.system_metrics.latest('reclaimed_atp'),
+            "peak_reclaimed_ribosomes": int(self.system_metrics.window('reclaimed_ribosomes').max()),
+            "balloon_inflations": stats.get("inflations", 0),
+            "balloon_deflations": stats.get("deflations", 0),
+            "total_ribosomes_reclaimed": stats.get("ribosomes_reclaimed", 0),
+            "total_ribosomes_returned": stats.get("ribosomes_returned", 0)
+        }
+    
+    @staticmethod
+    def _recent_mean(store: ColumnarRingBuffer, column: str, samples: int = 10) -> float:
+        """Mean of the most recent samples of a metric column"""
+        return float(store.window(column, samples).mean(dtype=np.float64))
+    
     def record_context_switch(self):
         """Record a context switch event"""
         self.context_switch_count += 1
-        self.last_context_switch_time = time.time()
+        self.last_context_switch_time = self.clock.now()
     
     def record_resource_contention(self):
         """Record a resource contention event"""
@@ -329,7 +477,7 @@ class PerformanceProfiler:
         """Simulate ATP level monitoring"""
         # In real implementation, this would read from ATP biosensors
         base_level = 80.0
-        variation = (time.time() % 60) / 60 * 20  # 20% variation over 60 seconds
+        variation = (self.clock.now() % 60) / 60 * 20  # 20% variation over 60 seconds
         return max(0, min(100, base_level + variation - 10))
     
     def _simulate_memory_usage(self) -> float:
@@ -337,8 +485,7 @@ class PerformanceProfiler:
         # Based on number of active VMs and their allocations
         total_allocated = sum(
             vm_data['memory_kb'] 
-            for vm_data in self.hypervisor.list_vms()
-            if vm_data['state'] == 'running'
+            for vm_data in self.hypervisor.list_vms(VMState.RUNNING)
         )
         total_available = 1000  # Assume 1MB total available
         return (total_allocated / total_available) * 100
@@ -363,7 +510,7 @@ class PerformanceProfiler:
     def _calculate_wait_time(self, vm_id: str) -> float:
         """Calculate current wait time for a VM"""
         # Simplified calculation
-        return max(0, time.time() - self.last_context_switch_time - 30)
+        return max(0, self.clock.now() - self.last_context_switch_time - 30)
     
     def _count_resource_violations(self, vm_id: str) -> int:
         """Count resource violations for a VM"""
@@ -380,7 +527,8 @@ class PerformanceProfiler:
         if len(self.system_metrics) < 2:
             return 0
         
-        time_span = self.system_metrics[-1].timestamp - self.system_metrics[0].timestamp
+        timestamps = self.system_metrics.window('timestamp')
+        time_span = float(timestamps[-1] - timestamps[0])
         if time_span == 0:
             return 0
         
@@ -388,29 +536,102 @@ class PerformanceProfiler:
 
 
 class BenchmarkSuite:
-    """Benchmark suite for testing hypervisor performance"""
+    """Benchmark suite for testing hypervisor performance
+    
+    When the hypervisor runs on a SimulatedClock, scenarios are driven with
+    ``run_for`` instead of sleeping, so the whole suite finishes in well under
+    a second and, given a seed, produces identical results on every run.
+    """
     
-    def __init__(self, hypervisor):
+    def __init__(self, hypervisor, seed: Optional[int] = None, sample_interval: float = 1.0):
         self.hypervisor = hypervisor
+        self.seed = seed
+        self.sample_interval = sample_interval
         self.results = {}
     
+    @classmethod
+    def simulated(cls, seed: int = 0, **hypervisor_kwargs) -> 'BenchmarkSuite':
+        """Create a suite around a fresh hypervisor driven by a SimulatedClock"""
+        from ..hypervisor.core import BioXenHypervisor
+        
+        hypervisor = BioXenHypervisor(clock=SimulatedClock(), **hypervisor_kwargs)
+        return cls(hypervisor, seed=seed)
+    
+    @property
+    def is_simulated(self) -> bool:
+        """Whether scenarios run on simulated rather than wall-clock time"""
+        return getattr(self.hypervisor.clock, 'simulated', False)
+    
+    def _reseed(self):
+        """Reset the random number generators so each scenario is reproducible"""
+        if self.seed is not None:
+            random.seed(self.seed)
+            np.random.seed(self.seed)
+    
+    def _run_workload(self, profiler: PerformanceProfiler, duration: float,
+                      schedule: bool = True) -> Dict:
+        """Run the hypervisor for ``duration`` seconds while sampling the profiler
+        
+        Returns timing statistics: scheduler ticks executed, the wall-clock
+        cost per tick and context switches observed in the scheduling trace.
+        """
+        clock = self.hypervisor.clock
+        start = clock.now()
+        wall_start = time.perf_counter()
+        ticks = 0
+        tick_wall_time = 0.0
+        
+        if self.is_simulated:
+            for _ in range(int(round(duration / self.sample_interval))):
+                if not schedule:
+                    # Idle baseline: time passes, the scheduler never runs
+                    clock.advance(self.sample_interval)
+                    profiler.sample()
+                    continue
+                tick_start = time.perf_counter()
+                # One scheduling decision per step plus one per dispatched event
+                ticks += 1 + self.hypervisor.run_for(self.sample_interval)
+                tick_wall_time += time.perf_counter() - tick_start
+                profiler.sample()
+        else:
+            profiler.start_monitoring()
+            if schedule:
+                for _ in range(int(duration)):
+                    tick_start = time.perf_counter()
+                    self.hypervisor.run_scheduler()
+                    tick_wall_time += time.perf_counter() - tick_start
+                    ticks += 1
+                    time.sleep(1)
+            else:
+                time.sleep(duration)
+            profiler.stop_monitoring()
+        
+        elapsed = clock.now() - start
+        context_switches = sum(
+            1 for at, event, _ in list(self.hypervisor.scheduling_trace)
+            if at >= start and event == EventType.CONTEXT_SWITCH.value
+        )
+        return {
+            "test_duration": elapsed,
+            "wall_time": time.perf_counter() - wall_start,
+            "scheduler_ticks": ticks,
+            "tick_wall_time_us": tick_wall_time / ticks * 1e6 if ticks else 0.0,
+            "context_switches": context_switches,
+            "context_switches_per_minute": context_switches / elapsed * 60 if elapsed else 0.0,
+        }
+    
     def run_single_vm_benchmark(self) -> Dict:
         """Test single VM performance (Phase 1)"""
         print("Running single VM benchmark...")
+        self._reseed()
         
         # Create and start a single VM
-        start_time = time.time()
         self.hypervisor.create_vm("benchmark_vm1", "syn3a_minimal")
         self.hypervisor.start_vm("benchmark_vm1")
         
         # Monitor for 60 seconds
-        profiler = PerformanceProfiler(self.hypervisor, monitoring_interval=1.0)
-        profiler.start_monitoring()
-        
-        time.sleep(60)
-        
-        profiler.stop_monitoring()
-        end_time = time.time()
+        profiler = PerformanceProfiler(self.hypervisor, monitoring_interval=self.sample_interval)
+        timing = self._run_workload(profiler, 60, schedule=False)
         
         # Calculate overhead
         report = profiler.get_performance_report()
@@ -420,7 +641,7 @@ class BenchmarkSuite:
         self.hypervisor.destroy_vm("benchmark_vm1")
         
         result = {
-            "test_duration": end_time - start_time,
+            **timing,
             "hypervisor_overhead": overhead,
             "average_health": report['vm_performance'].get('benchmark_vm1', {}).get('average_health', 0),
             "bottlenecks": report['bottlenecks'],
@@ -433,8 +654,7 @@ class BenchmarkSuite:
     def run_dual_vm_benchmark(self) -> Dict:
         """Test dual VM performance (Phase 2)"""
         print("Running dual VM benchmark...")
-        
-        start_time = time.time()
+        self._reseed()
         
         # Create two VMs
         self.hypervisor.create_vm("benchmark_vm1", "syn3a_minimal")
@@ -444,17 +664,9 @@ class BenchmarkSuite:
         self.hypervisor.start_vm("benchmark_vm1")
         self.hypervisor.start_vm("benchmark_vm2")
         
-        # Monitor with profiler
-        profiler = PerformanceProfiler(self.hypervisor, monitoring_interval=1.0)
-        profiler.start_monitoring()
-        
-        # Run scheduler for 120 seconds
-        for _ in range(120):
-            self.hypervisor.run_scheduler()
-            time.sleep(1)
-        
-        profiler.stop_monitoring()
-        end_time = time.time()
+        # Run scheduler for 120 seconds under the profiler
+        profiler = PerformanceProfiler(self.hypervisor, monitoring_interval=self.sample_interval)
+        timing = self._run_workload(profiler, 120)
         
         report = profiler.get_performance_report()
         
@@ -466,10 +678,9 @@ class BenchmarkSuite:
         self.hypervisor.destroy_vm("benchmark_vm2")
         
         result = {
-            "test_duration": end_time - start_time,
+            **timing,
             "fairness_score": fairness_score,
             "average_wait_time": report['scheduling_performance'].get('average_wait_time', 0),
-            "context_switches": report['scheduling_performance'].get('context_switches_per_minute', 0),
             "bottlenecks": report['bottlenecks'],
             "success_criteria": fairness_score > 80  # Good fairness
         }
@@ -480,8 +691,7 @@ class BenchmarkSuite:
     def run_stress_test(self) -> Dict:
         """Test maximum VM capacity (Phase 3)"""
         print("Running stress test with maximum VMs...")
-        
-        start_time = time.time()
+        self._reseed()
         
         # Create maximum number of VMs
         created_vms = []
@@ -491,17 +701,9 @@ class BenchmarkSuite:
                 created_vms.append(vm_id)
                 self.hypervisor.start_vm(vm_id)
         
-        # Monitor under stress
-        profiler = PerformanceProfiler(self.hypervisor, monitoring_interval=1.0)
-        profiler.start_monitoring()
-        
-        # Run for 180 seconds with scheduling
-        for _ in range(180):
-            self.hypervisor.run_scheduler()
-            time.sleep(1)
-        
-        profiler.stop_monitoring()
-        end_time = time.time()
+        # Run for 180 seconds with scheduling under the profiler
+        profiler = PerformanceProfiler(self.hypervisor, monitoring_interval=self.sample_interval)
+        timing = self._run_workload(profiler, 180)
         
         report = profiler.get_performance_report()
         
@@ -510,10 +712,11 @@ class BenchmarkSuite:
             self.hypervisor.destroy_vm(vm_id)
         
         result = {
-            "test_duration": end_time - start_time,
+            **timing,
             "max_vms_created": len(created_vms),
             "system_stability": len(report['bottlenecks']) == 0,
             "resource_utilization": report['system_performance']['average_ribosome_utilization'],
+            "fairness_score": report['scheduling_performance'].get('average_fairness_score', 0),
             "bottlenecks": report['bottlenecks'],
             "success_criteria": len(created_vms) >= 3 and len(report['bottlenecks']) <= 2
         }
@@ -521,6 +724,29 @@ class BenchmarkSuite:
         self.results['stress_test'] = result
         return result
     
+    def run_all(self) -> Dict:
+        """Run every benchmark scenario in order"""
+        self.run_single_vm_benchmark()
+        self.run_dual_vm_benchmark()
+        self.run_stress_test()
+        return self.results
+    
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Serialize benchmark results as JSON for regression tracking"""
+        payload = {
+            "seed": self.seed,
+            "simulated": self.is_simulated,
+            "chassis": self.hypervisor.chassis_type.value,
+            "results": self.results,
+        }
+        return json.dumps(payload, indent=indent, sort_keys=True,
+                          default=lambda value: value.item() if isinstance(value, np.generic) else str(value))
+    
+    def save_results(self, path: str) -> None:
+        """Write the JSON benchmark results to a file"""
+        with open(path, 'w') as f:
+            f.write(self.to_json())
+    
     def generate_benchmark_report(self) -> str:
         """Generate a comprehensive benchmark report"""
         if not self.results:
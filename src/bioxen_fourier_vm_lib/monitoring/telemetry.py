@@ -0,0 +1,395 @@
+"""
+On-disk telemetry store for long BioXen metric histories
+
+The profiler's ring buffers only hold the most recent samples. A
+``TelemetrySink`` keeps weeks of system and per-VM history on disk with
+bounded memory, for the Fourier/periodicity analysis:
+
+- Every series (``"system"``, ``"vm/<vm_id>"``, ...) is rolled up into
+  retention tiers, by default 1 s -> 1 min -> 1 h. Each tier row stores the
+  bucket start, the sample count and the min/max/sum of every column, so
+  coarser tiers are built from finer ones exactly.
+- Tier rows are appended to fixed-size memory-mapped ``.npy`` segments
+  (structured NumPy arrays). Only the segment being written is mapped, and
+  whole segments older than the tier's retention are deleted.
+- ``query`` reads a time range at a chosen (or automatically picked)
+  resolution and returns NumPy columns that can go straight into
+  ``FourierLens.periodogram``.
+
+Layout: ``<path>/<series>/schema.json`` and ``<path>/<series>/<tier>/<start>.npy``
+where ``<start>`` is the first bucket of the segment in milliseconds.
+"""
+
+import json
+import math
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+DAY = 86400.0
+
+# Bucket widths (seconds) and how long each tier is kept (None = forever)
+DEFAULT_RESOLUTIONS = (1.0, 60.0, 3600.0)
+DEFAULT_RETENTION = {1.0: 7 * DAY, 60.0: 90 * DAY, 3600.0: None}
+
+
+def _tier_name(resolution: float) -> str:
+    if resolution >= 3600 and resolution % 3600 == 0:
+        return f"{int(resolution // 3600)}h"
+    if resolution >= 60 and resolution % 60 == 0:
+        return f"{int(resolution // 60)}m"
+    return f"{resolution:g}s"
+
+
+def _row(start: float, count: int, mins: np.ndarray, maxs: np.ndarray, sums: np.ndarray) -> tuple:
+    """Tier row as a tuple: timestamp, count, then min/max/sum per column"""
+    return (start, count, *np.column_stack((mins, maxs, sums)).ravel().tolist())
+
+
+class _Bucket:
+    """Open (not yet written) aggregate of one tier"""
+
+    __slots__ = ("start", "count", "mins", "maxs", "sums")
+
+    def __init__(self, start: float, count: int, mins: np.ndarray, maxs: np.ndarray,
+                 sums: np.ndarray):
+        self.start = start
+        self.count = count
+        self.mins = mins.copy()
+        self.maxs = maxs.copy()
+        self.sums = sums.copy()
+
+    def merge(self, count: int, mins: np.ndarray, maxs: np.ndarray, sums: np.ndarray) -> None:
+        self.count += count
+        np.minimum(self.mins, mins, out=self.mins)
+        np.maximum(self.maxs, maxs, out=self.maxs)
+        self.sums += sums
+
+
+def _bucket_of(row: np.void) -> _Bucket:
+    """Open bucket holding the aggregate of a tier row"""
+    stats = np.array(row.tolist()[2:]).reshape(-1, 3)
+    return _Bucket(float(row["timestamp"]), int(row["count"]), stats[:, 0], stats[:, 1],
+                   stats[:, 2])
+
+
+class _Tier:
+    """Append-only segmented storage of one resolution of one series"""
+
+    def __init__(self, directory: str, resolution: float, columns: Sequence[str],
+                 retention: Optional[float], segment_rows: int):
+        self.directory = directory
+        self.resolution = resolution
+        self.retention = retention
+        self.segment_rows = segment_rows
+        fields = [("timestamp", np.float64), ("count", np.int64)]
+        for column in columns:
+            fields += [(f"{column}_min", np.float64), (f"{column}_max", np.float64),
+                       (f"{column}_sum", np.float64)]
+        self.dtype = np.dtype(fields)
+        os.makedirs(directory, exist_ok=True)
+
+        # (first bucket start in ms, path), oldest first
+        self.segments: List[Tuple[int, str]] = sorted(
+            (int(name[:-4]), os.path.join(directory, name))
+            for name in os.listdir(directory) if name.endswith(".npy")
+        )
+        self._segment: Optional[np.memmap] = None
+        self._rows = 0
+        if self.segments:
+            self._segment = np.lib.format.open_memmap(self.segments[-1][1], mode="r+")
+            empty = np.flatnonzero(np.isnan(self._segment["timestamp"]))
+            self._rows = int(empty[0]) if len(empty) else len(self._segment)
+
+    def append(self, start: float, count: int, mins: np.ndarray, maxs: np.ndarray,
+               sums: np.ndarray) -> None:
+        if self._rows and self._segment["timestamp"][self._rows - 1] == start:
+            # Bucket written partially by an earlier close(): merge into its row
+            bucket = _bucket_of(self._segment[self._rows - 1])
+            bucket.merge(count, mins, maxs, sums)
+            self._segment[self._rows - 1] = _row(start, bucket.count, bucket.mins, bucket.maxs,
+                                                 bucket.sums)
+            return
+        if self._segment is None or self._rows == len(self._segment):
+            self._new_segment(start)
+        self._segment[self._rows] = _row(start, count, mins, maxs, sums)
+        self._rows += 1
+
+    def _new_segment(self, start: float) -> None:
+        if self._segment is not None:
+            self._segment.flush()
+        key = int(math.floor(start * 1000))
+        path = os.path.join(self.directory, f"{key}.npy")
+        segment = np.lib.format.open_memmap(path, mode="w+", dtype=self.dtype,
+                                            shape=(self.segment_rows,))
+        segment["timestamp"] = np.nan  # Unwritten rows, found again on reopen
+        self.segments.append((key, path))
+        self._segment = segment
+        self._rows = 0
+        self._expire(start)
+
+    def _expire(self, newest: float) -> None:
+        """Delete full segments that ended before the retention horizon"""
+        if self.retention is None:
+            return
+        horizon = newest - self.retention
+        while len(self.segments) > 1:
+            _, path = self.segments[0]
+            next_start = self.segments[1][0] / 1000.0
+            if next_start > horizon:
+                break
+            os.remove(path)
+            self.segments.pop(0)
+
+    def first_timestamp(self) -> Optional[float]:
+        if not self.segments:
+            return None
+        return self.segments[0][0] / 1000.0
+
+    def read(self, start: Optional[float], end: Optional[float]) -> np.ndarray:
+        """Rows with ``start <= timestamp < end`` (copied out of the segments)"""
+        parts = []
+        for index, (key, path) in enumerate(self.segments):
+            next_key = self.segments[index + 1][0] if index + 1 < len(self.segments) else None
+            if end is not None and key / 1000.0 >= end:
+                break
+            if start is not None and next_key is not None and next_key / 1000.0 <= start:
+                continue
+            if index == len(self.segments) - 1 and self._segment is not None:
+                rows = self._segment[:self._rows]
+            else:
+                rows = np.load(path, mmap_mode="r")
+                rows = rows[~np.isnan(rows["timestamp"])]
+            timestamps = rows["timestamp"]
+            lo = 0 if start is None else np.searchsorted(timestamps, start, side="left")
+            hi = len(rows) if end is None else np.searchsorted(timestamps, end, side="left")
+            parts.append(np.array(rows[lo:hi]))
+        if not parts:
+            return np.empty(0, dtype=self.dtype)
+        return np.concatenate(parts)
+
+    def flush(self) -> None:
+        if self._segment is not None:
+            self._segment.flush()
+
+
+class _Series:
+    """One metric series rolled up into every tier"""
+
+    def __init__(self, directory: str, columns: Sequence[str], resolutions: Sequence[float],
+                 retention: Dict[float, Optional[float]], segment_rows: int):
+        self.columns = tuple(columns)
+        self.resolutions = tuple(resolutions)
+        self.tiers = [_Tier(os.path.join(directory, _tier_name(resolution)), resolution,
+                            self.columns, retention.get(resolution), segment_rows)
+                      for resolution in resolutions]
+        self._open: List[Optional[_Bucket]] = [None] * len(self.tiers)
+
+    def add(self, timestamp: float, values: np.ndarray) -> None:
+        self._merge(0, timestamp, 1, values, values, values)
+
+    def _merge(self, level: int, timestamp: float, count: int, mins: np.ndarray,
+               maxs: np.ndarray, sums: np.ndarray) -> None:
+        resolution = self.resolutions[level]
+        start = math.floor(timestamp / resolution) * resolution
+        bucket = self._open[level]
+        if bucket is not None and start > bucket.start:
+            self._close(level)
+            bucket = None
+        if bucket is None:
+            self._open[level] = _Bucket(start, count, mins, maxs, sums)
+        else:
+            # Late samples fold into the open bucket
+            bucket.merge(count, mins, maxs, sums)
+
+    def _close(self, level: int) -> None:
+        """Write a tier's open bucket and roll it up into the next tier"""
+        bucket = self._open[level]
+        self._open[level] = None
+        self.tiers[level].append(bucket.start, bucket.count, bucket.mins, bucket.maxs, bucket.sums)
+        if level + 1 < len(self.tiers):
+            self._merge(level + 1, bucket.start, bucket.count, bucket.mins, bucket.maxs,
+                        bucket.sums)
+
+    def close(self) -> None:
+        for level in range(len(self.tiers)):
+            if self._open[level] is not None:
+                self._close(level)
+            self.tiers[level].flush()
+
+    def read(self, level: int, start: Optional[float], end: Optional[float]) -> np.ndarray:
+        rows = self.tiers[level].read(start, end)
+        bucket = self._open[level]
+        if bucket is None or (start is not None and bucket.start < start) or \
+                (end is not None and bucket.start >= end):
+            return rows
+        # Include the bucket still being filled, merged with its row from before a reopen
+        if len(rows) and rows["timestamp"][-1] == bucket.start:
+            written = _bucket_of(rows[-1])
+            written.merge(bucket.count, bucket.mins, bucket.maxs, bucket.sums)
+            rows, bucket = rows[:-1], written
+        row = np.array([_row(bucket.start, bucket.count, bucket.mins, bucket.maxs, bucket.sums)],
+                       dtype=rows.dtype)
+        return np.concatenate((rows, row))
+
+
+class TelemetrySink:
+    """Append-only on-disk metric store with rollup tiers and time-range queries"""
+
+    def __init__(self, path: str, resolutions: Sequence[float] = DEFAULT_RESOLUTIONS,
+                 retention: Optional[Dict[float, Optional[float]]] = None,
+                 segment_rows: int = 4096):
+        """
+        Open (or create) a telemetry store.
+
+        Args:
+            path: Directory holding the store
+            resolutions: Bucket widths in seconds, finest first
+            retention: Seconds of history kept per resolution (None = forever;
+                       defaults to 7 days at 1 s, 90 days at 1 min, 1 h forever)
+            segment_rows: Rows per on-disk segment file
+        """
+        resolutions = tuple(float(resolution) for resolution in resolutions)
+        if not resolutions or list(resolutions) != sorted(set(resolutions)):
+            raise ValueError("resolutions must be increasing and non-empty")
+        if segment_rows <= 0:
+            raise ValueError("segment_rows must be positive")
+        self.path = path
+        self.resolutions = resolutions
+        self.retention = dict(DEFAULT_RETENTION if retention is None else retention)
+        self.segment_rows = segment_rows
+        self._series: Dict[str, _Series] = {}
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def _directory(self, series: str) -> str:
+        return os.path.join(self.path, quote(series, safe=""))
+
+    def _open_series(self, series: str, columns: Optional[Iterable[str]] = None) -> Optional[_Series]:
+        """Get a series, loading its schema from disk or creating it with ``columns``"""
+        store = self._series.get(series)
+        if store is not None:
+            return store
+        directory = self._directory(series)
+        schema_path = os.path.join(directory, "schema.json")
+        if os.path.exists(schema_path):
+            with open(schema_path) as f:
+                schema = json.load(f)
+            if tuple(schema["resolutions"]) != self.resolutions:
+                raise ValueError(f"Series {series} was written with resolutions "
+                                 f"{schema['resolutions']}, not {list(self.resolutions)}")
+            columns = schema["columns"]
+        elif columns is None:
+            return None
+        else:
+            columns = list(columns)
+            os.makedirs(directory, exist_ok=True)
+            with open(schema_path, "w") as f:
+                json.dump({"series": series, "columns": columns,
+                           "resolutions": list(self.resolutions)}, f)
+        store = _Series(directory, columns, self.resolutions, self.retention, self.segment_rows)
+        self._series[series] = store
+        return store
+
+    def record(self, series: str, timestamp: float, values: Dict[str, float]) -> None:
+        """
+        Add one sample to a series.
+
+        The first sample fixes the series' columns (its keys, in order); later
+        samples store missing columns as zero and ignore unknown ones.
+        """
+        with self._lock:
+            store = self._open_series(series, values.keys())
+            row = np.fromiter((values.get(column, 0) for column in store.columns),
+                              dtype=np.float64, count=len(store.columns))
+            store.add(timestamp, row)
+
+    def series(self) -> List[str]:
+        """Names of all series in the store"""
+        with self._lock:
+            names = set(self._series)
+            for entry in os.listdir(self.path):
+                if os.path.exists(os.path.join(self.path, entry, "schema.json")):
+                    names.add(unquote(entry))
+            return sorted(names)
+
+    def columns(self, series: str) -> Tuple[str, ...]:
+        """Metric columns of a series"""
+        with self._lock:
+            store = self._open_series(series)
+            if store is None:
+                raise KeyError(series)
+            return store.columns
+
+    def query(self, series: str, start: Optional[float] = None, end: Optional[float] = None,
+              resolution: Optional[float] = None,
+              columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Read ``start <= t < end`` of a series.
+
+        Args:
+            series: Series name
+            start, end: Time range (None = unbounded)
+            resolution: Tier to read; defaults to the finest tier that still
+                        holds data from ``start``
+            columns: Metric columns to return (default all)
+
+        Returns:
+            ``timestamp`` (bucket starts) and ``count`` arrays plus
+            ``<column>_min``, ``<column>_max`` and ``<column>_mean`` per column
+        """
+        with self._lock:
+            store = self._open_series(series)
+            if store is None:
+                raise KeyError(series)
+            level = self._pick_level(store, start, resolution)
+            rows = store.read(level, start, end)
+
+        result = {"timestamp": rows["timestamp"], "count": rows["count"]}
+        counts = np.maximum(rows["count"], 1)
+        for column in columns or store.columns:
+            if column not in store.columns:
+                raise KeyError(f"Unknown column {column} for series {series}")
+            result[f"{column}_min"] = rows[f"{column}_min"]
+            result[f"{column}_max"] = rows[f"{column}_max"]
+            result[f"{column}_mean"] = rows[f"{column}_sum"] / counts
+        return result
+
+    def _pick_level(self, store: _Series, start: Optional[float],
+                    resolution: Optional[float]) -> int:
+        if resolution is not None:
+            if float(resolution) not in self.resolutions:
+                raise ValueError(f"Unsupported resolution: {resolution}. "
+                                 f"Supported: {list(self.resolutions)}")
+            return self.resolutions.index(float(resolution))
+        if start is None:
+            return 0
+        for level, tier in enumerate(store.tiers):
+            first = tier.first_timestamp()
+            if first is not None and first <= start:
+                return level
+        return len(store.tiers) - 1
+
+    def flush(self) -> None:
+        """Sync written segments to disk (open buckets stay open)"""
+        with self._lock:
+            for store in self._series.values():
+                for tier in store.tiers:
+                    tier.flush()
+
+    def close(self) -> None:
+        """Write every open bucket, including partial ones, and sync"""
+        with self._lock:
+            for store in self._series.values():
+                store.close()
+            self._series.clear()
+
+    def disk_usage(self) -> int:
+        """Bytes used by the store on disk"""
+        total = 0
+        for root, _, files in os.walk(self.path):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+        return total
@@ -0,0 +1,197 @@
+"""
+Opt-in span tracing for BioXen hot paths
+
+``@traced`` marks functions (VM creation, boot, context switches, resource
+allocation, genome loading, circuit compilation) whose calls are recorded as
+spans once ``enable_tracing()`` is called. While tracing is off a traced call
+costs one attribute check on top of the call itself.
+
+Spans go into a fixed-size ring buffer owned by the recording thread, so
+recording never takes a lock; only a thread's first span registers its
+buffer. ``export_chrome_trace`` merges the buffers into Chrome trace event
+JSON, which loads in ``chrome://tracing`` and https://ui.perfetto.dev.
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+
+class _SpanBuffer:
+    """Ring buffer of (name, category, start_ns, duration_ns, args) for one thread"""
+
+    __slots__ = ("spans", "next", "size", "thread_id", "thread_name")
+
+    def __init__(self, capacity: int):
+        self.spans: List[Optional[tuple]] = [None] * capacity
+        self.next = 0
+        self.size = 0
+        thread = threading.current_thread()
+        self.thread_id = threading.get_ident()
+        self.thread_name = thread.name
+
+    def record(self, span: tuple) -> None:
+        spans = self.spans
+        spans[self.next] = span
+        self.next = (self.next + 1) % len(spans)
+        if self.size < len(spans):
+            self.size += 1
+
+    def ordered(self) -> List[tuple]:
+        spans = self.spans
+        start = (self.next - self.size) % len(spans)
+        return [spans[(start + i) % len(spans)] for i in range(self.size)]
+
+
+class Tracer:
+    """Process-wide tracing switch and the per-thread span buffers"""
+
+    def __init__(self):
+        self.enabled = False
+        self.capacity = 65536
+        self._local = threading.local()
+        self._buffers: List[_SpanBuffer] = []
+        self._register_lock = threading.Lock()
+        self._generation = 0  # Bumped by clear() so threads start new buffers
+
+    def _buffer(self) -> _SpanBuffer:
+        local = self._local
+        buffer = getattr(local, "buffer", None)
+        if buffer is None or local.generation != self._generation:
+            buffer = _SpanBuffer(self.capacity)
+            with self._register_lock:
+                self._buffers.append(buffer)
+            local.buffer = buffer
+            local.generation = self._generation
+        return buffer
+
+    def record(self, name: str, category: str, start_ns: int, duration_ns: int,
+               args: Optional[Dict[str, Any]] = None) -> None:
+        """Record a finished span on the calling thread"""
+        self._buffer().record((name, category, start_ns, duration_ns, args))
+
+    def clear(self) -> None:
+        """Drop all recorded spans"""
+        with self._register_lock:
+            self._buffers = []
+            self._generation += 1
+
+    def spans(self) -> List[Dict[str, Any]]:
+        """Recorded spans of every thread, oldest first within each thread"""
+        with self._register_lock:
+            buffers = list(self._buffers)
+        result = []
+        for buffer in buffers:
+            for name, category, start_ns, duration_ns, args in buffer.ordered():
+                result.append({"name": name, "category": category, "start_ns": start_ns,
+                               "duration_ns": duration_ns, "args": args,
+                               "thread_id": buffer.thread_id})
+        return result
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Recorded spans as Chrome trace / Perfetto JSON (complete events)"""
+        pid = os.getpid()
+        with self._register_lock:
+            buffers = list(self._buffers)
+        events = []
+        for buffer in buffers:
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": buffer.thread_id,
+                           "args": {"name": buffer.thread_name}})
+            for name, category, start_ns, duration_ns, args in buffer.ordered():
+                event = {"name": name, "cat": category, "ph": "X", "pid": pid,
+                         "tid": buffer.thread_id, "ts": start_ns / 1000.0,
+                         "dur": duration_ns / 1000.0}
+                if args:
+                    event["args"] = args
+                events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+TRACER = Tracer()
+
+
+def enable_tracing(capacity: int = 65536) -> None:
+    """Start recording spans, keeping the last ``capacity`` spans per thread"""
+    if capacity <= 0:
+        raise ValueError("capacity must be positive")
+    if capacity != TRACER.capacity:
+        TRACER.capacity = capacity
+        TRACER.clear()
+    TRACER.enabled = True
+
+
+def disable_tracing() -> None:
+    """Stop recording spans (recorded spans are kept until cleared)"""
+    TRACER.enabled = False
+
+
+def clear_trace() -> None:
+    """Drop all recorded spans"""
+    TRACER.clear()
+
+
+def export_chrome_trace(path: Optional[str] = None) -> Dict[str, Any]:
+    """Chrome trace JSON of the recorded spans, also written to ``path`` if given"""
+    trace = TRACER.chrome_trace()
+    if path is not None:
+        with open(path, "w") as f:
+            json.dump(trace, f)
+    return trace
+
+
+def _subject(value: Any) -> Any:
+    """VM ID of an argument that carries one, else the argument itself"""
+    value = getattr(value, "vm_id", value)
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def traced(name: str, category: str = "bioxen", arg: Optional[str] = None) -> Callable:
+    """
+    Record calls of the decorated function as spans while tracing is enabled.
+
+    Args:
+        name: Span name
+        category: Span category (Chrome trace ``cat``)
+        arg: Parameter whose value (or its ``vm_id``) is attached to the span
+    """
+    def decorator(func: Callable) -> Callable:
+        index = None
+        if arg is not None:
+            index = list(inspect.signature(func).parameters).index(arg)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            span_args = None
+            if index is not None:
+                value = args[index] if index < len(args) else kwargs.get(arg)
+                span_args = {arg: _subject(value)}
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                TRACER.record(name, category, start, time.perf_counter_ns() - start, span_args)
+
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def span(name: str, category: str = "bioxen", **args):
+    """Record the enclosed block as a span while tracing is enabled"""
+    if not TRACER.enabled:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        TRACER.record(name, category, start, time.perf_counter_ns() - start, args or None)